@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from typing import AnyStr, Iterator
+
+from cachetools import LRUCache
+
+from ports.repositories.file_repository import FileRepository
+from ports.services.pdf_analysis_service import PDFAnalysisService
+from use_cases.pdf_analysis.normalize_resolution import DEFAULT_RESOLUTION
+from configuration import (
+    service_logger,
+    MODELS_PATH,
+    ANALYSIS_CACHE_PATH,
+    ANALYSIS_CACHE_MEMORY_MB,
+    ANALYSIS_CACHE_DISK_MB,
+    ANALYSIS_CACHE_VERSION,
+    VGT_QUANTIZE_INT8,
+    VGT_BFLOAT16_AUTOCAST,
+    VGT_BACKEND,
+    VGT_AUTO_RESOLUTION_LADDER,
+)
+
+MODEL_FILES_BY_MODE = {
+    "vgt": ["doclaynet_VGT_model.pth"],
+    "fast": ["token_type_lightgbm.model", "paragraph_extraction_lightgbm.model"],
+}
+
+INFERENCE_OPTIONS_BY_MODE = {
+    "vgt": [
+        f"int8:{VGT_QUANTIZE_INT8}",
+        f"bfloat16:{VGT_BFLOAT16_AUTOCAST}",
+        f"backend:{VGT_BACKEND}",
+        f"auto_resolution_ladder:{VGT_AUTO_RESOLUTION_LADDER}",
+    ],
+    "fast": [],
+}
+
+
+def get_model_version(model_file_names: list[str], inference_options: list[str]) -> str:
+    fingerprint = [ANALYSIS_CACHE_VERSION] + inference_options
+    for model_file_name in model_file_names:
+        model_path = Path(MODELS_PATH, model_file_name)
+        if model_path.exists():
+            model_stat = model_path.stat()
+            fingerprint.append(f"{model_file_name}:{model_stat.st_size}:{model_stat.st_mtime_ns}")
+    return hashlib.sha256("|".join(fingerprint).encode()).hexdigest()[:16]
+
+
+class CachedPDFAnalysisServiceAdapter(PDFAnalysisService):
+    def __init__(self, pdf_analysis_service: PDFAnalysisService, file_repository: FileRepository):
+        self.pdf_analysis_service = pdf_analysis_service
+        self.file_repository = file_repository
+        self.memory_cache: LRUCache = LRUCache(maxsize=max(1, ANALYSIS_CACHE_MEMORY_MB) * 1024 * 1024, getsizeof=len)
+        self.max_disk_bytes: int = ANALYSIS_CACHE_DISK_MB * 1024 * 1024
+        self.lock = Lock()
+        self.metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def analyze_pdf_layout(
+        self,
+        pdf_content: AnyStr,
+        xml_filename: str = "",
+        parse_tables_and_math: bool = False,
+        keep_pdf: bool = False,
+        resolution: str = "",
+    ) -> list[dict]:
+        return self._analyze(
+            partial(self.pdf_analysis_service.analyze_pdf_layout, resolution=resolution),
+            "vgt",
+            pdf_content,
+            xml_filename,
+            parse_tables_and_math,
+            keep_pdf,
+            resolution,
+        )
+
+    def analyze_pdf_layout_fast(
+        self, pdf_content: AnyStr, xml_filename: str = "", parse_tables_and_math: bool = False, keep_pdf: bool = False
+    ) -> list[dict]:
+        return self._analyze(
+            self.pdf_analysis_service.analyze_pdf_layout_fast,
+            "fast",
+            pdf_content,
+            xml_filename,
+            parse_tables_and_math,
+            keep_pdf,
+        )
+
+    def analyze_pdf_layout_stream(
+        self, pdf_content: AnyStr, parse_tables_and_math: bool = False, use_fast_mode: bool = False, resolution: str = ""
+    ) -> Iterator[tuple[int, list[dict]]]:
+        mode = "fast" if use_fast_mode else "vgt"
+        cache_key = self._get_cache_key(pdf_content, mode, bool(parse_tables_and_math), "" if use_fast_mode else resolution)
+        cached_result = self._get(cache_key)
+        if cached_result is not None:
+            service_logger.info(f"Layout analysis cache hit {self.get_metrics()}")
+            segments_by_page: dict[int, list[dict]] = dict()
+            for segment_box in json.loads(cached_result):
+                segments_by_page.setdefault(segment_box["page_number"], []).append(segment_box)
+            yield from segments_by_page.items()
+            return
+
+        result = []
+        for page_number, segment_boxes in self.pdf_analysis_service.analyze_pdf_layout_stream(
+            pdf_content, parse_tables_and_math, use_fast_mode, resolution
+        ):
+            result.extend(segment_boxes)
+            yield page_number, segment_boxes
+        self._put(cache_key, json.dumps(result))
+
+    def analyze_pdf_layout_batch(
+        self,
+        pdf_contents: list[AnyStr],
+        parse_tables_and_math: bool = False,
+        use_fast_mode: bool = False,
+        resolution: str = "",
+    ) -> Iterator[tuple[int, list[dict] | Exception]]:
+        mode = "fast" if use_fast_mode else "vgt"
+        cache_keys = [
+            self._get_cache_key(pdf_content, mode, bool(parse_tables_and_math), "" if use_fast_mode else resolution)
+            for pdf_content in pdf_contents
+        ]
+        missing_indexes = []
+        for index, cache_key in enumerate(cache_keys):
+            cached_result = self._get(cache_key)
+            if cached_result is None:
+                missing_indexes.append(index)
+            else:
+                yield index, json.loads(cached_result)
+
+        if len(missing_indexes) < len(cache_keys):
+            service_logger.info(f"Layout analysis cache hits for {len(cache_keys) - len(missing_indexes)} batch documents")
+
+        for batch_index, result in self.pdf_analysis_service.analyze_pdf_layout_batch(
+            [pdf_contents[index] for index in missing_indexes], parse_tables_and_math, use_fast_mode, resolution
+        ):
+            index = missing_indexes[batch_index]
+            if not isinstance(result, Exception):
+                self._put(cache_keys[index], json.dumps(result))
+            yield index, result
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            lookups = sum(self.metrics.values())
+            hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+            return {
+                **self.metrics,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_bytes": self.memory_cache.currsize,
+            }
+
+    def _analyze(
+        self,
+        analyze,
+        mode: str,
+        pdf_content,
+        xml_filename: str,
+        parse_tables_and_math: bool,
+        keep_pdf: bool,
+        resolution: str = "",
+    ):
+        if xml_filename:
+            return analyze(pdf_content, xml_filename, parse_tables_and_math, keep_pdf)
+
+        cache_key = self._get_cache_key(pdf_content, mode, bool(parse_tables_and_math), resolution)
+        cached_result = self._get(cache_key)
+        if cached_result is not None:
+            service_logger.info(f"Layout analysis cache hit {self.get_metrics()}")
+            if keep_pdf:
+                self.file_repository.save_pdf(pdf_content)
+            return json.loads(cached_result)
+
+        result = analyze(pdf_content, xml_filename, parse_tables_and_math, keep_pdf)
+        self._put(cache_key, json.dumps(result))
+        return result
+
+    def _get_cache_key(self, pdf_content: AnyStr, mode: str, parse_tables_and_math: bool, resolution: str = "") -> str:
+        content = pdf_content.encode() if isinstance(pdf_content, str) else pdf_content
+        resolution = (resolution or DEFAULT_RESOLUTION) if mode == "vgt" else ""
+        content_hash = hashlib.sha256(content).hexdigest()
+        options = f"{int(parse_tables_and_math)}_{resolution}" if resolution else f"{int(parse_tables_and_math)}"
+        model_version = get_model_version(MODEL_FILES_BY_MODE[mode], INFERENCE_OPTIONS_BY_MODE[mode])
+        return f"{content_hash}_{mode}_{options}_{model_version}"
+
+    def _get(self, cache_key: str) -> str | None:
+        with self.lock:
+            cached_result = self.memory_cache.get(cache_key)
+            if cached_result is not None:
+                self.metrics["memory_hits"] += 1
+                return cached_result
+
+        cache_path = Path(ANALYSIS_CACHE_PATH, f"{cache_key}.json")
+        try:
+            cached_result = cache_path.read_text()
+            os.utime(cache_path)
+        except OSError:
+            with self.lock:
+                self.metrics["misses"] += 1
+            return None
+
+        with self.lock:
+            self.metrics["disk_hits"] += 1
+            self._put_in_memory(cache_key, cached_result)
+        return cached_result
+
+    def _put(self, cache_key: str, result: str):
+        with self.lock:
+            self._put_in_memory(cache_key, result)
+
+        if self.max_disk_bytes <= 0:
+            return
+
+        ANALYSIS_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        temporary_path = Path(ANALYSIS_CACHE_PATH, f"{cache_key}.json.tmp")
+        temporary_path.write_text(result)
+        temporary_path.replace(Path(ANALYSIS_CACHE_PATH, f"{cache_key}.json"))
+        self._evict_from_disk()
+
+    def _put_in_memory(self, cache_key: str, result: str):
+        try:
+            self.memory_cache[cache_key] = result
+        except ValueError:
+            pass
+
+    def _evict_from_disk(self):
+        cache_files = []
+        for cache_path in ANALYSIS_CACHE_PATH.glob("*.json"):
+            try:
+                cache_stat = cache_path.stat()
+            except OSError:
+                continue
+            cache_files.append((cache_stat.st_mtime, cache_stat.st_size, cache_path))
+
+        total_bytes = sum(size for _, size, _ in cache_files)
+        for _, size, cache_path in sorted(cache_files, key=lambda cache_file: cache_file[0]):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            cache_path.unlink(missing_ok=True)
+            total_bytes -= size
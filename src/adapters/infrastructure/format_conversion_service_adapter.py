@@ -1,13 +1,24 @@
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
 from ports.services.format_conversion_service import FormatConversionService
+from adapters.infrastructure.format_converters.engine_pools import (
+    get_engine_pools_metrics,
+    latex_ocr_pool,
+    table_engines_pool,
+)
 from adapters.infrastructure.format_converters.convert_table_to_html import extract_table_format
 from adapters.infrastructure.format_converters.convert_formula_to_latex import extract_formula_format
 
 
 class FormatConversionServiceAdapter(FormatConversionService):
+    latex_ocr_pool = latex_ocr_pool
+    table_engines_pool = table_engines_pool
+
     def convert_table_to_html(self, pdf_images: PdfImages, segments: list[PdfSegment]) -> None:
-        extract_table_format(pdf_images, segments)
+        extract_table_format(pdf_images, segments, self.table_engines_pool)
 
     def convert_formula_to_latex(self, pdf_images: PdfImages, segments: list[PdfSegment]) -> None:
-        extract_formula_format(pdf_images, segments)
+        extract_formula_format(pdf_images, segments, self.latex_ocr_pool)
+
+    def get_engine_pools_metrics(self) -> dict:
+        return get_engine_pools_metrics()
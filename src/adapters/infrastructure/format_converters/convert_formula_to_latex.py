@@ -1,10 +1,31 @@
-from PIL.Image import Image
-from pix2tex.cli import LatexOCR
+from collections import defaultdict
+from threading import Lock
+
+import numpy as np
+import torch
+from PIL import Image
+from PIL.Image import Image as PILImage
+from cachetools import LRUCache
+from pix2tex.cli import LatexOCR, minmax_size
+from pix2tex.dataset.transforms import test_transform
+from pix2tex.utils import pad, post_process, token2str
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+from adapters.infrastructure.format_converters.image_hash import get_image_hash
+from configuration import FORMULA_BATCH_SIZE, FORMULA_CACHE_SIZE
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
 from pdf_token_type_labels import TokenType
 import latex2mathml.converter
 
+formulas_cache: LRUCache = LRUCache(maxsize=FORMULA_CACHE_SIZE)
+formulas_cache_lock = Lock()
+
+
+def load_latex_ocr() -> LatexOCR:
+    model = LatexOCR()
+    model.args.temperature = 1e-8
+    return model
+
 
 def has_arabic(text: str) -> bool:
     return any("\u0600" <= char <= "\u06ff" or "\u0750" <= char <= "\u077f" for char in text)
@@ -18,26 +39,97 @@ def is_valid_latex(formula: str) -> bool:
         return False
 
 
-def extract_formula_format(pdf_images: PdfImages, predicted_segments: list[PdfSegment]):
+def validate_formula(formula: str) -> tuple[str, bool]:
+    return formula, is_valid_latex(formula)
+
+
+def get_formula_tensor(model: LatexOCR, formula_image: PILImage) -> torch.Tensor:
+    max_dimensions, min_dimensions = model.args.max_dimensions, model.args.min_dimensions
+    image = minmax_size(pad(formula_image), max_dimensions, min_dimensions)
+    if model.image_resizer is None or model.args.no_resize:
+        return test_transform(image=np.array(pad(image).convert("RGB")))["image"][:1].unsqueeze(0)
+
+    input_image = image.convert("RGB").copy()
+    ratio, width, height = 1, input_image.size[0], input_image.size[1]
+    for _ in range(10):
+        height = int(height * ratio)
+        resample = Image.Resampling.BILINEAR if ratio > 1 else Image.Resampling.LANCZOS
+        image = pad(minmax_size(input_image.resize((width, height), resample), max_dimensions, min_dimensions))
+        formula_tensor = test_transform(image=np.array(image.convert("RGB")))["image"][:1].unsqueeze(0)
+        width = (model.image_resizer(formula_tensor.to(model.args.device)).argmax(-1).item() + 1) * 32
+        if width == image.size[0]:
+            break
+        ratio = width / image.size[0]
+    return formula_tensor
+
+
+def get_batches_indexes(formula_tensors: list[torch.Tensor]) -> list[list[int]]:
+    indexes_by_shape: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for index, formula_tensor in enumerate(formula_tensors):
+        indexes_by_shape[tuple(formula_tensor.shape[-2:])].append(index)
+
+    batches_indexes = []
+    for indexes in indexes_by_shape.values():
+        batches_indexes.extend(
+            indexes[start : start + FORMULA_BATCH_SIZE] for start in range(0, len(indexes), FORMULA_BATCH_SIZE)
+        )
+    return batches_indexes
+
+
+def decode_formulas(model: LatexOCR, tokens: torch.Tensor) -> list[str]:
+    formulas = []
+    for formula_tokens in tokens:
+        eos_positions = (formula_tokens == model.args.eos_token).nonzero()
+        if len(eos_positions):
+            formula_tokens = formula_tokens[: eos_positions[0, 0] + 1]
+        formulas.append(post_process(token2str(formula_tokens, model.tokenizer)[0]))
+    return formulas
+
+
+def recognize_formulas(model: LatexOCR, formula_images: list[PILImage]) -> list[str]:
+    formulas: list[str] = [""] * len(formula_images)
+    with torch.no_grad():
+        formula_tensors = [get_formula_tensor(model, formula_image) for formula_image in formula_images]
+        for batch_indexes in get_batches_indexes(formula_tensors):
+            batch = torch.cat([formula_tensors[index] for index in batch_indexes]).to(model.args.device)
+            tokens = model.model.generate(batch, temperature=model.args.get("temperature", 0.25))
+            for index, formula in zip(batch_indexes, decode_formulas(model, tokens)):
+                formulas[index] = formula
+    return formulas
+
+
+def extract_formula_format(
+    pdf_images: PdfImages, predicted_segments: list[PdfSegment], latex_ocr_pool: EnginePool[LatexOCR]
+):
     formula_segments = [segment for segment in predicted_segments if segment.segment_type == TokenType.FORMULA]
+    formula_segments = [segment for segment in formula_segments if not has_arabic(segment.text_content)]
     if not formula_segments:
         return
 
-    model = LatexOCR()
-    model.args.temperature = 1e-8
+    formula_images = [pdf_images.get_region_image(segment.page_number, segment.bounding_box) for segment in formula_segments]
+    images_hashes = [get_image_hash(formula_image) for formula_image in formula_images]
+    with formulas_cache_lock:
+        results_by_hash: dict[str, tuple[str, bool]] = {
+            image_hash: formulas_cache[image_hash] for image_hash in set(images_hashes) if image_hash in formulas_cache
+        }
 
-    for formula_segment in formula_segments:
-        if has_arabic(formula_segment.text_content):
-            continue
-        page_image: Image = pdf_images.pdf_images[formula_segment.page_number - 1]
-        left, top = formula_segment.bounding_box.left, formula_segment.bounding_box.top
-        right, bottom = formula_segment.bounding_box.right, formula_segment.bounding_box.bottom
-        left = int(left * pdf_images.dpi / 72)
-        top = int(top * pdf_images.dpi / 72)
-        right = int(right * pdf_images.dpi / 72)
-        bottom = int(bottom * pdf_images.dpi / 72)
-        formula_image = page_image.crop((left, top, right, bottom))
-        formula_result = model(formula_image)
-        if not is_valid_latex(formula_result):
+    missing_images_by_hash = {
+        image_hash: formula_image
+        for image_hash, formula_image in zip(images_hashes, formula_images)
+        if image_hash not in results_by_hash
+    }
+    if missing_images_by_hash:
+        with latex_ocr_pool.acquire() as model:
+            formulas = recognize_formulas(model, list(missing_images_by_hash.values()))
+        new_results = {
+            image_hash: validate_formula(formula) for image_hash, formula in zip(missing_images_by_hash, formulas)
+        }
+        results_by_hash.update(new_results)
+        with formulas_cache_lock:
+            formulas_cache.update(new_results)
+
+    for formula_segment, image_hash in zip(formula_segments, images_hashes):
+        formula_result, valid_latex = results_by_hash[image_hash]
+        if not valid_latex:
             continue
         formula_segment.text_content = f"$${formula_result}$$"
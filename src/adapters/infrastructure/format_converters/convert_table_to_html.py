@@ -1,33 +1,143 @@
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+from PIL.Image import Image
+from cachetools import LRUCache
+from pdf_features import PdfFeatures, PdfToken, Rectangle
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+from adapters.infrastructure.format_converters.image_hash import get_image_hash
+from configuration import TABLE_BATCH_SIZE, TABLE_CACHE_SIZE
+from domain.PageSpatialIndex import PageSpatialIndex
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
 from pdf_token_type_labels import TokenType
 from rapidocr import RapidOCR
 from rapid_table import ModelType, RapidTable, RapidTableInput
 
+TABLE_TOKENS_MINIMUM_INTERSECTION = 50
+
+tables_cache: LRUCache = LRUCache(maxsize=TABLE_CACHE_SIZE)
+tables_cache_lock = Lock()
+
+
+def load_table_engines() -> tuple[RapidOCR, RapidTable]:
+    return RapidOCR(), RapidTable(RapidTableInput(model_type=ModelType.SLANETPLUS))
+
+
+def get_tables_tokens(pdf_features: PdfFeatures, table_segments: list[PdfSegment]) -> list[list[PdfToken]]:
+    pages_by_number = {page.page_number: page for page in pdf_features.pages}
+    tokens_indexes: dict[int, PageSpatialIndex] = dict()
+    tables_tokens = []
+    for table_segment in table_segments:
+        page = pages_by_number.get(table_segment.page_number)
+        if not page or not page.tokens:
+            tables_tokens.append([])
+            continue
+        if page.page_number not in tokens_indexes:
+            tokens_indexes[page.page_number] = PageSpatialIndex([token.bounding_box for token in page.tokens])
+        table_box = table_segment.bounding_box
+        tables_tokens.append(
+            [
+                page.tokens[token_index]
+                for token_index in tokens_indexes[page.page_number].query(table_box)
+                if page.tokens[token_index].bounding_box.get_intersection_percentage(table_box)
+                > TABLE_TOKENS_MINIMUM_INTERSECTION
+            ]
+        )
+    return tables_tokens
+
+
+def get_text_layer_ocr_result(tokens: list[PdfToken], table_box: Rectangle, dpi: int):
+    scale = dpi / 72
+    boxes = []
+    for token in tokens:
+        left = (token.bounding_box.left - table_box.left) * scale
+        top = (token.bounding_box.top - table_box.top) * scale
+        right = (token.bounding_box.right - table_box.left) * scale
+        bottom = (token.bounding_box.bottom - table_box.top) * scale
+        boxes.append([[left, top], [right, top], [right, bottom], [left, bottom]])
+    return np.array(boxes, dtype=np.float32), tuple(token.content for token in tokens), tuple(1.0 for _ in tokens)
 
-def extract_table_format(pdf_images: PdfImages, predicted_segments: list[PdfSegment]):
+
+def recognize_tables(
+    table_images: list[Image], ocr_results: list, table_engines_pool: EnginePool[tuple[RapidOCR, RapidTable]]
+) -> list[str]:
+    with table_engines_pool.acquire() as (ocr_engine, table_engine):
+        for index, table_image in enumerate(table_images):
+            if ocr_results[index] is not None:
+                continue
+            ori_ocr_res = ocr_engine(table_image)
+            if ori_ocr_res.txts:
+                ocr_results[index] = (ori_ocr_res.boxes, ori_ocr_res.txts, ori_ocr_res.scores)
+
+        recognized_indexes = [index for index, ocr_result in enumerate(ocr_results) if ocr_result is not None]
+        if not recognized_indexes:
+            return [""] * len(table_images)
+
+        table_result = table_engine(
+            [table_images[index] for index in recognized_indexes],
+            ocr_results=[ocr_results[index] for index in recognized_indexes],
+            batch_size=len(recognized_indexes),
+        )
+
+    tables_html = [""] * len(table_images)
+    for index, table_html in zip(recognized_indexes, table_result.pred_htmls):
+        tables_html[index] = table_html
+    return tables_html
+
+
+def extract_table_format(
+    pdf_images: PdfImages, predicted_segments: list[PdfSegment], table_engines_pool: EnginePool[tuple[RapidOCR, RapidTable]]
+):
     table_segments = [segment for segment in predicted_segments if segment.segment_type == TokenType.TABLE]
     if not table_segments:
         return
 
-    input_args = RapidTableInput(model_type=ModelType.SLANETPLUS)
+    table_images = [pdf_images.get_region_image(segment.page_number, segment.bounding_box) for segment in table_segments]
+    tables_tokens = get_tables_tokens(pdf_images.pdf_features, table_segments)
+    ocr_results = [
+        get_text_layer_ocr_result(tokens, segment.bounding_box, pdf_images.dpi) if tokens else None
+        for tokens, segment in zip(tables_tokens, table_segments)
+    ]
+    tables_hashes = [
+        get_image_hash(table_image, "|".join(ocr_result[1]) if ocr_result else "")
+        for table_image, ocr_result in zip(table_images, ocr_results)
+    ]
 
-    ocr_engine = RapidOCR()
-    table_engine = RapidTable(input_args)
+    with tables_cache_lock:
+        html_by_hash: dict[str, str] = {
+            table_hash: tables_cache[table_hash] for table_hash in set(tables_hashes) if table_hash in tables_cache
+        }
 
-    for table_segment in table_segments:
-        page_image: Image = pdf_images.pdf_images[table_segment.page_number - 1]
-        left, top = table_segment.bounding_box.left, table_segment.bounding_box.top
-        right, bottom = table_segment.bounding_box.right, table_segment.bounding_box.bottom
-        left = int(left * pdf_images.dpi / 72)
-        top = int(top * pdf_images.dpi / 72)
-        right = int(right * pdf_images.dpi / 72)
-        bottom = int(bottom * pdf_images.dpi / 72)
-        table_image = page_image.crop((left, top, right, bottom))
-        ori_ocr_res = ocr_engine(table_image)
-        if not ori_ocr_res.txts:
-            continue
-        ocr_results = [(ori_ocr_res.boxes, ori_ocr_res.txts, ori_ocr_res.scores)]
-        table_result = table_engine(table_image, ocr_results=ocr_results)
-        table_segment.text_content = table_result.pred_htmls[0]
+    missing_indexes_by_hash: dict[str, int] = dict()
+    for index, table_hash in enumerate(tables_hashes):
+        if table_hash not in html_by_hash:
+            missing_indexes_by_hash.setdefault(table_hash, index)
+
+    if missing_indexes_by_hash:
+        missing_indexes = list(missing_indexes_by_hash.values())
+        batches_indexes = [
+            missing_indexes[start : start + TABLE_BATCH_SIZE] for start in range(0, len(missing_indexes), TABLE_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=min(len(batches_indexes), table_engines_pool.max_size)) as executor:
+            batches_html = executor.map(
+                lambda batch_indexes: recognize_tables(
+                    [table_images[index] for index in batch_indexes],
+                    [ocr_results[index] for index in batch_indexes],
+                    table_engines_pool,
+                ),
+                batches_indexes,
+            )
+            new_html_by_hash = {
+                tables_hashes[index]: table_html
+                for batch_indexes, batch_html in zip(batches_indexes, batches_html)
+                for index, table_html in zip(batch_indexes, batch_html)
+            }
+        html_by_hash.update(new_html_by_hash)
+        with tables_cache_lock:
+            tables_cache.update(new_html_by_hash)
+
+    for table_segment, table_hash in zip(table_segments, tables_hashes):
+        if html_by_hash[table_hash]:
+            table_segment.text_content = html_by_hash[table_hash]
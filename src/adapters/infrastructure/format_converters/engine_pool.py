@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+from threading import Condition
+from typing import Callable, Generic, TypeVar
+
+from configuration import service_logger
+
+T = TypeVar("T")
+
+
+class EnginePool(Generic[T]):
+    def __init__(self, name: str, create: Callable[[], T], max_size: int):
+        self.name: str = name
+        self.create: Callable[[], T] = create
+        self.max_size: int = max(1, max_size)
+        self.idle_engines: list[T] = list()
+        self.created_count: int = 0
+        self.condition = Condition()
+        self.acquisitions: int = 0
+        self.total_wait_seconds: float = 0
+        self.max_wait_seconds: float = 0
+
+    def _take(self) -> T:
+        with self.condition:
+            while not self.idle_engines and self.created_count >= self.max_size:
+                self.condition.wait()
+            if self.idle_engines:
+                return self.idle_engines.pop()
+            self.created_count += 1
+
+        try:
+            start = time.perf_counter()
+            engine = self.create()
+            service_logger.info(f"Created {self.name} engine {self.created_count} in {time.perf_counter() - start:.2f}s")
+            return engine
+        except Exception:
+            with self.condition:
+                self.created_count -= 1
+                self.condition.notify()
+            raise
+
+    def _give_back(self, engine: T):
+        with self.condition:
+            self.idle_engines.append(engine)
+            self.condition.notify()
+
+    @contextmanager
+    def acquire(self):
+        start = time.perf_counter()
+        engine = self._take()
+        wait_seconds = time.perf_counter() - start
+        with self.condition:
+            self.acquisitions += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        try:
+            yield engine
+        finally:
+            self._give_back(engine)
+
+    def preload(self):
+        with self.acquire():
+            pass
+
+    def get_metrics(self) -> dict:
+        with self.condition:
+            return {
+                "engines": self.created_count,
+                "max_engines": self.max_size,
+                "idle_engines": len(self.idle_engines),
+                "acquisitions": self.acquisitions,
+                "mean_wait_seconds": round(self.total_wait_seconds / self.acquisitions, 4) if self.acquisitions else 0,
+                "max_wait_seconds": round(self.max_wait_seconds, 4),
+            }
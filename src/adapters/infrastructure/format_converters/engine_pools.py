@@ -0,0 +1,22 @@
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+from configuration import FORMAT_CONVERSION_POOL_SIZE
+
+
+def create_latex_ocr():
+    from adapters.infrastructure.format_converters.convert_formula_to_latex import load_latex_ocr
+
+    return load_latex_ocr()
+
+
+def create_table_engines():
+    from adapters.infrastructure.format_converters.convert_table_to_html import load_table_engines
+
+    return load_table_engines()
+
+
+latex_ocr_pool = EnginePool("LatexOCR", create_latex_ocr, FORMAT_CONVERSION_POOL_SIZE)
+table_engines_pool = EnginePool("RapidTable", create_table_engines, FORMAT_CONVERSION_POOL_SIZE)
+
+
+def get_engine_pools_metrics() -> dict:
+    return {"latex_ocr": latex_ocr_pool.get_metrics(), "table": table_engines_pool.get_metrics()}
@@ -0,0 +1,9 @@
+import hashlib
+
+from PIL.Image import Image
+
+
+def get_image_hash(image: Image, extra_content: str = "") -> str:
+    image_hash = hashlib.sha256(f"{image.mode}|{image.size}|{extra_content}|".encode())
+    image_hash.update(image.tobytes())
+    return image_hash.hexdigest()
@@ -0,0 +1,96 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import torch
+from cachetools import LRUCache
+from PIL import Image
+from pdf_features import Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.infrastructure.format_converters import convert_formula_to_latex
+from adapters.infrastructure.format_converters.convert_formula_to_latex import (
+    decode_formulas,
+    extract_formula_format,
+    get_batches_indexes,
+)
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+from domain.PdfSegment import PdfSegment
+
+VOCABULARY = {0: "[PAD]", 1: "[BOS]", 2: "[EOS]", 3: "x", 4: "+", 5: "y"}
+
+
+class FakeArguments:
+    eos_token = 2
+    device = "cpu"
+
+    @staticmethod
+    def get(_, default):
+        return default
+
+
+class FakeTokenizer:
+    @staticmethod
+    def decode(tokens: torch.Tensor) -> str:
+        return " ".join(VOCABULARY[token] for token in tokens.tolist())
+
+
+class FakeGenerator:
+    def __init__(self):
+        self.batches_sizes: list[int] = list()
+
+    def generate(self, batch: torch.Tensor, temperature: float) -> torch.Tensor:
+        self.batches_sizes.append(len(batch))
+        return torch.tensor([[1, 3 + int(formula_tensor.flatten()[0]), 2, 0] for formula_tensor in batch])
+
+
+class FakeLatexOCR:
+    def __init__(self):
+        self.args = FakeArguments()
+        self.tokenizer = FakeTokenizer()
+        self.model = FakeGenerator()
+
+
+class FakePdfImages:
+    def __init__(self, colors_by_page: dict[int, int]):
+        self.colors_by_page = colors_by_page
+
+    def get_region_image(self, page_number: int, bounding_box: Rectangle) -> Image.Image:
+        return Image.new("L", (bounding_box.width, bounding_box.height), self.colors_by_page[page_number])
+
+
+def get_formula_tensor(_, formula_image: Image.Image) -> torch.Tensor:
+    return torch.full((1, 1, formula_image.height, formula_image.width), formula_image.getpixel((0, 0)) % 3)
+
+
+def get_formula_segment(page_number: int) -> PdfSegment:
+    return PdfSegment(page_number, Rectangle.from_width_height(10, 10, 40, 20), "formula", TokenType.FORMULA)
+
+
+class TestConvertFormulaToLatex(TestCase):
+    def test_decode_formulas_stops_at_the_first_end_of_sequence(self):
+        tokens = torch.tensor([[1, 3, 4, 5, 2, 3, 3], [1, 5, 4, 3, 0, 0, 0]])
+
+        self.assertEqual(["x+y", "y+x"], decode_formulas(FakeLatexOCR(), tokens))
+
+    @patch.object(convert_formula_to_latex, "FORMULA_BATCH_SIZE", 2)
+    def test_batches_group_formulas_by_shape(self):
+        shapes = [(32, 64), (32, 96), (32, 64), (32, 64), (32, 96)]
+        formula_tensors = [torch.zeros(1, 1, height, width) for height, width in shapes]
+
+        self.assertEqual([[0, 2], [3], [1, 4]], get_batches_indexes(formula_tensors))
+
+    @patch.object(convert_formula_to_latex, "get_formula_tensor", get_formula_tensor)
+    @patch.object(convert_formula_to_latex, "formulas_cache", LRUCache(maxsize=10))
+    def test_formulas_are_recognized_once_per_crop(self):
+        latex_ocr = FakeLatexOCR()
+        latex_ocr_pool = EnginePool("latex_ocr", lambda: latex_ocr, 1)
+        pdf_images = FakePdfImages({1: 0, 2: 1, 3: 0})
+
+        first_segments = [get_formula_segment(page_number) for page_number in [1, 2, 3]]
+        extract_formula_format(pdf_images, first_segments, latex_ocr_pool)
+        second_segments = [get_formula_segment(page_number) for page_number in [3, 2]]
+        extract_formula_format(pdf_images, second_segments, latex_ocr_pool)
+
+        self.assertEqual([2], latex_ocr.model.batches_sizes)
+        self.assertEqual(["$$x$$", "$$+$$", "$$x$$"], [segment.text_content for segment in first_segments])
+        self.assertEqual(["$$x$$", "$$+$$"], [segment.text_content for segment in second_segments])
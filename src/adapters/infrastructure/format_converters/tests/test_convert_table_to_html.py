@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from cachetools import LRUCache
+from PIL import Image
+from pdf_features import Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.infrastructure.format_converters import convert_table_to_html
+from adapters.infrastructure.format_converters.convert_table_to_html import (
+    extract_table_format,
+    get_tables_tokens,
+    get_text_layer_ocr_result,
+)
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+from domain.PdfSegment import PdfSegment
+
+TABLE_BOX = Rectangle.from_coordinates(100, 200, 300, 260)
+
+
+def get_token(content: str, left: float, top: float, right: float, bottom: float):
+    return SimpleNamespace(content=content, bounding_box=Rectangle.from_coordinates(left, top, right, bottom))
+
+
+def get_table_segment(page_number: int) -> PdfSegment:
+    return PdfSegment(page_number, TABLE_BOX, "", TokenType.TABLE)
+
+
+class FakeOcrEngine:
+    def __call__(self, table_image: Image.Image):
+        raise AssertionError("Tables with a text layer must not be sent to the OCR engine")
+
+
+class FakeTableEngine:
+    def __init__(self):
+        self.recognized_texts: list[tuple[str, ...]] = list()
+
+    def __call__(self, table_images: list[Image.Image], ocr_results: list, batch_size: int):
+        texts = [ocr_result[1] for ocr_result in ocr_results]
+        self.recognized_texts.extend(texts)
+        return SimpleNamespace(pred_htmls=[f"<table>{''.join(text)}</table>" for text in texts])
+
+
+class FakePdfImages:
+    def __init__(self, pages):
+        self.dpi = 72
+        self.pdf_features = SimpleNamespace(pages=pages)
+
+    def get_region_image(self, page_number: int, bounding_box: Rectangle) -> Image.Image:
+        return Image.new("RGB", (int(bounding_box.width), int(bounding_box.height)), "white")
+
+
+class TestConvertTableToHtml(TestCase):
+    def test_tables_tokens_are_mostly_inside_the_table(self):
+        inside = get_token("inside", 110, 210, 150, 220)
+        mostly_inside = get_token("mostly_inside", 284, 240, 304, 250)
+        half_inside = get_token("half_inside", 290, 210, 310, 220)
+        mostly_outside = get_token("mostly_outside", 292, 230, 312, 240)
+        outside = get_token("outside", 400, 400, 430, 410)
+        pages = [
+            SimpleNamespace(page_number=1, tokens=[outside, inside, half_inside, mostly_outside, mostly_inside]),
+            SimpleNamespace(page_number=2, tokens=[]),
+        ]
+        table_segments = [get_table_segment(1), get_table_segment(2), get_table_segment(3)]
+
+        tables_tokens = get_tables_tokens(SimpleNamespace(pages=pages), table_segments)
+
+        self.assertEqual([[inside, mostly_inside], [], []], tables_tokens)
+
+    def test_text_layer_boxes_are_relative_to_the_crop(self):
+        tokens = [get_token("a", 110, 210, 150, 220), get_token("b", 200, 240, 300, 260)]
+
+        for dpi in [72, 200]:
+            with self.subTest(dpi=dpi):
+                boxes, texts, scores = get_text_layer_ocr_result(tokens, TABLE_BOX, dpi)
+
+                expected_boxes = np.array(
+                    [
+                        [[10, 10], [50, 10], [50, 20], [10, 20]],
+                        [[100, 40], [200, 40], [200, 60], [100, 60]],
+                    ]
+                ) * (dpi / 72)
+                np.testing.assert_allclose(expected_boxes, boxes, rtol=1e-6)
+                self.assertEqual(("a", "b"), texts)
+                self.assertEqual((1.0, 1.0), scores)
+
+    @patch.object(convert_table_to_html, "tables_cache", LRUCache(maxsize=10))
+    def test_tables_are_cached_by_crop_and_text_layer(self):
+        table_engine = FakeTableEngine()
+        table_engines_pool = EnginePool("table", lambda: (FakeOcrEngine(), table_engine), 1)
+        pages = [
+            SimpleNamespace(page_number=1, tokens=[get_token("a", 110, 210, 150, 220)]),
+            SimpleNamespace(page_number=2, tokens=[get_token("b", 110, 210, 150, 220)]),
+            SimpleNamespace(page_number=3, tokens=[get_token("a", 110, 210, 150, 220)]),
+        ]
+        pdf_images = FakePdfImages(pages)
+
+        first_segments = [get_table_segment(page_number) for page_number in [1, 2, 3]]
+        extract_table_format(pdf_images, first_segments, table_engines_pool)
+        second_segments = [get_table_segment(page_number) for page_number in [3, 2]]
+        extract_table_format(pdf_images, second_segments, table_engines_pool)
+
+        self.assertEqual([("a",), ("b",)], table_engine.recognized_texts)
+        first_html = ["<table>a</table>", "<table>b</table>", "<table>a</table>"]
+        self.assertEqual(first_html, [segment.text_content for segment in first_segments])
+        self.assertEqual(["<table>a</table>", "<table>b</table>"], [segment.text_content for segment in second_segments])
@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from adapters.infrastructure.format_converters.engine_pool import EnginePool
+
+
+class TestEnginePool(TestCase):
+    def test_engines_are_created_once_and_reused(self):
+        engine_pool = EnginePool("test", object, 2)
+        with engine_pool.acquire() as first_engine:
+            pass
+        with engine_pool.acquire() as second_engine:
+            pass
+
+        self.assertIs(first_engine, second_engine)
+        self.assertEqual(1, engine_pool.get_metrics()["engines"])
+        self.assertEqual(2, engine_pool.get_metrics()["acquisitions"])
+
+    def test_engines_are_bounded(self):
+        engine_pool = EnginePool("test", object, 2)
+
+        def use_engine(_):
+            with engine_pool.acquire() as engine:
+                time.sleep(0.05)
+                return engine
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            engines = list(executor.map(use_engine, range(6)))
+
+        metrics = engine_pool.get_metrics()
+        self.assertEqual(2, len({id(engine) for engine in engines}))
+        self.assertEqual(2, metrics["engines"])
+        self.assertEqual(2, metrics["idle_engines"])
+        self.assertGreater(metrics["max_wait_seconds"], 0.03)
+
+    def test_failed_creation_frees_the_slot(self):
+        engine_pool = EnginePool("test", lambda: 1 / 0, 1)
+        with self.assertRaises(ZeroDivisionError):
+            engine_pool.preload()
+
+        engine_pool.create = object
+        engine_pool.preload()
+        self.assertEqual(1, engine_pool.get_metrics()["engines"])
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from configuration import SRC_PATH
+
+ENGINE_MODULES = ["torch", "pix2tex", "rapidocr", "rapid_table"]
+
+
+class TestEnginePools(TestCase):
+    def test_metrics_do_not_import_the_engines(self):
+        script = (
+            "import sys\n"
+            "from adapters.infrastructure.format_converters.engine_pools import get_engine_pools_metrics\n"
+            "assert get_engine_pools_metrics()['table']['engines'] == 0\n"
+            f"print([module for module in {ENGINE_MODULES} if module in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=SRC_PATH, capture_output=True, text=True)
+
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual("[]", result.stdout.strip())
@@ -0,0 +1,36 @@
+import time
+from threading import Lock
+from typing import Callable, Generic, TypeVar
+
+from configuration import service_logger
+
+T = TypeVar("T")
+
+
+class LazyLoader(Generic[T]):
+    def __init__(self, name: str, load: Callable[[], T]):
+        self.name: str = name
+        self.load: Callable[[], T] = load
+        self.lock = Lock()
+        self.value: T | None = None
+        self.loaded: bool = False
+
+    def get(self) -> T:
+        if self.loaded:
+            return self.value
+
+        with self.lock:
+            if not self.loaded:
+                start = time.perf_counter()
+                self.value = self.load()
+                self.loaded = True
+                service_logger.info(f"Loaded {self.name} in {time.perf_counter() - start:.2f}s")
+        return self.value
+
+
+class LazyService:
+    def __init__(self, name: str, load: Callable[[], object]):
+        self.loader: LazyLoader[object] = LazyLoader(name, load)
+
+    def __getattr__(self, attribute_name: str):
+        return getattr(self.loader.get(), attribute_name)
@@ -6,12 +6,12 @@ import json
 from fitz import Page
 from pathlib import Path
 from typing import Optional, Union
-from PIL.Image import Image
-from pdf2image import convert_from_path
 from starlette.responses import Response
 
 from configuration import service_logger
+from domain.PageSpatialIndex import PageSpatialIndex
 from domain.SegmentBox import SegmentBox
+from domain.LazyPdfImages import LazyPdfImages
 from pdf_features.PdfFeatures import PdfFeatures
 from pdf_features.PdfToken import PdfToken
 from pdf_features.Rectangle import Rectangle
@@ -21,6 +21,7 @@ from pdf_token_type_labels.PdfLabels import PdfLabels
 from pdf_token_type_labels.TokenType import TokenType
 
 from adapters.infrastructure.markup_conversion.OutputFormat import OutputFormat
+from adapters.infrastructure.pdf_rasterizer import pdf_rasterizer
 from adapters.infrastructure.markup_conversion.Link import Link
 from adapters.infrastructure.markup_conversion.ExtractedImage import ExtractedImage
 from adapters.infrastructure.translation.ollama_container_manager import OllamaContainerManager
@@ -253,10 +254,9 @@ class PdfToMarkupServiceAdapter:
     def _process_picture_segment(
         self,
         segment: SegmentBox,
-        pdf_images: list[Image],
+        pdf_images: LazyPdfImages,
         pdf_path: Path,
         picture_id: int,
-        dpi: int = 72,
         extracted_images: Optional[list[ExtractedImage]] = None,
         user_base_name: Optional[str] = None,
     ) -> str:
@@ -265,14 +265,7 @@ class PdfToMarkupServiceAdapter:
             return ""
 
         segment_box = Rectangle.from_width_height(segment.left, segment.top, segment.width, segment.height)
-        image = pdf_images[segment.page_number - 1]
-        left, top, right, bottom = segment_box.left, segment_box.top, segment_box.right, segment_box.bottom
-        if dpi != 72:
-            left = left * dpi / 72
-            top = top * dpi / 72
-            right = right * dpi / 72
-            bottom = bottom * dpi / 72
-        cropped = image.crop((left, top, right, bottom))
+        cropped = pdf_images.get_region_image(segment.page_number, segment_box)
 
         base_name = user_base_name if user_base_name else pdf_path.stem
         image_name = f"{base_name}_{segment.page_number}_{picture_id}.png"
@@ -374,20 +367,24 @@ class PdfToMarkupServiceAdapter:
 
         links_by_source, links_by_dest = self._extract_links_by_segments(pdf_path, vgt_segments)
 
-        picture_segments = [s for s in vgt_segments if s.type == TokenType.PICTURE]
-        pdf_images: list[Image] = convert_from_path(pdf_path, dpi=dpi) if picture_segments else []
+        pdf_images = LazyPdfImages(pdf_features, pdf_path, pdf_rasterizer, dpi)
 
         for page in pdf_features.pages:
             segments_in_page = [s for s in vgt_segments if s.page_number == page.page_number]
+            tokens_index = PageSpatialIndex([token.bounding_box for token in page.tokens])
             picture_id = 0
             for segment in segments_in_page:
                 seg_box = Rectangle.from_width_height(segment.left, segment.top, segment.width, segment.height)
-                tokens_in_seg = [t for t in page.tokens if t.bounding_box.get_intersection_percentage(seg_box) > 50]
+                tokens_in_seg = [
+                    page.tokens[token_index]
+                    for token_index in tokens_index.query(seg_box)
+                    if page.tokens[token_index].bounding_box.get_intersection_percentage(seg_box) > 50
+                ]
 
                 if segment.type == TokenType.PICTURE:
                     content_parts.append(
                         self._process_picture_segment(
-                            segment, pdf_images, pdf_path, picture_id, dpi, extracted_images, user_base_name
+                            segment, pdf_images, pdf_path, picture_id, extracted_images, user_base_name
                         )
                     )
                     picture_id += 1
@@ -1,11 +1,17 @@
-from typing import AnyStr
+from collections import defaultdict
+from pathlib import Path
+from typing import AnyStr, Iterator
+from domain.LazyPdfImages import LazyPageImages, LazyPdfImages
 from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
 from domain.SegmentBox import SegmentBox
 from ports.services.pdf_analysis_service import PDFAnalysisService
 from ports.services.ml_model_service import MLModelService
 from ports.services.format_conversion_service import FormatConversionService
 from ports.repositories.file_repository import FileRepository
-from configuration import service_logger
+from ports.services.pdf_rasterizer_service import PdfRasterizerService
+from configuration import BATCH_DOCUMENTS_PER_PASS, STREAM_PAGE_WINDOW, service_logger
 
 
 class PDFAnalysisServiceAdapter(PDFAnalysisService):
@@ -15,28 +21,38 @@ class PDFAnalysisServiceAdapter(PDFAnalysisService):
         fast_model_service: MLModelService,
         format_conversion_service: FormatConversionService,
         file_repository: FileRepository,
+        pdf_rasterizer_service: PdfRasterizerService,
     ):
         self.vgt_model_service = vgt_model_service
         self.fast_model_service = fast_model_service
         self.format_conversion_service = format_conversion_service
         self.file_repository = file_repository
+        self.pdf_rasterizer_service = pdf_rasterizer_service
 
     def analyze_pdf_layout(
-        self, pdf_content: AnyStr, xml_filename: str = "", parse_tables_and_math: bool = False, keep_pdf: bool = False
+        self,
+        pdf_content: AnyStr,
+        xml_filename: str = "",
+        parse_tables_and_math: bool = False,
+        keep_pdf: bool = False,
+        resolution: str = "",
     ) -> list[dict]:
         pdf_path = self.file_repository.save_pdf(pdf_content)
         service_logger.info("Creating PDF images")
 
-        pdf_images_list: list[PdfImages] = [PdfImages.from_pdf_path(pdf_path, "", xml_filename)]
+        pdf_images_list: list[PdfImages] = [PdfImages.from_pdf_path(pdf_path, self.pdf_rasterizer_service, "", xml_filename)]
 
-        predicted_segments = self.vgt_model_service.predict_document_layout(pdf_images_list)
+        with RequestWorkspace() as workspace:
+            predicted_segments = self.vgt_model_service.predict_document_layout(pdf_images_list, workspace, resolution)
 
         if predicted_segments:
             service_logger.info(f"Predicted {len(predicted_segments)} segments")
 
         if parse_tables_and_math:
             service_logger.info("Parsing tables and formulas")
-            pdf_images_200_dpi = PdfImages.from_pdf_path(pdf_path, "", xml_filename, dpi=200)
+            pdf_images_200_dpi = LazyPdfImages(
+                pdf_images_list[0].pdf_features, pdf_path, self.pdf_rasterizer_service, dpi=200
+            )
             self.format_conversion_service.convert_formula_to_latex(pdf_images_200_dpi, predicted_segments)
             self.format_conversion_service.convert_table_to_html(pdf_images_200_dpi, predicted_segments)
 
@@ -48,18 +64,60 @@ class PDFAnalysisServiceAdapter(PDFAnalysisService):
             for pdf_segment in predicted_segments
         ]
 
+    def analyze_pdf_layout_stream(
+        self, pdf_content: AnyStr, parse_tables_and_math: bool = False, use_fast_mode: bool = False, resolution: str = ""
+    ) -> Iterator[tuple[int, list[dict]]]:
+        pdf_path = self.file_repository.save_pdf(pdf_content)
+        try:
+            pdf_features = PdfImages.get_pdf_features(pdf_path)
+            pdf_images_200_dpi = LazyPdfImages(pdf_features, pdf_path, self.pdf_rasterizer_service, dpi=200)
+            table_pdf_images = pdf_images_200_dpi
+            if use_fast_mode:
+                pages_72_dpi = LazyPageImages(pdf_path, len(pdf_features.pages), 72, self.pdf_rasterizer_service)
+                table_pdf_images = PdfImages(pdf_features, pages_72_dpi, 72)
+            for window_pdf_images in PdfImages.get_page_windows(
+                pdf_path, pdf_features, STREAM_PAGE_WINDOW, self.pdf_rasterizer_service
+            ):
+                first_page, last_page = window_pdf_images.pdf_features.pages[0], window_pdf_images.pdf_features.pages[-1]
+                service_logger.info(f"Analyzing pages {first_page.page_number}-{last_page.page_number}")
+                with RequestWorkspace() as workspace:
+                    if use_fast_mode:
+                        predicted_segments = self.fast_model_service.predict_layout_fast([window_pdf_images], workspace)
+                    else:
+                        predicted_segments = self.vgt_model_service.predict_document_layout(
+                            [window_pdf_images], workspace, resolution
+                        )
+
+                if parse_tables_and_math:
+                    self.format_conversion_service.convert_formula_to_latex(pdf_images_200_dpi, predicted_segments)
+                    self.format_conversion_service.convert_table_to_html(table_pdf_images, predicted_segments)
+
+                segments_by_page: dict[int, list[dict]] = dict()
+                for pdf_segment in predicted_segments:
+                    segment_box = SegmentBox.from_pdf_segment(pdf_segment, pdf_features.pages).to_dict()
+                    segments_by_page.setdefault(pdf_segment.page_number, []).append(segment_box)
+
+                for page in window_pdf_images.pdf_features.pages:
+                    if page.page_number in segments_by_page:
+                        yield page.page_number, segments_by_page[page.page_number]
+        finally:
+            self.file_repository.delete_file(pdf_path)
+
     def analyze_pdf_layout_fast(
         self, pdf_content: AnyStr, xml_filename: str = "", parse_tables_and_math: bool = False, keep_pdf: bool = False
     ) -> list[dict]:
         pdf_path = self.file_repository.save_pdf(pdf_content)
         service_logger.info("Creating PDF images for fast analysis")
 
-        pdf_images_list: list[PdfImages] = [PdfImages.from_pdf_path(pdf_path, "", xml_filename)]
+        pdf_images_list: list[PdfImages] = [PdfImages.from_pdf_path(pdf_path, self.pdf_rasterizer_service, "", xml_filename)]
 
-        predicted_segments = self.fast_model_service.predict_layout_fast(pdf_images_list)
+        with RequestWorkspace() as workspace:
+            predicted_segments = self.fast_model_service.predict_layout_fast(pdf_images_list, workspace)
 
         if parse_tables_and_math:
-            pdf_images_200_dpi = PdfImages.from_pdf_path(pdf_path, "", xml_filename, dpi=200)
+            pdf_images_200_dpi = LazyPdfImages(
+                pdf_images_list[0].pdf_features, pdf_path, self.pdf_rasterizer_service, dpi=200
+            )
             self.format_conversion_service.convert_formula_to_latex(pdf_images_200_dpi, predicted_segments)
             self.format_conversion_service.convert_table_to_html(pdf_images_list[0], predicted_segments)
 
@@ -70,3 +128,113 @@ class PDFAnalysisServiceAdapter(PDFAnalysisService):
             SegmentBox.from_pdf_segment(pdf_segment, pdf_images_list[0].pdf_features.pages).to_dict()
             for pdf_segment in predicted_segments
         ]
+
+    def analyze_pdf_layout_batch(
+        self,
+        pdf_contents: list[AnyStr],
+        parse_tables_and_math: bool = False,
+        use_fast_mode: bool = False,
+        resolution: str = "",
+    ) -> Iterator[tuple[int, list[dict] | Exception]]:
+        documents_per_pass = max(1, BATCH_DOCUMENTS_PER_PASS)
+        for first_index in range(0, len(pdf_contents), documents_per_pass):
+            yield from self._analyze_batch(
+                first_index,
+                pdf_contents[first_index : first_index + documents_per_pass],
+                parse_tables_and_math,
+                use_fast_mode,
+                resolution,
+            )
+
+    def _analyze_batch(
+        self,
+        first_index: int,
+        pdf_contents: list[AnyStr],
+        parse_tables_and_math: bool,
+        use_fast_mode: bool,
+        resolution: str,
+    ) -> Iterator[tuple[int, list[dict] | Exception]]:
+        pdf_paths: dict[int, Path] = dict()
+        pdf_images_by_index: dict[int, PdfImages] = dict()
+        try:
+            for index, pdf_content in enumerate(pdf_contents, first_index):
+                pdf_paths[index] = self.file_repository.save_pdf(pdf_content)
+                try:
+                    pdf_images_by_index[index] = PdfImages.from_pdf_path(pdf_paths[index], self.pdf_rasterizer_service)
+                except Exception as error:
+                    service_logger.error(f"Could not read batch document {index}", exc_info=1)
+                    yield index, error
+                    continue
+                for page in pdf_images_by_index[index].pdf_features.pages:
+                    page.pdf_name = pdf_images_by_index[index].pdf_features.file_name
+
+            service_logger.info(f"Analyzing {len(pdf_images_by_index)} documents in one model pass")
+            segments_by_index = self._predict_batch(pdf_images_by_index, use_fast_mode, resolution)
+            for index, pdf_images in pdf_images_by_index.items():
+                result = segments_by_index[index]
+                if isinstance(result, Exception):
+                    yield index, result
+                    continue
+                try:
+                    result = self._get_segment_boxes(
+                        pdf_images, pdf_paths[index], result, parse_tables_and_math, use_fast_mode
+                    )
+                except Exception as error:
+                    service_logger.error(f"Could not convert tables and formulas of batch document {index}", exc_info=1)
+                    result = error
+                yield index, result
+        finally:
+            for pdf_path in pdf_paths.values():
+                self.file_repository.delete_file(pdf_path)
+
+    def _predict(self, pdf_images_list: list[PdfImages], use_fast_mode: bool, resolution: str) -> list[PdfSegment]:
+        with RequestWorkspace() as workspace:
+            if use_fast_mode:
+                return self.fast_model_service.predict_layout_fast(pdf_images_list, workspace)
+            return self.vgt_model_service.predict_document_layout(pdf_images_list, workspace, resolution)
+
+    def _predict_batch(
+        self, pdf_images_by_index: dict[int, PdfImages], use_fast_mode: bool, resolution: str
+    ) -> dict[int, list[PdfSegment] | Exception]:
+        if not pdf_images_by_index:
+            return dict()
+
+        try:
+            predicted_segments = self._predict(list(pdf_images_by_index.values()), use_fast_mode, resolution)
+        except Exception:
+            service_logger.error("Batch prediction failed, predicting documents one by one", exc_info=1)
+            segments_by_index: dict[int, list[PdfSegment] | Exception] = dict()
+            for index, pdf_images in pdf_images_by_index.items():
+                try:
+                    segments_by_index[index] = self._predict([pdf_images], use_fast_mode, resolution)
+                except Exception as error:
+                    service_logger.error(f"Could not analyze batch document {index}", exc_info=1)
+                    segments_by_index[index] = error
+            return segments_by_index
+
+        segments_by_pdf_name: dict[str, list[PdfSegment]] = defaultdict(list)
+        for pdf_segment in predicted_segments:
+            segments_by_pdf_name[pdf_segment.pdf_name].append(pdf_segment)
+        return {
+            index: segments_by_pdf_name[pdf_images.pdf_features.file_name]
+            for index, pdf_images in pdf_images_by_index.items()
+        }
+
+    def _get_segment_boxes(
+        self,
+        pdf_images: PdfImages,
+        pdf_path: Path,
+        predicted_segments: list[PdfSegment],
+        parse_tables_and_math: bool,
+        use_fast_mode: bool,
+    ) -> list[dict]:
+        if parse_tables_and_math:
+            pdf_images_200_dpi = LazyPdfImages(pdf_images.pdf_features, pdf_path, self.pdf_rasterizer_service, dpi=200)
+            self.format_conversion_service.convert_formula_to_latex(pdf_images_200_dpi, predicted_segments)
+            table_pdf_images = pdf_images if use_fast_mode else pdf_images_200_dpi
+            self.format_conversion_service.convert_table_to_html(table_pdf_images, predicted_segments)
+
+        return [
+            SegmentBox.from_pdf_segment(pdf_segment, pdf_images.pdf_features.pages).to_dict()
+            for pdf_segment in predicted_segments
+        ]
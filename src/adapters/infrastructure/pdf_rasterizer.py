@@ -0,0 +1,116 @@
+import hashlib
+import math
+
+import fitz
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+from PIL import Image as PILImage
+from PIL.Image import Image
+from cachetools import LRUCache
+from pdf_features import Rectangle
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from configuration import RASTERIZER_WORKERS, RASTERIZER_CACHE_MB
+from ports.services.pdf_rasterizer_service import PdfRasterizerService
+
+
+def get_image_size(image: Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+def get_file_hash(pdf_path: str | Path) -> str:
+    file_hash = hashlib.sha256()
+    with open(pdf_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class PdfRasterizer(PdfRasterizerService):
+    def __init__(self, workers: int, cache_megabytes: int):
+        self.workers: int = max(1, workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-rasterizer")
+        self.cache: LRUCache = LRUCache(maxsize=max(1, cache_megabytes) * 1024 * 1024, getsizeof=get_image_size)
+        self.cache_lock = Lock()
+
+    def get_document_hash(self, pdf_path: str | Path) -> str:
+        return get_file_hash(pdf_path)
+
+    def get_pages(self, pdf_path: str | Path, dpi: int) -> list[Image]:
+        pages_count = pdfinfo_from_path(pdf_path)["Pages"]
+        return self.get_pages_subset(pdf_path, list(range(1, pages_count + 1)), dpi)
+
+    def get_pages_subset(self, pdf_path: str | Path, pages: list[int], dpi: int, document_hash: str = "") -> list[Image]:
+        document_hash = document_hash if document_hash else get_file_hash(pdf_path)
+        images: dict[int, Image | None] = {page: self._get_cached(document_hash, page, dpi) for page in pages}
+        missing_pages = [page for page, image in images.items() if image is None]
+
+        for page, image in self._render(pdf_path, missing_pages, dpi).items():
+            self._store(document_hash, page, dpi, image)
+            images[page] = image
+
+        return [images[page] for page in pages]
+
+    def get_page(self, pdf_path: str | Path, page: int, dpi: int, document_hash: str = "") -> Image:
+        document_hash = document_hash if document_hash else get_file_hash(pdf_path)
+        image = self._get_cached(document_hash, page, dpi)
+        if image is not None:
+            return image
+
+        image = self._render(pdf_path, [page], dpi)[page]
+        self._store(document_hash, page, dpi, image)
+        return image
+
+    @staticmethod
+    def get_region(pdf_path: str | Path, page: int, region: Rectangle, dpi: int) -> Image:
+        with fitz.open(pdf_path) as document:
+            pdf_page = document[page - 1]
+            clip = fitz.Rect(region.left, region.top, region.right, region.bottom) * pdf_page.derotation_matrix
+            pixmap = pdf_page.get_pixmap(dpi=dpi, clip=clip, alpha=False)
+            return PILImage.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    def _get_cached(self, document_hash: str, page: int, dpi: int) -> Image | None:
+        with self.cache_lock:
+            return self.cache.get((document_hash, page, dpi))
+
+    def _store(self, document_hash: str, page: int, dpi: int, image: Image):
+        with self.cache_lock:
+            try:
+                self.cache[(document_hash, page, dpi)] = image
+            except ValueError:
+                pass
+
+    def _get_page_ranges(self, pages: list[int]) -> list[tuple[int, int]]:
+        if not pages:
+            return []
+
+        pages_per_range = math.ceil(len(pages) / self.workers)
+        page_ranges: list[tuple[int, int]] = []
+        first_page = previous_page = pages[0]
+        for page in pages[1:]:
+            if page != previous_page + 1 or page - first_page >= pages_per_range:
+                page_ranges.append((first_page, previous_page))
+                first_page = page
+            previous_page = page
+        page_ranges.append((first_page, previous_page))
+        return page_ranges
+
+    def _render(self, pdf_path: str | Path, pages: list[int], dpi: int) -> dict[int, Image]:
+        futures = [
+            (
+                first_page,
+                self.executor.submit(convert_from_path, pdf_path, dpi=dpi, first_page=first_page, last_page=last_page),
+            )
+            for first_page, last_page in self._get_page_ranges(pages)
+        ]
+        images_by_page: dict[int, Image] = dict()
+        for first_page, future in futures:
+            for page_offset, image in enumerate(future.result()):
+                images_by_page[first_page + page_offset] = image
+        return images_by_page
+
+
+pdf_rasterizer = PdfRasterizer(RASTERIZER_WORKERS, RASTERIZER_CACHE_MB)
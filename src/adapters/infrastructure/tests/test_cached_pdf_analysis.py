@@ -0,0 +1,46 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from adapters.infrastructure.cached_pdf_analysis_service_adapter import CachedPDFAnalysisServiceAdapter
+
+
+class CountingAnalysisService:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_pdf_layout_fast(self, pdf_content, xml_filename="", parse_tables_and_math=False, keep_pdf=False):
+        self.calls += 1
+        return [{"call": self.calls}]
+
+
+class TestCachedPdfAnalysis(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.models_path = Path(self.temporary_directory.name, "models")
+        self.models_path.mkdir()
+        cache_path = Path(self.temporary_directory.name, "cache")
+        for name, value in [("MODELS_PATH", self.models_path), ("ANALYSIS_CACHE_PATH", cache_path)]:
+            patcher = patch(f"adapters.infrastructure.cached_pdf_analysis_service_adapter.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_reloaded_model_is_a_cache_miss(self):
+        model_path = Path(self.models_path, "token_type_lightgbm.model")
+        model_path.write_text("first model")
+        analysis_service = CountingAnalysisService()
+        cached_analysis_service = CachedPDFAnalysisServiceAdapter(analysis_service, None)
+
+        self.assertEqual([{"call": 1}], cached_analysis_service.analyze_pdf_layout_fast(b"%PDF"))
+        self.assertEqual([{"call": 1}], cached_analysis_service.analyze_pdf_layout_fast(b"%PDF"))
+
+        model_path.write_text("second model")
+        os.utime(model_path, ns=(model_path.stat().st_atime_ns, model_path.stat().st_mtime_ns + 10**9))
+
+        self.assertEqual([{"call": 2}], cached_analysis_service.analyze_pdf_layout_fast(b"%PDF"))
+        self.assertEqual(2, analysis_service.calls)
@@ -0,0 +1,96 @@
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from PIL import Image
+from pdf_features import Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.infrastructure.pdf_analysis_service_adapter import PDFAnalysisServiceAdapter
+from adapters.storage.file_system_repository import FileSystemRepository
+from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
+from ports.services.ml_model_service import MLModelService
+from ports.services.pdf_rasterizer_service import PdfRasterizerService
+
+
+def get_pdf_features(pdf_path: str | Path, pdf_name: str = "", xml_file_name: str = ""):
+    content = Path(pdf_path).read_bytes()
+    if not content.startswith(b"%PDF"):
+        raise ValueError("Not a PDF")
+    pages_count, page_width = [int(value) for value in content.split()[1:]]
+    pages = [
+        SimpleNamespace(page_number=page_number, page_width=page_width, page_height=792, pdf_name="")
+        for page_number in range(1, pages_count + 1)
+    ]
+    return SimpleNamespace(pages=pages, file_name=pdf_name or Path(pdf_path).stem)
+
+
+class BlankPagesRasterizer(PdfRasterizerService):
+    def get_document_hash(self, pdf_path: str | Path) -> str:
+        return str(pdf_path)
+
+    def get_pages(self, pdf_path: str | Path, dpi: int) -> list[Image.Image]:
+        return [Image.new("RGB", (612, 792), "white") for _ in get_pdf_features(pdf_path).pages]
+
+    def get_pages_subset(
+        self, pdf_path: str | Path, pages: list[int], dpi: int, document_hash: str = ""
+    ) -> list[Image.Image]:
+        return [Image.new("RGB", (612, 792), "white") for _ in pages]
+
+    def get_page(self, pdf_path: str | Path, page: int, dpi: int, document_hash: str = "") -> Image.Image:
+        return Image.new("RGB", (612, 792), "white")
+
+    def get_region(self, pdf_path: str | Path, page: int, region: Rectangle, dpi: int) -> Image.Image:
+        return Image.new("RGB", (int(region.width), int(region.height)), "white")
+
+
+class OneSegmentPerPageModel(MLModelService):
+    def __init__(self):
+        self.passes: list[int] = []
+
+    def predict_document_layout(
+        self, pdf_images: list[PdfImages], workspace: RequestWorkspace, resolution: str = ""
+    ) -> list[PdfSegment]:
+        return self.predict_layout_fast(pdf_images, workspace)
+
+    def predict_layout_fast(self, pdf_images: list[PdfImages], workspace: RequestWorkspace) -> list[PdfSegment]:
+        self.passes.append(len(pdf_images))
+        segments = [
+            PdfSegment(page.page_number, Rectangle.from_width_height(10, 10, 100, 20), "text", TokenType.TEXT, page.pdf_name)
+            for document_pdf_images in pdf_images
+            for page in document_pdf_images.pdf_features.pages
+        ]
+        return segments[::-1]
+
+
+@patch.object(PdfImages, "get_pdf_features", staticmethod(get_pdf_features))
+class TestPdfAnalysisBatch(TestCase):
+    def setUp(self):
+        self.model = OneSegmentPerPageModel()
+        self.pdf_analysis_service = PDFAnalysisServiceAdapter(
+            self.model, self.model, None, FileSystemRepository(), BlankPagesRasterizer()
+        )
+
+    def test_segments_are_split_by_document(self):
+        pdf_contents = [b"%PDF 2 600", b"%PDF 3 700", b"%PDF 1 800"]
+
+        results = dict(self.pdf_analysis_service._analyze_batch(10, pdf_contents, False, True, ""))
+
+        self.assertEqual([3], self.model.passes)
+        self.assertEqual([10, 11, 12], sorted(results))
+        for index, (pages_count, page_width) in zip([10, 11, 12], [(2, 600), (3, 700), (1, 800)]):
+            self.assertEqual(list(range(1, pages_count + 1)), sorted(box["page_number"] for box in results[index]))
+            self.assertEqual({page_width}, {box["page_width"] for box in results[index]})
+
+    def test_unreadable_document_does_not_fail_the_batch(self):
+        pdf_contents = [b"%PDF 2 600", b"not a pdf", b"%PDF 1 800"]
+
+        results = dict(self.pdf_analysis_service._analyze_batch(0, pdf_contents, False, False, ""))
+
+        self.assertEqual([2], self.model.passes)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual([600, 600], [box["page_width"] for box in results[0]])
+        self.assertEqual([800], [box["page_width"] for box in results[2]])
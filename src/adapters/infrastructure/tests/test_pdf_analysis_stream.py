@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from pdf_features import Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.infrastructure.pdf_analysis_service_adapter import PDFAnalysisServiceAdapter
+from adapters.infrastructure.tests.test_pdf_analysis_batch import BlankPagesRasterizer, get_pdf_features
+from adapters.storage.file_system_repository import FileSystemRepository
+from domain.LazyPdfImages import LazyPdfImages
+from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+from use_cases.pdf_analysis.analyze_pdf_use_case import AnalyzePDFUseCase
+
+
+class EvenPagesModel:
+    def __init__(self):
+        self.windows: list[list[int]] = []
+
+    def predict_document_layout(self, pdf_images: list[PdfImages], workspace, resolution: str = "") -> list[PdfSegment]:
+        return self.predict_layout_fast(pdf_images, workspace)
+
+    def predict_layout_fast(self, pdf_images: list[PdfImages], workspace) -> list[PdfSegment]:
+        pages = pdf_images[0].pdf_features.pages
+        self.windows.append([page.page_number for page in pages])
+        segments = [
+            PdfSegment(page.page_number, Rectangle.from_width_height(10, top, 100, 20), "text", TokenType.TEXT)
+            for page in pages
+            for top in [10, 40]
+            if page.page_number % 2 == 0
+        ]
+        return segments[::-1]
+
+
+class TablesImagesRecorder:
+    def __init__(self):
+        self.table_pdf_images: list[PdfImages] = []
+
+    def convert_formula_to_latex(self, pdf_images: PdfImages, segments: list[PdfSegment]):
+        pass
+
+    def convert_table_to_html(self, pdf_images: PdfImages, segments: list[PdfSegment]):
+        self.table_pdf_images.append(pdf_images)
+
+
+@patch("adapters.infrastructure.pdf_analysis_service_adapter.STREAM_PAGE_WINDOW", 2)
+@patch.object(PdfImages, "get_pdf_features", staticmethod(get_pdf_features))
+class TestPdfAnalysisStream(TestCase):
+    def setUp(self):
+        self.model = EvenPagesModel()
+        self.format_conversion_service = TablesImagesRecorder()
+        pdf_analysis_service = PDFAnalysisServiceAdapter(
+            self.model, self.model, self.format_conversion_service, FileSystemRepository(), BlankPagesRasterizer()
+        )
+        self.analyze_pdf_use_case = AnalyzePDFUseCase(pdf_analysis_service, None)
+
+    def test_segments_are_grouped_by_page(self):
+        pages = list(self.analyze_pdf_use_case.execute_stream(b"%PDF 5 600", False, True))
+
+        self.assertEqual([[1, 2], [3, 4], [5]], self.model.windows)
+        self.assertEqual([2, 4], [page_number for page_number, _ in pages])
+        for page_number, segment_boxes in pages:
+            self.assertEqual([page_number, page_number], [box["page_number"] for box in segment_boxes])
+            self.assertEqual([40, 10], [box["top"] for box in segment_boxes])
+
+    def test_fast_mode_tables_are_cropped_from_the_72_dpi_pages(self):
+        list(self.analyze_pdf_use_case.execute_stream(b"%PDF 3 600", True, True))
+        list(self.analyze_pdf_use_case.execute_stream(b"%PDF 3 600", True, False))
+
+        fast_pdf_images, pdf_images = (
+            self.format_conversion_service.table_pdf_images[0],
+            self.format_conversion_service.table_pdf_images[-1],
+        )
+        self.assertNotIsInstance(fast_pdf_images, LazyPdfImages)
+        self.assertEqual((72, 3), (fast_pdf_images.dpi, len(fast_pdf_images.pdf_images)))
+        self.assertEqual((90, 18), fast_pdf_images.get_region_image(3, Rectangle(10, 10, 100, 28)).size)
+        self.assertEqual(200, pdf_images.dpi)
@@ -1,3 +1,4 @@
+from domain.PageSpatialIndex import PageSpatialIndex
 from domain.PdfSegment import PdfSegment
 from pdf_features import PdfFeatures
 from pdf_features import PdfToken
@@ -10,10 +11,13 @@ class PdfSegmentation:
         self.tokens_by_segments: dict[PdfSegment, list[PdfToken]] = self.find_tokens_by_segments()
 
     @staticmethod
-    def find_segment_for_token(token: PdfToken, segments: list[PdfSegment], tokens_by_segments):
+    def find_segment_for_token(
+        token: PdfToken, segments: list[PdfSegment], tokens_by_segments, segments_index: PageSpatialIndex
+    ):
         best_score: float = 0
         most_probable_segment: PdfSegment | None = None
-        for segment in segments:
+        for segment_index in segments_index.query(token.bounding_box):
+            segment = segments[segment_index]
             intersection_percentage = token.bounding_box.get_intersection_percentage(segment.bounding_box)
             if intersection_percentage > best_score:
                 best_score = intersection_percentage
@@ -27,6 +31,7 @@ class PdfSegmentation:
         tokens_by_segments: dict[PdfSegment, list[PdfToken]] = {}
         for page in self.pdf_features.pages:
             page_segments = [segment for segment in self.pdf_segments if segment.page_number == page.page_number]
+            segments_index = PageSpatialIndex([segment.bounding_box for segment in page_segments])
             for token in page.tokens:
-                self.find_segment_for_token(token, page_segments, tokens_by_segments)
+                self.find_segment_for_token(token, page_segments, tokens_by_segments, segments_index)
         return tokens_by_segments
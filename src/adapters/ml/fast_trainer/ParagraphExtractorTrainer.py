@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import numpy as np
+
 from adapters.ml.fast_trainer.Paragraph import Paragraph
 from domain.PdfSegment import PdfSegment
 from pdf_features import PdfToken
@@ -9,23 +11,13 @@ from adapters.ml.pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTraine
 
 
 class ParagraphExtractorTrainer(TokenTypeTrainer):
-    def get_context_features(self, token_features: TokenFeatures, page_tokens: list[PdfToken], token_index: int):
-        token_row_features = list()
-        first_token_from_context = token_index - self.model_configuration.context_size
-        for i in range(self.model_configuration.context_size * 2):
-            first_token = page_tokens[first_token_from_context + i]
-            second_token = page_tokens[first_token_from_context + i + 1]
-            features = token_features.get_features(first_token, second_token, page_tokens)
-            features += self.get_paragraph_extraction_features(first_token, second_token)
-            token_row_features.extend(features)
-
-        return token_row_features
-
-    @staticmethod
-    def get_paragraph_extraction_features(first_token: PdfToken, second_token: PdfToken) -> list[int]:
-        one_hot_token_type_1 = [1 if token_type == first_token.token_type else 0 for token_type in TokenType]
-        one_hot_token_type_2 = [1 if token_type == second_token.token_type else 0 for token_type in TokenType]
-        return one_hot_token_type_1 + one_hot_token_type_2
+    def get_pairs_features(self, token_features: TokenFeatures, page_tokens: list[PdfToken]) -> np.ndarray:
+        token_types_one_hot = np.array(
+            [[1 if token_type == token.token_type else 0 for token_type in TokenType] for token in page_tokens]
+        )
+        return np.column_stack(
+            [super().get_pairs_features(token_features, page_tokens), token_types_one_hot[:-1], token_types_one_hot[1:]]
+        ).astype(np.float64)
 
     def loop_token_next_token(self):
         for pdf_features in self.pdfs_features:
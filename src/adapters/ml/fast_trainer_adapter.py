@@ -1,31 +1,37 @@
 from os.path import join
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
 from ports.services.ml_model_service import MLModelService
 from adapters.ml.fast_trainer.ParagraphExtractorTrainer import ParagraphExtractorTrainer
 from adapters.ml.fast_trainer.model_configuration import MODEL_CONFIGURATION as PARAGRAPH_EXTRACTION_CONFIGURATION
 from adapters.ml.pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTrainer
 from adapters.ml.pdf_tokens_type_trainer.ModelConfiguration import ModelConfiguration
+from adapters.ml.pdf_tokens_type_trainer.BoosterRegistry import booster_registry
 from configuration import ROOT_PATH, service_logger
 
+TOKEN_TYPE_MODEL_PATH = join(ROOT_PATH, "models", "token_type_lightgbm.model")
+PARAGRAPH_EXTRACTION_MODEL_PATH = join(ROOT_PATH, "models", "paragraph_extraction_lightgbm.model")
+
 
 class FastTrainerAdapter(MLModelService):
-    def predict_document_layout(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
-        return self.predict_layout_fast(pdf_images)
+    def load(self):
+        booster_registry.preload([TOKEN_TYPE_MODEL_PATH, PARAGRAPH_EXTRACTION_MODEL_PATH])
+
+    def predict_document_layout(
+        self, pdf_images: list[PdfImages], workspace: RequestWorkspace, resolution: str = ""
+    ) -> list[PdfSegment]:
+        return self.predict_layout_fast(pdf_images, workspace)
 
-    def predict_layout_fast(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
+    def predict_layout_fast(self, pdf_images: list[PdfImages], workspace: RequestWorkspace) -> list[PdfSegment]:
         service_logger.info("Creating Paragraph Tokens [fast]")
 
-        pdf_images_obj = pdf_images[0]
+        pdfs_features = [pdf_images_obj.pdf_features for pdf_images_obj in pdf_images]
 
-        token_type_trainer = TokenTypeTrainer([pdf_images_obj.pdf_features], ModelConfiguration())
-        token_type_trainer.set_token_types(join(ROOT_PATH, "models", "token_type_lightgbm.model"))
+        token_type_trainer = TokenTypeTrainer(pdfs_features, ModelConfiguration())
+        token_type_trainer.set_token_types(TOKEN_TYPE_MODEL_PATH)
 
         trainer = ParagraphExtractorTrainer(
-            pdfs_features=[pdf_images_obj.pdf_features], model_configuration=PARAGRAPH_EXTRACTION_CONFIGURATION
+            pdfs_features=pdfs_features, model_configuration=PARAGRAPH_EXTRACTION_CONFIGURATION
         )
-        segments = trainer.get_pdf_segments(join(ROOT_PATH, "models", "paragraph_extraction_lightgbm.model"))
-
-        pdf_images_obj.remove_images()
-
-        return segments
+        return trainer.get_pdf_segments(PARAGRAPH_EXTRACTION_MODEL_PATH)
@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+from threading import Lock
+
+import lightgbm as lgb
+
+
+class BoosterRegistry:
+    def __init__(self):
+        self.boosters: dict[str, tuple[int, lgb.Booster]] = dict()
+        self.lock = Lock()
+
+    def get_booster(self, model_path: str | Path) -> lgb.Booster:
+        model_path = str(Path(model_path).absolute())
+        modification_time = os.stat(model_path).st_mtime_ns
+
+        loaded_booster = self.boosters.get(model_path)
+        if loaded_booster and loaded_booster[0] == modification_time:
+            return loaded_booster[1]
+
+        with self.lock:
+            loaded_booster = self.boosters.get(model_path)
+            if loaded_booster and loaded_booster[0] == modification_time:
+                return loaded_booster[1]
+
+            booster = lgb.Booster(model_file=model_path)
+            self.boosters[model_path] = (modification_time, booster)
+            return booster
+
+    def preload(self, model_paths: list[str | Path]):
+        for model_path in model_paths:
+            if Path(model_path).exists():
+                self.get_booster(model_path)
+
+
+booster_registry = BoosterRegistry()
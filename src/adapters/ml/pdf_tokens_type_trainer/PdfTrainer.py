@@ -10,6 +10,7 @@ from pdf_features import PdfFont
 from pdf_features import PdfToken
 from pdf_features import Rectangle
 from pdf_token_type_labels import TokenType
+from adapters.ml.pdf_tokens_type_trainer.BoosterRegistry import booster_registry
 from adapters.ml.pdf_tokens_type_trainer.ModelConfiguration import ModelConfiguration
 from adapters.ml.pdf_tokens_type_trainer.download_models import pdf_tokens_type_model
 
@@ -80,7 +81,7 @@ class PdfTrainer:
         if not x.any():
             return self.pdfs_features
 
-        lightgbm_model = lgb.Booster(model_file=model_path)
+        lightgbm_model = booster_registry.get_booster(model_path)
         return lightgbm_model.predict(x)
 
     def save_training_data(self, save_folder_path: str | Path, labels: list[int]):
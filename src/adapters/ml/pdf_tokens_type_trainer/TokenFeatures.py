@@ -1,11 +1,28 @@
 import string
 import unicodedata
 
+import numpy as np
 from pdf_features import PdfFeatures
 from pdf_features import PdfToken
 from adapters.ml.pdf_tokens_type_trainer.config import CHARACTER_TYPE
 
 
+def get_ranges_maximums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    sparse_table = [values]
+    while 2 ** len(sparse_table) <= len(values):
+        step = 2 ** (len(sparse_table) - 1)
+        sparse_table.append(np.maximum(sparse_table[-1][:-step], sparse_table[-1][step:]))
+
+    levels = np.floor(np.log2(ends - starts)).astype(int)
+    maximums = np.zeros(len(starts))
+    for level in np.unique(levels):
+        level_mask = levels == level
+        level_maximums = sparse_table[level]
+        maximums[level_mask] = np.maximum(level_maximums[starts[level_mask]], level_maximums[ends[level_mask] - 2**level])
+
+    return maximums
+
+
 class TokenFeatures:
     def __init__(self, pdfs_features: PdfFeatures):
         self.pdfs_features = pdfs_features
@@ -29,6 +46,126 @@ class TokenFeatures:
             + self.get_unicode_categories(token_2)
         )
 
+    def get_pairs_features(self, page_tokens: list[PdfToken]) -> np.ndarray:
+        font_ids = dict()
+        font_codes = np.array([font_ids.setdefault(token.font.font_id, len(font_ids)) for token in page_tokens])
+        lengths = np.array([len(token.content) for token in page_tokens], dtype=np.float64)
+        spaces = np.array([token.content.count(" ") for token in page_tokens], dtype=np.float64)
+        punctuation = np.array(
+            [sum(character in string.punctuation for character in token.content) for token in page_tokens], dtype=np.float64
+        )
+        unicode_categories = np.array([self.get_unicode_categories(token) for token in page_tokens], dtype=np.float64)
+
+        pairs_count = len(page_tokens) - 1
+        font_size_mode = np.full(pairs_count, self.pdfs_features.pdf_modes.font_size_mode / 100)
+        return np.column_stack(
+            [
+                font_codes[:-1] == font_codes[1:],
+                font_size_mode,
+                lengths[:-1],
+                lengths[1:],
+                spaces[:-1],
+                spaces[1:],
+                punctuation[:-1],
+                punctuation[1:],
+                self.get_pairs_position_features(page_tokens),
+                unicode_categories[:-1],
+                unicode_categories[1:],
+            ]
+        ).astype(np.float64)
+
+    def get_pairs_position_features(self, page_tokens: list[PdfToken]) -> np.ndarray:
+        left = np.array([token.bounding_box.left for token in page_tokens], dtype=np.float64)
+        top = np.array([token.bounding_box.top for token in page_tokens], dtype=np.float64)
+        right = np.array([token.bounding_box.right for token in page_tokens], dtype=np.float64)
+        bottom = np.array([token.bounding_box.bottom for token in page_tokens], dtype=np.float64)
+        width = np.array([token.bounding_box.width for token in page_tokens], dtype=np.float64)
+        height = np.array([token.bounding_box.height for token in page_tokens], dtype=np.float64)
+        contexts = [token.pdf_token_context for token in page_tokens]
+        left_of_token_on_the_right = np.array([context.left_of_token_on_the_right for context in contexts], dtype=np.float64)
+        right_of_token_on_the_left = np.array([context.right_of_token_on_the_left for context in contexts], dtype=np.float64)
+        right_of_token_on_the_right = np.array(
+            [context.right_of_token_on_the_right for context in contexts], dtype=np.float64
+        )
+        left_of_token_on_the_left = np.array([context.left_of_token_on_the_left for context in contexts], dtype=np.float64)
+
+        left_1, left_2 = left[:-1], left[1:]
+        top_1, top_2 = top[:-1], top[1:]
+        right_1, right_2 = right[:-1], right[1:]
+        width_1, width_2 = width[:-1], width[1:]
+        height_1, height_2 = height[:-1], height[1:]
+
+        right_gap_1 = left_of_token_on_the_right[:-1] - right_1
+        left_gap_2 = left_2 - right_of_token_on_the_left[1:]
+
+        absolute_right = np.where(right >= right_of_token_on_the_right, right, right_of_token_on_the_right)
+        absolute_left = np.where(left <= left_of_token_on_the_left, left, left_of_token_on_the_left)
+        absolute_right_1, absolute_right_2 = absolute_right[:-1], absolute_right[1:]
+        absolute_left_1, absolute_left_2 = absolute_left[:-1], absolute_left[1:]
+
+        right_distance, left_distance, height_difference = left_2 - left_1 - width_1, left_1 - left_2, height_1 - height_2
+
+        top_distance = top_2 - top_1 - height_1
+        top_distance_gaps = self.get_pairs_top_distance_gaps(top, bottom, height)
+
+        start_lines_differences = absolute_left_1 - absolute_left_2
+        end_lines_difference = np.abs(absolute_right_1 - absolute_right_2)
+
+        lines_space_mode = self.pdfs_features.pdf_modes.lines_space_mode
+        right_space_mode = self.pdfs_features.pdf_modes.right_space_mode
+
+        return np.column_stack(
+            [
+                absolute_right_1,
+                top_1,
+                right_1,
+                width_1,
+                height_1,
+                top_2,
+                right_2,
+                width_2,
+                height_2,
+                right_distance,
+                left_distance,
+                right_gap_1,
+                left_gap_2,
+                height_difference,
+                top_distance,
+                top_distance - lines_space_mode,
+                top_distance_gaps,
+                top_distance - height_1,
+                end_lines_difference,
+                start_lines_differences,
+                lines_space_mode - top_distance_gaps,
+                right_space_mode - absolute_right_1,
+            ]
+        )
+
+    @staticmethod
+    def get_pairs_top_distance_gaps(top: np.ndarray, bottom: np.ndarray, height: np.ndarray) -> np.ndarray:
+        top_distance = top[1:] - top[:-1] - height[:-1]
+
+        order = np.argsort(top, kind="stable")
+        sorted_tops = top[order]
+        middle_starts = np.searchsorted(sorted_tops, bottom[:-1], side="left")
+        middle_ends = np.searchsorted(sorted_tops, top[1:], side="left")
+        has_tokens_in_the_middle = middle_starts < middle_ends
+
+        gap_middle_bottom = np.zeros(len(top_distance))
+        gap_middle_top = np.zeros(len(top_distance))
+
+        if has_tokens_in_the_middle.any():
+            starts = middle_starts[has_tokens_in_the_middle]
+            ends = middle_ends[has_tokens_in_the_middle]
+            tokens_in_the_middle_top = sorted_tops[starts]
+            tokens_in_the_middle_bottom = get_ranges_maximums(bottom[order], starts, ends)
+            gap_middle_top[has_tokens_in_the_middle] = (
+                tokens_in_the_middle_top - top[:-1][has_tokens_in_the_middle] - height[:-1][has_tokens_in_the_middle]
+            )
+            gap_middle_bottom[has_tokens_in_the_middle] = top[1:][has_tokens_in_the_middle] - tokens_in_the_middle_bottom
+
+        return top_distance - (gap_middle_bottom - gap_middle_top)
+
     def get_position_features(self, token_1: PdfToken, token_2: PdfToken, page_tokens):
         left_1 = token_1.bounding_box.left
         right_1 = token_1.bounding_box.right
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from tqdm import tqdm
 
 from pdf_features import PdfToken
@@ -11,7 +12,7 @@ from adapters.ml.pdf_tokens_type_trainer.TokenFeatures import TokenFeatures
 
 class TokenTypeTrainer(PdfTrainer):
     def get_model_input(self) -> np.ndarray:
-        features_rows = []
+        pages_features_rows = []
 
         contex_size = self.model_configuration.context_size
         for token_features, page in self.loop_token_features():
@@ -23,11 +24,13 @@ class TokenTypeTrainer(PdfTrainer):
                 self.get_padding_token(segment_number=999999 + i, page_number=page.page_number) for i in range(contex_size)
             ]
 
-            tokens_indexes = range(contex_size, len(page_tokens) - contex_size)
-            page_features = [self.get_context_features(token_features, page_tokens, i) for i in tokens_indexes]
-            features_rows.extend(page_features)
+            pairs_features = self.get_pairs_features(token_features, page_tokens)
+            pages_features_rows.append(self.get_context_features_rows(pairs_features))
 
-        return self.features_rows_to_x(features_rows)
+        if not pages_features_rows:
+            return np.zeros((0, 0))
+
+        return np.concatenate(pages_features_rows)
 
     def loop_token_features(self):
         for pdf_features in tqdm(self.pdfs_features):
@@ -39,15 +42,13 @@ class TokenTypeTrainer(PdfTrainer):
 
                 yield token_features, page
 
-    def get_context_features(self, token_features: TokenFeatures, page_tokens: list[PdfToken], token_index: int):
-        token_row_features = []
-        first_token_from_context = token_index - self.model_configuration.context_size
-        for i in range(self.model_configuration.context_size * 2):
-            first_token = page_tokens[first_token_from_context + i]
-            second_token = page_tokens[first_token_from_context + i + 1]
-            token_row_features.extend(token_features.get_features(first_token, second_token, page_tokens))
+    def get_pairs_features(self, token_features: TokenFeatures, page_tokens: list[PdfToken]) -> np.ndarray:
+        return token_features.get_pairs_features(page_tokens)
 
-        return token_row_features
+    def get_context_features_rows(self, pairs_features: np.ndarray) -> np.ndarray:
+        context_pairs_count = self.model_configuration.context_size * 2
+        context_windows = sliding_window_view(pairs_features, context_pairs_count, axis=0)
+        return context_windows.transpose(0, 2, 1).reshape(len(context_windows), -1)
 
     def predict(self, model_path: str | Path = None):
         predictions = super().predict(model_path)
@@ -1,7 +1,9 @@
 from os.path import join, exists
 from unittest import TestCase
 
+import numpy as np
 from pdf_token_type_labels import TokenType
+from adapters.ml.pdf_tokens_type_trainer.TokenFeatures import TokenFeatures
 from adapters.ml.pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTrainer
 
 from pdf_features import PdfFeatures
@@ -32,3 +34,23 @@ class TestTrainer(TestCase):
         self.assertEqual("Document Big Centered Title", tokens[0].content)
         self.assertEqual(TokenType.TEXT, tokens[1].token_type)
         self.assertEqual("List Title", tokens[10].content)
+
+    def test_model_input_matches_token_pair_features(self):
+        pdf_features = PdfFeatures.from_pdf_path(join(ROOT_PATH, "test_pdfs", "test.pdf"))
+        trainer = TokenTypeTrainer([pdf_features])
+        token_features = TokenFeatures(pdf_features)
+        context_size = trainer.model_configuration.context_size
+
+        expected_rows = []
+        for page in pdf_features.pages:
+            page_tokens = [trainer.get_padding_token(i - 999999, page.page_number) for i in range(context_size)]
+            page_tokens += page.tokens
+            page_tokens += [trainer.get_padding_token(999999 + i, page.page_number) for i in range(context_size)]
+            for token_index in range(context_size, len(page_tokens) - context_size):
+                row = []
+                for first_token_index in range(token_index - context_size, token_index + context_size):
+                    first_token, second_token = page_tokens[first_token_index], page_tokens[first_token_index + 1]
+                    row.extend(token_features.get_features(first_token, second_token, page_tokens))
+                expected_rows.append(row)
+
+        self.assertTrue(np.array_equal(trainer.features_rows_to_x(expected_rows), trainer.get_model_input()))
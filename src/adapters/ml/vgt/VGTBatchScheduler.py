@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread
+
+import torch
+from detectron2.structures import Instances
+
+from adapters.ml.vgt.cpu_inference import get_inference_context
+from configuration import service_logger
+
+
+class VGTBatchScheduler:
+    def __init__(self, model, max_batch_size: int, max_wait_ms: int, bfloat16_autocast: bool = False):
+        self.model = model
+        self.bfloat16_autocast: bool = bfloat16_autocast
+        self.max_batch_size: int = max(1, max_batch_size)
+        self.max_wait_seconds: float = max(0, max_wait_ms) / 1000
+        self.pending_pages: Queue[tuple[dict, Future]] = Queue()
+        self.worker = Thread(target=self._run, name="vgt-batch-scheduler", daemon=True)
+        self.worker.start()
+
+    def submit(self, page_input: dict) -> Future:
+        future: Future = Future()
+        self.pending_pages.put((page_input, future))
+        return future
+
+    def predict(self, page_inputs: list[dict]) -> list[Instances]:
+        futures = [self.submit(page_input) for page_input in page_inputs]
+        return [future.result() for future in futures]
+
+    def _collect_batch(self, batch: list[tuple[dict, Future]]):
+        batch.append(self.pending_pages.get())
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining_seconds = deadline - time.monotonic()
+            try:
+                batch.append(self.pending_pages.get(timeout=max(0.0, remaining_seconds)))
+            except Empty:
+                break
+
+    @staticmethod
+    def _group_by_image_shape(batch: list[tuple[dict, Future]]) -> list[list[tuple[dict, Future]]]:
+        batches_by_shape: dict[tuple, list[tuple[dict, Future]]] = dict()
+        for page_input, future in batch:
+            batches_by_shape.setdefault(tuple(page_input["image"].shape), list()).append((page_input, future))
+        return list(batches_by_shape.values())
+
+    @staticmethod
+    def _set_exception(batch: list[tuple[dict, Future]], exception: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exception)
+
+    def _predict_batch(self, batch: list[tuple[dict, Future]]):
+        with torch.no_grad(), get_inference_context(self.bfloat16_autocast):
+            outputs = self.model.inference([page_input for page_input, _ in batch])
+
+        if len(outputs) != len(batch):
+            raise RuntimeError(f"VGT returned {len(outputs)} predictions for {len(batch)} pages")
+
+        for (_, future), output in zip(batch, outputs):
+            future.set_result(output["instances"].to("cpu"))
+
+    def _run(self):
+        while True:
+            batch: list[tuple[dict, Future]] = list()
+            try:
+                self._collect_batch(batch)
+                for same_shape_batch in self._group_by_image_shape(batch):
+                    try:
+                        self._predict_batch(same_shape_batch)
+                    except Exception as exception:
+                        service_logger.error(f"VGT batch of {len(same_shape_batch)} pages failed: {exception}")
+                        self._set_exception(same_shape_batch, exception)
+            except Exception as exception:
+                service_logger.error("VGT batch scheduler failed", exc_info=1)
+                self._set_exception(batch, exception)
@@ -0,0 +1,56 @@
+from contextlib import nullcontext
+
+import torch
+from torch import nn
+
+from adapters.ml.vgt.ditod.VGTbeit import Attention, Mlp
+from configuration import service_logger
+
+QUANTIZABLE_LINEAR_LAYERS_BY_MODULE_TYPE: dict[type, tuple[str, ...]] = {Attention: ("proj",), Mlp: ("fc1", "fc2")}
+BOX_HEAD_MODULE_NAME = "roi_heads.box_head"
+
+
+def get_quantizable_linear_layers_names(model: nn.Module) -> list[str]:
+    layers_names = []
+    for module_name, module in model.named_modules():
+        for module_type, linear_layers_names in QUANTIZABLE_LINEAR_LAYERS_BY_MODULE_TYPE.items():
+            if isinstance(module, module_type):
+                layers_names.extend(f"{module_name}.{layer_name}" for layer_name in linear_layers_names)
+        if isinstance(module, nn.Linear) and module_name.startswith(BOX_HEAD_MODULE_NAME):
+            layers_names.append(module_name)
+    return layers_names
+
+
+def cast_inputs_to_float(module: nn.Module, inputs: tuple):
+    return tuple(module_input.float() for module_input in inputs)
+
+
+def quantize_linear_layers(model: nn.Module) -> nn.Module:
+    layers_names = get_quantizable_linear_layers_names(model)
+    qconfig_spec = {layer_name: torch.ao.quantization.default_dynamic_qconfig for layer_name in layers_names}
+    torch.ao.quantization.quantize_dynamic(model, qconfig_spec, dtype=torch.qint8, inplace=True)
+
+    for layer_name in layers_names:
+        model.get_submodule(layer_name).register_forward_pre_hook(cast_inputs_to_float)
+
+    service_logger.info(f"VGT model: {len(layers_names)} linear layers quantized to INT8")
+    return model
+
+
+def get_inference_context(bfloat16_autocast: bool):
+    if not bfloat16_autocast:
+        return nullcontext()
+    return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+
+
+def optimize_for_cpu(model: nn.Module, device: str, quantize_int8: bool, bfloat16_autocast: bool):
+    if device != "cpu":
+        if quantize_int8 or bfloat16_autocast:
+            service_logger.info("VGT CPU inference optimizations are ignored when running on GPU")
+        return
+
+    if quantize_int8:
+        quantize_linear_layers(model)
+
+    if bfloat16_autocast:
+        service_logger.info("VGT model: running under bfloat16 autocast")
@@ -1,21 +1,22 @@
 import pickle
-import shutil
+from threading import Lock
 
 import numpy as np
 from os import makedirs
 from os.path import join, exists
+from cachetools import LRUCache
 from pdf_features import PdfToken
 from pdf_features import Rectangle
 from pdf_features import PdfFeatures
 
+from adapters.infrastructure.lazy_loader import LazyLoader
 from adapters.ml.vgt.bros.tokenization_bros import BrosTokenizer
-from configuration import WORD_GRIDS_PATH
+from configuration import WORD_PIECES_CACHE_SIZE
+from domain.RequestWorkspace import RequestWorkspace
 
-tokenizer = BrosTokenizer.from_pretrained("naver-clova-ocr/bros-base-uncased")
-
-
-def rectangle_to_bbox(rectangle: Rectangle):
-    return [rectangle.left, rectangle.top, rectangle.width, rectangle.height]
+tokenizer_loader = LazyLoader("BROS tokenizer", lambda: BrosTokenizer.from_pretrained("naver-clova-ocr/bros-base-uncased"))
+word_pieces_cache: LRUCache = LRUCache(maxsize=WORD_PIECES_CACHE_SIZE)
+word_pieces_lock = Lock()
 
 
 def get_words_positions(text: str, rectangle: Rectangle):
@@ -23,54 +24,95 @@ def get_words_positions(text: str, rectangle: Rectangle):
     text_len = len(text)
 
     width_per_letter = rectangle.width / text_len
-
-    words_bboxes = [Rectangle.from_coordinates(rectangle.left, rectangle.top, rectangle.left + 5, rectangle.bottom)]
-    words_bboxes[-1].width = 0
-    words_bboxes[-1].right = words_bboxes[-1].left
-
-    for letter in text:
-        if letter == " ":
-            left = words_bboxes[-1].right + width_per_letter
-            words_bboxes.append(Rectangle.from_coordinates(left, words_bboxes[-1].top, left + 5, words_bboxes[-1].bottom))
-            words_bboxes[-1].width = 0
-            words_bboxes[-1].right = words_bboxes[-1].left
-        else:
-            words_bboxes[-1].right = words_bboxes[-1].right + width_per_letter
-            words_bboxes[-1].width = words_bboxes[-1].width + width_per_letter
+    letters_widths = np.full(text_len, width_per_letter)
+    positions = np.cumsum(np.concatenate(([rectangle.left], letters_widths)))
+    accumulated_widths = np.concatenate(([0], np.cumsum(letters_widths)))
+
+    after_spaces = np.array([index + 1 for index, letter in enumerate(text) if letter == " "], dtype=int)
+    starts = np.concatenate(([0], after_spaces))
+    ends = np.concatenate((after_spaces - 1, [text_len]))
+
+    words_bboxes = np.column_stack(
+        [
+            positions[starts],
+            np.full(len(starts), rectangle.top),
+            accumulated_widths[ends - starts],
+            np.full(len(starts), rectangle.bottom - rectangle.top),
+        ]
+    )
 
     words = text.split()
     return words, words_bboxes
 
 
-def get_subwords_positions(word: str, rectangle: Rectangle):
-    width_per_letter = rectangle.width / len(word)
-    word_tokens = [x.replace("#", "") for x in tokenizer.tokenize(word)]
+def tokenize_words(words: list[str]):
+    with word_pieces_lock:
+        missing_words = [word for word in dict.fromkeys(words) if word not in word_pieces_cache]
+
+    if not missing_words:
+        return
+
+    tokenizer = tokenizer_loader.get()
+    if tokenizer.is_fast:
+        encodings = tokenizer(missing_words, add_special_tokens=False)
+        words_pieces = [encodings.tokens(word_index) for word_index in range(len(missing_words))]
+    else:
+        words_pieces = [tokenizer.tokenize(word) for word in missing_words]
+
+    words_pieces = [[piece.replace("#", "") for piece in word_pieces] for word_pieces in words_pieces]
+    pieces = [piece for word_pieces in words_pieces for piece in word_pieces]
+    pieces_ids = [x[-2] for x in tokenizer(pieces)["input_ids"]] if pieces else []
+
+    with word_pieces_lock:
+        piece_index = 0
+        for word, word_pieces in zip(missing_words, words_pieces):
+            ids = pieces_ids[piece_index : piece_index + len(word_pieces)]
+            word_pieces_cache[word] = (ids, [len(piece) for piece in word_pieces])
+            piece_index += len(word_pieces)
 
-    if not word_tokens:
-        return [], []
 
-    ids = [x[-2] for x in tokenizer(word_tokens)["input_ids"]]
+def get_word_pieces(word: str) -> tuple[list[int], list[int]]:
+    with word_pieces_lock:
+        word_pieces = word_pieces_cache.get(word)
 
-    right = rectangle.left + len(word_tokens[0]) * width_per_letter
-    bboxes = [Rectangle.from_coordinates(rectangle.left, rectangle.top, right, rectangle.bottom)]
+    if word_pieces is None:
+        tokenize_words([word])
+        with word_pieces_lock:
+            word_pieces = word_pieces_cache[word]
 
-    for subword in word_tokens[1:]:
-        right = bboxes[-1].right + len(subword) * width_per_letter
-        bboxes.append(Rectangle.from_coordinates(bboxes[-1].right, rectangle.top, right, rectangle.bottom))
+    return word_pieces
 
-    return ids, bboxes
+
+def get_subwords_positions(word: str, word_bbox: np.ndarray):
+    ids, pieces_lengths = get_word_pieces(word)
+
+    if not ids:
+        return [], []
+
+    left, top, width, height = word_bbox.tolist()
+    width_per_letter = width / len(word)
+
+    pieces_widths = np.array(pieces_lengths) * width_per_letter
+    pieces_widths[0] = left + pieces_widths[0]
+    rights = np.cumsum(pieces_widths)
+    lefts = np.concatenate(([left], rights[:-1]))
+
+    bboxes = np.column_stack([lefts, np.full(len(ids), top), rights - lefts, np.full(len(ids), height)])
+    return list(ids), bboxes.tolist()
 
 
 def get_grid_words_dict(tokens: list[PdfToken]):
+    tokens_words_positions = [get_words_positions(token.content, token.bounding_box) for token in tokens]
+    tokenize_words([word for words, _ in tokens_words_positions for word in words])
+
     texts, bbox_texts_list, inputs_ids, bbox_subword_list = [], [], [], []
-    for token in tokens:
-        words, words_bboxes = get_words_positions(token.content, token.bounding_box)
+    for words, words_bboxes in tokens_words_positions:
         texts += words
-        bbox_texts_list += [rectangle_to_bbox(r) for r in words_bboxes]
-        for word, word_box in zip(words, words_bboxes):
-            ids, subwords_bboxes = get_subwords_positions(word, word_box)
+        bbox_texts_list += words_bboxes.tolist()
+        for word, word_bbox in zip(words, words_bboxes):
+            ids, subwords_bboxes = get_subwords_positions(word, word_bbox)
             inputs_ids += ids
-            bbox_subword_list += [rectangle_to_bbox(r) for r in subwords_bboxes]
+            bbox_subword_list += subwords_bboxes
 
     return {
         "input_ids": np.array(inputs_ids),
@@ -80,18 +122,14 @@ def get_grid_words_dict(tokens: list[PdfToken]):
     }
 
 
-def create_word_grid(pdf_features_list: list[PdfFeatures]):
-    makedirs(WORD_GRIDS_PATH, exist_ok=True)
+def create_word_grid(pdf_features_list: list[PdfFeatures], workspace: RequestWorkspace):
+    makedirs(workspace.word_grids_path, exist_ok=True)
 
     for pdf_features in pdf_features_list:
         for page in pdf_features.pages:
             image_id = f"{pdf_features.file_name}_{page.page_number - 1}"
-            if exists(join(WORD_GRIDS_PATH, image_id + ".pkl")):
+            if exists(join(workspace.word_grids_path, image_id + ".pkl")):
                 continue
             grid_words_dict = get_grid_words_dict(page.tokens)
-            with open(join(WORD_GRIDS_PATH, f"{image_id}.pkl"), mode="wb") as file:
+            with open(join(workspace.word_grids_path, f"{image_id}.pkl"), mode="wb") as file:
                 pickle.dump(grid_words_dict, file)
-
-
-def remove_word_grids():
-    shutil.rmtree(WORD_GRIDS_PATH, ignore_errors=True)
@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 from torch import nn
 
@@ -13,6 +14,63 @@ def _init_weights(m):
         nn.init.constant_(m.weight, 1.0)
 
 
+def get_slice_bounds(starts: np.ndarray, ends: np.ndarray, size: int):
+    starts = np.clip(np.where(starts < 0, starts + size, starts), 0, size)
+    ends = np.clip(np.where(ends < 0, ends + size, ends), 0, size)
+    return starts, np.maximum(ends, starts)
+
+
+def paint_chargrid(
+    batched_inputs, batch_b: int, height: int, width: int, stride: int = 1, use_UNK_text: bool = False, device="cpu"
+):
+    """Paint every subword id over its box in a [B x H x W] map, later subwords overwriting earlier ones.
+
+    Each pixel takes the id of the last box covering it, found with a scatter max over the flattened
+    pixel indices of all the boxes in the batch.
+    """
+    boxes_list, ids_list, images_indexes = [], [], []
+    for iter_b in range(batch_b):
+        per_input_ids = batched_inputs[iter_b]["input_ids"]
+        per_input_bbox = batched_inputs[iter_b]["bbox"]
+        short_length_w = min(len(per_input_ids), len(per_input_bbox))
+        if short_length_w == 0:
+            continue
+        boxes_list.append(np.asarray(per_input_bbox[:short_length_w]).reshape(-1, 4))
+        ids_list.append(np.full(short_length_w, 100) if use_UNK_text else np.asarray(per_input_ids[:short_length_w]))
+        images_indexes.append(np.full(short_length_w, iter_b))
+
+    chargrid_map = torch.zeros(batch_b * height * width, dtype=torch.int64, device=device)
+    if not boxes_list:
+        return chargrid_map.view(batch_b, height, width)
+
+    boxes = np.round(np.concatenate(boxes_list) / stride).astype(int)
+    w_starts, w_ends = get_slice_bounds(boxes[:, 0], boxes[:, 2], width)
+    h_starts, h_ends = get_slice_bounds(boxes[:, 1], boxes[:, 3], height)
+    boxes_widths = w_ends - w_starts
+    areas = boxes_widths * (h_ends - h_starts)
+
+    painted = np.flatnonzero(areas)
+    if not len(painted):
+        return chargrid_map.view(batch_b, height, width)
+
+    painted_areas = torch.as_tensor(areas[painted], device=device)
+    box_indexes = torch.repeat_interleave(torch.as_tensor(painted, device=device), painted_areas)
+    offsets = torch.arange(len(box_indexes), device=device) - torch.repeat_interleave(
+        torch.cumsum(painted_areas, 0) - painted_areas, painted_areas
+    )
+    painted_widths = torch.as_tensor(boxes_widths, device=device)[box_indexes]
+    rows = torch.as_tensor(h_starts, device=device)[box_indexes] + offsets // painted_widths
+    columns = torch.as_tensor(w_starts, device=device)[box_indexes] + offsets % painted_widths
+    pixels = (torch.as_tensor(np.concatenate(images_indexes), device=device)[box_indexes] * height + rows) * width + columns
+
+    last_box_by_pixel = torch.full_like(chargrid_map, -1)
+    last_box_by_pixel.scatter_reduce_(0, pixels, box_indexes, reduce="amax")
+    ids = torch.as_tensor(np.concatenate(ids_list), dtype=torch.int64, device=device)
+    covered = last_box_by_pixel >= 0
+    chargrid_map[covered] = ids[last_box_by_pixel[covered]]
+    return chargrid_map.view(batch_b, height, width)
+
+
 class WordnnEmbedding(nn.Module):
     """Generate chargrid embedding feature map."""
 
@@ -66,25 +124,9 @@ class WordnnEmbedding(nn.Module):
         device = img.device
         batch_b, _, batch_h, batch_w = img.size()
 
-        chargrid_map = torch.zeros((batch_b, batch_h // stride, batch_w // stride), dtype=torch.int64).to(device)
-
-        for iter_b in range(batch_b):
-            per_input_ids = batched_inputs[iter_b]["input_ids"]
-            per_input_bbox = batched_inputs[iter_b]["bbox"]
-
-            short_length_w = min(len(per_input_ids), len(per_input_bbox))
-
-            if short_length_w > 0:
-                for word_idx in range(short_length_w):
-                    per_id = per_input_ids[word_idx]
-
-                    bbox = per_input_bbox[word_idx] / stride
-                    w_start, h_start, w_end, h_end = bbox.round().astype(int).tolist()
-
-                    if self.use_UNK_text:
-                        chargrid_map[iter_b, h_start:h_end, w_start:w_end] = 100
-                    else:
-                        chargrid_map[iter_b, h_start:h_end, w_start:w_end] = per_id
+        chargrid_map = paint_chargrid(
+            batched_inputs, batch_b, batch_h // stride, batch_w // stride, stride, self.use_UNK_text, device
+        )
 
         chargrid_map = self.embedding(chargrid_map)
         chargrid_map = self.embedding_proj(chargrid_map)
@@ -9,7 +9,7 @@
 
 from .config import add_vit_config
 from .VGTbackbone import build_VGT_fpn_backbone
-from .dataset_mapper import DetrDatasetMapper
+from .dataset_mapper import DetrDatasetMapper, DetrInferenceMapper
 from .VGTTrainer import VGTTrainer
 from .VGT import VGT
 
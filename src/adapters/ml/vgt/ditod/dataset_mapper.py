@@ -26,7 +26,7 @@ from detectron2.structures import (
     polygons_to_bitmask,
 )
 
-__all__ = ["DetrDatasetMapper"]
+__all__ = ["DetrDatasetMapper", "DetrInferenceMapper"]
 
 
 def build_transform_gen(cfg, is_train):
@@ -83,6 +83,20 @@ def build_transform_gen_w(cfg, is_train):
     return tfm_gens
 
 
+def transform_subword_boxes(bbox_subword_list, transforms, image_shape):
+    """
+    Vectorized equivalent of calling utils.transform_instance_annotations on every XYWH_ABS subword box.
+    Returns:
+        np.ndarray: in shape of [N x 4], XYXY_ABS boxes clipped to the image.
+    """
+    if len(bbox_subword_list) == 0:
+        return np.zeros((0, 4))
+    boxes = np.asarray(bbox_subword_list, dtype=np.float32).reshape(-1, 4)
+    boxes = BoxMode.convert(boxes, BoxMode.XYWH_ABS, BoxMode.XYXY_ABS).astype(np.float64)
+    boxes = transforms.apply_box(boxes).clip(min=0)
+    return np.minimum(boxes, list(image_shape + image_shape)[::-1])
+
+
 class DetrDatasetMapper:
     """
     A callable which takes a dataset dict in Detectron2 Dataset format,
@@ -167,16 +181,8 @@ class DetrDatasetMapper:
         dataset_dict["image"] = torch.as_tensor(np.ascontiguousarray(image.transpose(2, 0, 1)))
 
         ## 产出 text grid
-        bbox = []
-        for bbox_per_subword in bbox_subword_list:
-            text_word = {}
-            text_word["bbox"] = bbox_per_subword.tolist()
-            text_word["bbox_mode"] = BoxMode.XYWH_ABS
-            utils.transform_instance_annotations(text_word, transforms, image_shape)
-            bbox.append(text_word["bbox"])
-
         dataset_dict["input_ids"] = input_ids
-        dataset_dict["bbox"] = bbox
+        dataset_dict["bbox"] = transform_subword_boxes(bbox_subword_list, transforms, image_shape)
 
         if not self.is_train:
             # USER: Modify this if you want to keep them for some reason.
@@ -200,3 +206,56 @@ class DetrDatasetMapper:
             dataset_dict["instances"] = utils.filter_empty_instances(instances)
 
         return dataset_dict
+
+
+class DetrInferenceMapper:
+    """
+    An inference-only mapper for page images already in memory.
+
+    Unlike :class:`DetrDatasetMapper`, it does not copy a dataset dict or read the image and the word grid
+    from disk, and it rescales all the subword boxes with a single transform.
+    """
+
+    def __init__(self, cfg):
+        self.tfm_gens = build_transform_gen(cfg, is_train=False)
+        self.tfm_gens_w = build_transform_gen_w(cfg, is_train=False)
+        self.img_format = cfg.INPUT.FORMAT
+        self.min_size_test = cfg.INPUT.MIN_SIZE_TEST
+        self.max_size_test = cfg.INPUT.MAX_SIZE_TEST
+        self.tfm_gens_by_test_size = {}
+
+    def get_transform_gens(self, height, width, test_size=None):
+        """
+        Args:
+            test_size (int or None): shortest edge to resize to, instead of ``INPUT.MIN_SIZE_TEST``.
+                The longest edge limit is scaled by the same ratio.
+        """
+        if test_size is None or test_size == self.min_size_test:
+            return self.tfm_gens if height > width else self.tfm_gens_w
+        if test_size not in self.tfm_gens_by_test_size:
+            max_size = round(self.max_size_test * test_size / self.min_size_test)
+            self.tfm_gens_by_test_size[test_size] = [T.ResizeShortestEdge(test_size, max_size, "choice")]
+        return self.tfm_gens_by_test_size[test_size]
+
+    def __call__(self, image, input_ids, bbox_subword_list, test_size=None):
+        """
+        Args:
+            image (np.ndarray): page image in shape of [H x W x C], in the ``img_format`` of the config.
+            input_ids (list[int]): subword ids of the page word grid.
+            bbox_subword_list: XYWH_ABS subword boxes in image coordinates, in shape of [N x 4].
+            test_size (int or None): see :meth:`get_transform_gens`.
+
+        Returns:
+            dict: a format that builtin models in detectron2 accept
+        """
+        height, width = image.shape[:2]
+        transform_gens = self.get_transform_gens(height, width, test_size)
+        image, transforms = T.apply_transform_gens(transform_gens, image)
+
+        return {
+            "image": torch.as_tensor(np.ascontiguousarray(image.transpose(2, 0, 1))),
+            "input_ids": input_ids,
+            "bbox": transform_subword_boxes(bbox_subword_list, transforms, image.shape[:2]),
+            "height": height,
+            "width": width,
+        }
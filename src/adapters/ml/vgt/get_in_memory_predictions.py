@@ -0,0 +1,55 @@
+from PIL.Image import Image
+from detectron2.data import detection_utils as utils
+from detectron2.structures import BoxMode, Instances
+from pdf_features import PdfPage
+
+from adapters.ml.vgt.VGTBatchScheduler import VGTBatchScheduler
+from adapters.ml.vgt.create_word_grid import get_grid_words_dict
+from adapters.ml.vgt.ditod import DetrInferenceMapper
+from adapters.ml.vgt.get_most_probable_pdf_segments import get_prediction
+from adapters.ml.vgt.resolution_policy import get_test_size
+from configuration import DOCLAYNET_TYPE_BY_ID
+from domain.PdfImages import PdfImages
+from domain.Prediction import Prediction
+
+CATEGORY_ID_BY_CLASS_INDEX = sorted(DOCLAYNET_TYPE_BY_ID.keys())
+
+
+def get_page_input(image: Image, page: PdfPage, inference_mapper: DetrInferenceMapper, test_size: int | None = None) -> dict:
+    image_array = utils.convert_PIL_to_numpy(image, inference_mapper.img_format)
+    grid_words_dict = get_grid_words_dict(page.tokens)
+    return inference_mapper(image_array, grid_words_dict["input_ids"], grid_words_dict["bbox_subword_list"], test_size)
+
+
+def get_page_predictions(instances: Instances) -> list[Prediction]:
+    boxes = BoxMode.convert(instances.pred_boxes.tensor.float().numpy(), BoxMode.XYXY_ABS, BoxMode.XYWH_ABS).tolist()
+    scores = instances.scores.float().tolist()
+    classes = instances.pred_classes.tolist()
+
+    return [
+        get_prediction({"bbox": box, "category_id": CATEGORY_ID_BY_CLASS_INDEX[class_index], "score": score})
+        for box, score, class_index in zip(boxes, scores, classes)
+    ]
+
+
+def get_in_memory_predictions(
+    batch_scheduler: VGTBatchScheduler,
+    inference_mapper: DetrInferenceMapper,
+    pdf_images_list: list[PdfImages],
+    resolution: str = "",
+) -> dict[str, list[Prediction]]:
+    page_names: list[str] = []
+    page_inputs: list[dict] = []
+    for pdf_images in pdf_images_list:
+        for page_index, page in enumerate(pdf_images.pdf_features.pages):
+            page_names.append(f"{pdf_images.pdf_features.file_name}_{page.page_number - 1}")
+            test_size = get_test_size(page, resolution)
+            page_inputs.append(get_page_input(pdf_images.pdf_images[page_index], page, inference_mapper, test_size))
+
+    vgt_predictions_dict: dict[str, list[Prediction]] = dict()
+    for page_name, instances in zip(page_names, batch_scheduler.predict(page_inputs)):
+        page_predictions = get_page_predictions(instances)
+        if page_predictions:
+            vgt_predictions_dict[page_name] = page_predictions
+
+    return vgt_predictions_dict
@@ -3,10 +3,10 @@ from os import makedirs
 from pdf_features import PdfToken
 from domain.PdfImages import PdfImages
 from configuration import DOCLAYNET_TYPE_BY_ID
-from configuration import JSONS_ROOT_PATH, JSON_TEST_FILE_PATH
+from domain.RequestWorkspace import RequestWorkspace
 
 
-def save_annotations_json(annotations: list, width_height: list, images: list):
+def save_annotations_json(annotations: list, width_height: list, images: list, workspace: RequestWorkspace):
     images_dict = [
         {
             "id": i,
@@ -30,7 +30,7 @@ def save_annotations_json(annotations: list, width_height: list, images: list):
 
     coco_dict = {"info": info_dict, "images": images_dict, "categories": categories_dict, "annotations": annotations}
 
-    JSON_TEST_FILE_PATH.write_text(json.dumps(coco_dict))
+    workspace.json_test_file_path.write_text(json.dumps(coco_dict))
 
 
 def get_annotation(index: int, image_id: str, token: PdfToken):
@@ -56,8 +56,8 @@ def get_annotations_for_document(annotations, images, index, pdf_images, width_h
             index += 1
 
 
-def get_annotations(pdf_images_list: list[PdfImages]):
-    makedirs(JSONS_ROOT_PATH, exist_ok=True)
+def get_annotations(pdf_images_list: list[PdfImages], workspace: RequestWorkspace):
+    makedirs(workspace.jsons_path, exist_ok=True)
 
     annotations = list()
     images = list()
@@ -68,4 +68,4 @@ def get_annotations(pdf_images_list: list[PdfImages]):
         get_annotations_for_document(annotations, images, index, pdf_images, width_height)
         index += sum([len(page.tokens) for page in pdf_images.pdf_features.pages])
 
-    save_annotations_json(annotations, width_height, images)
+    save_annotations_json(annotations, width_height, images, workspace)
@@ -2,7 +2,7 @@ import torch
 from os.path import join
 from detectron2.config import get_cfg
 from detectron2.engine import default_setup, default_argument_parser
-from configuration import service_logger, SRC_PATH, ROOT_PATH
+from configuration import service_logger, ROOT_PATH, VGT_CONFIGURATION_PATH
 from adapters.ml.vgt.ditod import add_vit_config
 
 
@@ -29,7 +29,7 @@ def is_gpu_available():
 def get_model_configuration():
     parser = default_argument_parser()
     args, unknown = parser.parse_known_args()
-    args.config_file = join(SRC_PATH, "adapters", "ml", "vgt", "model_configuration", "doclaynet_VGT_cascade_PTM.yaml")
+    args.config_file = str(VGT_CONFIGURATION_PATH)
     args.eval_only = True
     args.num_gpus = 1
     args.opts = [
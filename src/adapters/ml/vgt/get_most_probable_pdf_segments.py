@@ -1,22 +1,23 @@
 import json
 import pickle
+from os import makedirs
 from os.path import join
 from pathlib import Path
 from statistics import mode
 
+from domain.PageSpatialIndex import PageSpatialIndex
 from domain.PdfSegment import PdfSegment
 from pdf_features import PdfFeatures
 from pdf_features import PdfToken
 from pdf_features import Rectangle
 from pdf_token_type_labels import TokenType
 from domain.PdfImages import PdfImages
-from configuration import ROOT_PATH, DOCLAYNET_TYPE_BY_ID
+from configuration import DOCLAYNET_TYPE_BY_ID
 from domain.Prediction import Prediction
+from domain.RequestWorkspace import RequestWorkspace
 
 
-def get_prediction_from_annotation(annotation, images_names, vgt_predictions_dict):
-    pdf_name = images_names[annotation["image_id"]][:-4]
-    category_id = annotation["category_id"]
+def get_prediction(annotation) -> Prediction:
     bounding_box = Rectangle.from_width_height(
         left=int(annotation["bbox"][0]),
         top=int(annotation["bbox"][1]),
@@ -24,19 +25,21 @@ def get_prediction_from_annotation(annotation, images_names, vgt_predictions_dic
         height=int(annotation["bbox"][3]),
     )
 
-    prediction = Prediction(
-        bounding_box=bounding_box, category_id=category_id, score=round(float(annotation["score"]) * 100, 2)
+    return Prediction(
+        bounding_box=bounding_box, category_id=annotation["category_id"], score=round(float(annotation["score"]) * 100, 2)
     )
-    vgt_predictions_dict.setdefault(pdf_name, list()).append(prediction)
 
 
-def get_vgt_predictions(model_name: str) -> dict[str, list[Prediction]]:
-    output_dir: str = f"model_output_{model_name}"
-    model_output_json_path = join(str(ROOT_PATH), output_dir, "inference", "coco_instances_results.json")
+def get_prediction_from_annotation(annotation, images_names, vgt_predictions_dict):
+    pdf_name = images_names[annotation["image_id"]][:-4]
+    vgt_predictions_dict.setdefault(pdf_name, list()).append(get_prediction(annotation))
+
+
+def get_vgt_predictions(workspace: RequestWorkspace) -> dict[str, list[Prediction]]:
+    model_output_json_path = join(workspace.model_output_path, "inference", "coco_instances_results.json")
     annotations = json.loads(Path(model_output_json_path).read_text())
 
-    test_json_path = join(str(ROOT_PATH), "jsons", "test.json")
-    coco_truth = json.loads(Path(test_json_path).read_text())
+    coco_truth = json.loads(workspace.json_test_file_path.read_text())
 
     images_names = {value["id"]: value["file_name"] for value in coco_truth["images"]}
 
@@ -47,10 +50,14 @@ def get_vgt_predictions(model_name: str) -> dict[str, list[Prediction]]:
     return vgt_predictions_dict
 
 
-def find_best_prediction_for_token(page_pdf_name, token, vgt_predictions_dict, most_probable_tokens_by_predictions):
+def find_best_prediction_for_token(
+    page_pdf_name, token, vgt_predictions_dict, most_probable_tokens_by_predictions, predictions_index: PageSpatialIndex
+):
     best_score: float = 0
     most_probable_prediction: Prediction | None = None
-    for prediction in vgt_predictions_dict[page_pdf_name]:
+    page_predictions = vgt_predictions_dict[page_pdf_name]
+    for prediction_index in predictions_index.query(token.bounding_box):
+        prediction = page_predictions[prediction_index]
         if prediction.score > best_score and prediction.bounding_box.get_intersection_percentage(token.bounding_box):
             best_score = prediction.score
             most_probable_prediction = prediction
@@ -70,33 +77,89 @@ def get_merged_prediction_type(to_merge: list[Prediction]):
     return 9
 
 
-def merge_colliding_predictions(predictions: list[Prediction]):
-    predictions = [p for p in predictions if not p.score < 20]
+def merge_group_predictions(predictions: list[Prediction]):
     while True:
-        new_predictions, merged = [], False
-        while predictions:
-            p1 = predictions.pop(0)
-            to_merge = [p for p in predictions if p1.bounding_box.get_intersection_percentage(p.bounding_box) > 0]
-            for prediction in to_merge:
-                predictions.remove(prediction)
+        predictions_index = PageSpatialIndex([prediction.bounding_box for prediction in predictions])
+        new_predictions, merged_indexes = [], set()
+        for index, p1 in enumerate(predictions):
+            if index in merged_indexes:
+                continue
+            to_merge = []
+            for candidate_index in predictions_index.query(p1.bounding_box):
+                if candidate_index <= index or candidate_index in merged_indexes:
+                    continue
+                if p1.bounding_box.get_intersection_percentage(predictions[candidate_index].bounding_box) > 0:
+                    to_merge.append(predictions[candidate_index])
+                    merged_indexes.add(candidate_index)
             if to_merge:
                 to_merge.append(p1)
                 p1.bounding_box = Rectangle.merge_rectangles([prediction.bounding_box for prediction in to_merge])
                 p1.category_id = get_merged_prediction_type(to_merge)
-                merged = True
             new_predictions.append(p1)
-        if not merged:
+        if not merged_indexes:
             return new_predictions
         predictions = new_predictions
 
 
+def get_overlapping_pairs(rectangles: list[Rectangle]):
+    active_indexes: list[int] = []
+    for index in sorted(range(len(rectangles)), key=lambda rectangle_index: rectangles[rectangle_index].left):
+        rectangle = rectangles[index]
+        active_indexes = [active for active in active_indexes if rectangles[active].right >= rectangle.left]
+        for active_index in active_indexes:
+            if rectangles[active_index].get_intersection_percentage(rectangle) > 0:
+                yield active_index, index
+        active_indexes.append(index)
+
+
+def get_root(parents: list[int], index: int):
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def get_colliding_groups(rectangles: list[Rectangle]) -> list[list[int]]:
+    groups = [[index] for index in range(len(rectangles))]
+    while True:
+        groups_rectangles = [Rectangle.merge_rectangles([rectangles[index] for index in group]) for group in groups]
+        parents = list(range(len(groups)))
+        for group_index_1, group_index_2 in get_overlapping_pairs(groups_rectangles):
+            parents[get_root(parents, group_index_1)] = get_root(parents, group_index_2)
+
+        merged_groups: dict[int, list[int]] = dict()
+        for group_index, group in enumerate(groups):
+            merged_groups.setdefault(get_root(parents, group_index), list()).extend(group)
+
+        if len(merged_groups) == len(groups):
+            return groups
+        groups = [sorted(group) for group in merged_groups.values()]
+
+
+def merge_colliding_predictions(predictions: list[Prediction]):
+    predictions = [p for p in predictions if not p.score < 20]
+    merged_predictions: list[tuple[int, Prediction]] = []
+    for group in get_colliding_groups([prediction.bounding_box for prediction in predictions]):
+        if len(group) == 1:
+            merged_predictions.append((group[0], predictions[group[0]]))
+            continue
+        original_index = {id(predictions[index]): index for index in group}
+        for prediction in merge_group_predictions([predictions[index] for index in group]):
+            merged_predictions.append((original_index[id(prediction)], prediction))
+
+    return [prediction for _, prediction in sorted(merged_predictions, key=lambda indexed: indexed[0])]
+
+
 def get_pdf_segments_for_page(page, pdf_name, page_pdf_name, vgt_predictions_dict):
     most_probable_pdf_segments_for_page: list[PdfSegment] = []
     most_probable_tokens_by_predictions: dict[Prediction, list[PdfToken]] = {}
     vgt_predictions_dict[page_pdf_name] = merge_colliding_predictions(vgt_predictions_dict[page_pdf_name])
+    predictions_index = PageSpatialIndex([prediction.bounding_box for prediction in vgt_predictions_dict[page_pdf_name]])
 
     for token in page.tokens:
-        find_best_prediction_for_token(page_pdf_name, token, vgt_predictions_dict, most_probable_tokens_by_predictions)
+        find_best_prediction_for_token(
+            page_pdf_name, token, vgt_predictions_dict, most_probable_tokens_by_predictions, predictions_index
+        )
 
     for prediction, tokens in most_probable_tokens_by_predictions.items():
         new_segment = PdfSegment.from_pdf_tokens(tokens, pdf_name)
@@ -123,9 +186,15 @@ def prediction_exists_for_page(page_pdf_name, vgt_predictions_dict):
     return page_pdf_name in vgt_predictions_dict
 
 
-def get_most_probable_pdf_segments(model_name: str, pdf_images_list: list[PdfImages], save_output: bool = False):
+def get_most_probable_pdf_segments(
+    workspace: RequestWorkspace,
+    pdf_images_list: list[PdfImages],
+    save_output: bool = False,
+    vgt_predictions_dict: dict[str, list[Prediction]] | None = None,
+):
     most_probable_pdf_segments: list[PdfSegment] = []
-    vgt_predictions_dict = get_vgt_predictions(model_name)
+    if vgt_predictions_dict is None:
+        vgt_predictions_dict = get_vgt_predictions(workspace)
     pdf_features_list: list[PdfFeatures] = [pdf_images.pdf_features for pdf_images in pdf_images_list]
     for pdf_features in pdf_features_list:
         for page in pdf_features.pages:
@@ -135,7 +204,8 @@ def get_most_probable_pdf_segments(model_name: str, pdf_images_list: list[PdfIma
             page_segments = get_pdf_segments_for_page(page, pdf_features.file_name, page_pdf_name, vgt_predictions_dict)
             most_probable_pdf_segments.extend(page_segments)
     if save_output:
-        save_path = join(ROOT_PATH, f"model_output_{model_name}", "predicted_segments.pickle")
+        makedirs(workspace.model_output_path, exist_ok=True)
+        save_path = join(workspace.model_output_path, "predicted_segments.pickle")
         with open(save_path, mode="wb") as file:
             pickle.dump(most_probable_pdf_segments, file)
     return most_probable_pdf_segments
@@ -1,3 +1,8 @@
+from collections import defaultdict
+
+import numpy as np
+
+from domain.PageSpatialIndex import PageSpatialIndex
 from domain.PdfSegment import PdfSegment
 from pdf_features import PdfPage
 from pdf_features import PdfToken
@@ -6,10 +11,13 @@ from pdf_token_type_labels import TokenType
 from domain.PdfImages import PdfImages
 
 
-def find_segment_for_token(token: PdfToken, segments: list[PdfSegment], tokens_by_segments):
+def find_segment_for_token(
+    token: PdfToken, segments: list[PdfSegment], tokens_by_segments, segments_index: PageSpatialIndex
+):
     best_score: float = 0
     most_probable_segment: PdfSegment | None = None
-    for segment in segments:
+    for segment_index in segments_index.query(token.bounding_box):
+        segment = segments[segment_index]
         intersection_percentage = token.bounding_box.get_intersection_percentage(segment.bounding_box)
         if intersection_percentage > best_score:
             best_score = intersection_percentage
@@ -20,43 +28,64 @@ def find_segment_for_token(token: PdfToken, segments: list[PdfSegment], tokens_b
         tokens_by_segments.setdefault(most_probable_segment, list()).append(token)
 
 
-def get_average_reading_order_for_segment(page: PdfPage, tokens_for_segment: list[PdfToken]):
-    reading_order_sum: int = sum(page.tokens.index(token) for token in tokens_for_segment)
+def get_average_reading_order_for_segment(token_positions: dict[int, int], tokens_for_segment: list[PdfToken]):
+    reading_order_sum: int = sum(token_positions[id(token)] for token in tokens_for_segment)
     return reading_order_sum / len(tokens_for_segment)
 
 
+def get_segment_center(segment: PdfSegment) -> tuple[float, float]:
+    center_x = (segment.bounding_box.left + segment.bounding_box.right) / 2
+    center_y = (segment.bounding_box.top + segment.bounding_box.bottom) / 2
+    return center_x, center_y
+
+
 def get_distance_between_segments(segment1: PdfSegment, segment2: PdfSegment):
-    center_1_x = (segment1.bounding_box.left + segment1.bounding_box.right) / 2
-    center_1_y = (segment1.bounding_box.top + segment1.bounding_box.bottom) / 2
-    center_2_x = (segment2.bounding_box.left + segment2.bounding_box.right) / 2
-    center_2_y = (segment2.bounding_box.top + segment2.bounding_box.bottom) / 2
+    center_1_x, center_1_y = get_segment_center(segment1)
+    center_2_x, center_2_y = get_segment_center(segment2)
     return ((center_1_x - center_2_x) ** 2 + (center_1_y - center_2_y) ** 2) ** 0.5
 
 
+class SegmentCentersIndex:
+    def __init__(self, segments: list[PdfSegment]):
+        centers = [get_segment_center(segment) for segment in segments]
+        self.centers = np.array(centers, dtype=np.float64).reshape(-1, 2)
+
+    def get_closest_position(self, segment: PdfSegment) -> int:
+        center = np.array(get_segment_center(segment), dtype=np.float64)
+        distances = np.power(np.square(self.centers - center).sum(axis=1), 0.5)
+        return int(np.argmin(distances))
+
+    def insert(self, position: int, segment: PdfSegment):
+        self.centers = np.insert(self.centers, position, get_segment_center(segment), axis=0)
+
+
 def add_no_token_segments(segments, no_token_segments):
     if segments:
+        centers_index = SegmentCentersIndex(segments)
         for no_token_segment in no_token_segments:
-            closest_segment = sorted(segments, key=lambda seg: get_distance_between_segments(no_token_segment, seg))[0]
-            closest_index = segments.index(closest_segment)
-            if closest_segment.bounding_box.top < no_token_segment.bounding_box.top:
-                segments.insert(closest_index + 1, no_token_segment)
-            else:
-                segments.insert(closest_index, no_token_segment)
+            closest_index = centers_index.get_closest_position(no_token_segment)
+            if segments[closest_index].bounding_box.top < no_token_segment.bounding_box.top:
+                closest_index += 1
+            segments.insert(closest_index, no_token_segment)
+            centers_index.insert(closest_index, no_token_segment)
     else:
         for segment in sorted(no_token_segments, key=lambda r: (r.bounding_box.left, r.bounding_box.top)):
             segments.append(segment)
 
 
-def filter_and_sort_segments(page, tokens_by_segments, types):
+def filter_and_sort_segments(token_positions: dict[int, int], tokens_by_segments, types):
     filtered_segments = [seg for seg in tokens_by_segments.keys() if seg.segment_type in types]
-    order = {seg: get_average_reading_order_for_segment(page, tokens_by_segments[seg]) for seg in filtered_segments}
+    order = {
+        seg: get_average_reading_order_for_segment(token_positions, tokens_by_segments[seg]) for seg in filtered_segments
+    }
     return sorted(filtered_segments, key=lambda seg: order[seg])
 
 
 def get_ordered_segments_for_page(segments_for_page: list[PdfSegment], page: PdfPage):
     tokens_by_segments: dict[PdfSegment, list[PdfToken]] = {}
+    segments_index = PageSpatialIndex([segment.bounding_box for segment in segments_for_page])
     for token in page.tokens:
-        find_segment_for_token(token, segments_for_page, tokens_by_segments)
+        find_segment_for_token(token, segments_for_page, tokens_by_segments, segments_index)
 
     page_number_segment: None | PdfSegment = None
     if tokens_by_segments:
@@ -65,24 +94,33 @@ def get_ordered_segments_for_page(segments_for_page: list[PdfSegment], page: Pdf
             page_number_segment = last_segment
             del tokens_by_segments[last_segment]
 
-    header_segments: list[PdfSegment] = filter_and_sort_segments(page, tokens_by_segments, {TokenType.PAGE_HEADER})
+    token_positions = {id(token): position for position, token in reversed(list(enumerate(page.tokens)))}
+    header_segments: list[PdfSegment] = filter_and_sort_segments(
+        token_positions, tokens_by_segments, {TokenType.PAGE_HEADER}
+    )
     paragraph_types = {t for t in TokenType if t.name not in {"PAGE_HEADER", "PAGE_FOOTER", "FOOTNOTE"}}
-    paragraph_segments = filter_and_sort_segments(page, tokens_by_segments, paragraph_types)
-    footer_segments = filter_and_sort_segments(page, tokens_by_segments, {TokenType.PAGE_FOOTER, TokenType.FOOTNOTE})
+    paragraph_segments = filter_and_sort_segments(token_positions, tokens_by_segments, paragraph_types)
+    footer_segments = filter_and_sort_segments(
+        token_positions, tokens_by_segments, {TokenType.PAGE_FOOTER, TokenType.FOOTNOTE}
+    )
     if page_number_segment:
         footer_segments.append(page_number_segment)
     ordered_segments = header_segments + paragraph_segments + footer_segments
-    no_token_segments = [segment for segment in segments_for_page if segment not in ordered_segments]
+    ordered_segments_ids = {id(segment) for segment in ordered_segments}
+    no_token_segments = [segment for segment in segments_for_page if id(segment) not in ordered_segments_ids]
     add_no_token_segments(ordered_segments, no_token_segments)
     return ordered_segments
 
 
 def get_reading_orders(pdf_images_list: list[PdfImages], predicted_segments: list[PdfSegment]):
+    segments_by_page: dict[tuple[str, int], list[PdfSegment]] = defaultdict(list)
+    for segment in predicted_segments:
+        segments_by_page[(segment.pdf_name, segment.page_number)].append(segment)
+
     ordered_segments: list[PdfSegment] = []
     for pdf_images in pdf_images_list:
         pdf_name = pdf_images.pdf_features.file_name
-        segments_for_file = [segment for segment in predicted_segments if segment.pdf_name == pdf_name]
         for page in pdf_images.pdf_features.pages:
-            segments_for_page = [segment for segment in segments_for_file if segment.page_number == page.page_number]
+            segments_for_page = segments_by_page.get((pdf_name, page.page_number), [])
             ordered_segments.extend(get_ordered_segments_for_page(segments_for_page, page))
     return ordered_segments
@@ -0,0 +1,113 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import torch
+from detectron2.modeling import Backbone
+from detectron2.structures import ImageList
+from torch import nn
+
+from adapters.ml.vgt.ditod import DetrInferenceMapper
+from configuration import service_logger, VGT_ONNX_PATH
+
+ONNX_BACKBONE_FILE_NAME = re.compile(r"vgt_backbone_(\d+)x(\d+)\.onnx")
+ONNX_OPSET_VERSION = 17
+
+
+def get_onnx_backbone_path(height: int, width: int) -> Path:
+    return Path(VGT_ONNX_PATH, f"vgt_backbone_{height}x{width}.onnx")
+
+
+def get_backbone_input_shape(backbone: Backbone, inference_mapper: DetrInferenceMapper, height: int, width: int):
+    page_input = inference_mapper(np.zeros((height, width, 3), dtype=np.uint8), [], [])
+    padded_images = ImageList.from_tensors(
+        [page_input["image"]], backbone.size_divisibility, padding_constraints=backbone.padding_constraints
+    )
+    return tuple(padded_images.tensor.shape[-2:])
+
+
+class BackboneExportWrapper(nn.Module):
+    def __init__(self, backbone: Backbone):
+        super().__init__()
+        self.backbone = backbone
+        self.output_names = list(backbone.output_shape().keys())
+
+    def forward(self, image: torch.Tensor, chargrid: torch.Tensor):
+        features = self.backbone(image, chargrid)
+        return tuple(features[name] for name in self.output_names)
+
+
+def export_backbone(backbone: Backbone, height: int, width: int, embedding_dim: int) -> Path:
+    export_wrapper = BackboneExportWrapper(backbone).eval()
+    image = torch.randn(1, 3, height, width)
+    chargrid = torch.randn(1, embedding_dim, height, width)
+    onnx_path = get_onnx_backbone_path(height, width)
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    dynamic_axes = {name: {0: "batch"} for name in ["image", "chargrid"] + export_wrapper.output_names}
+    with torch.no_grad():
+        torch.onnx.export(
+            export_wrapper,
+            (image, chargrid),
+            str(onnx_path),
+            input_names=["image", "chargrid"],
+            output_names=export_wrapper.output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET_VERSION,
+            dynamo=False,
+        )
+    return onnx_path
+
+
+def load_onnx_sessions(onnx_path: Path) -> dict:
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    sessions_by_shape = dict()
+    for model_path in sorted(onnx_path.glob("vgt_backbone_*.onnx")):
+        shape_match = ONNX_BACKBONE_FILE_NAME.fullmatch(model_path.name)
+        if not shape_match:
+            continue
+        shape = (int(shape_match.group(1)), int(shape_match.group(2)))
+        sessions_by_shape[shape] = onnxruntime.InferenceSession(
+            str(model_path), session_options, providers=["CPUExecutionProvider"]
+        )
+    service_logger.info(f"VGT ONNX backbones loaded for input shapes: {sorted(sessions_by_shape)}")
+    return sessions_by_shape
+
+
+class OnnxBackbone(Backbone):
+    def __init__(self, backbone: Backbone, sessions_by_shape: dict):
+        super().__init__()
+        self.backbone = backbone
+        self.sessions_by_shape = sessions_by_shape
+        self.output_names = list(backbone.output_shape().keys())
+        self._out_features = backbone._out_features
+        self._out_feature_channels = backbone._out_feature_channels
+        self._out_feature_strides = backbone._out_feature_strides
+        self.missing_shapes: set[tuple[int, int]] = set()
+
+    @property
+    def size_divisibility(self) -> int:
+        return self.backbone.size_divisibility
+
+    @property
+    def padding_constraints(self) -> dict[str, int]:
+        return self.backbone.padding_constraints
+
+    def output_shape(self):
+        return self.backbone.output_shape()
+
+    def forward(self, x, grid):
+        shape = tuple(x.shape[-2:])
+        session = self.sessions_by_shape.get(shape)
+        if session is None:
+            if shape not in self.missing_shapes:
+                self.missing_shapes.add(shape)
+                service_logger.info(f"No VGT ONNX backbone exported for input shape {shape}, using PyTorch")
+            return self.backbone(x, grid)
+
+        inputs = {"image": x.detach().float().cpu().numpy(), "chargrid": grid.detach().float().cpu().numpy()}
+        outputs = session.run(self.output_names, inputs)
+        return {name: torch.from_numpy(output).to(x.device) for name, output in zip(self.output_names, outputs)}
@@ -0,0 +1,33 @@
+from pdf_features import PdfPage
+
+from configuration import VGT_RESOLUTION, VGT_AUTO_RESOLUTION_LADDER
+
+
+def get_resolution_ladder(ladder: str) -> list[tuple[int, int]]:
+    steps = []
+    for step in ladder.split(","):
+        if not step.strip():
+            continue
+        test_size, max_tokens = step.split(":")
+        steps.append((int(test_size), int(max_tokens)))
+    return sorted(steps, key=lambda step: step[1])
+
+
+AUTO_RESOLUTION_LADDER = get_resolution_ladder(VGT_AUTO_RESOLUTION_LADDER)
+
+
+def get_test_size(page: PdfPage, resolution: str = "") -> int | None:
+    resolution = resolution.lower().strip() or VGT_RESOLUTION
+    if resolution == "full":
+        return None
+
+    if resolution == "auto":
+        for test_size, max_tokens in AUTO_RESOLUTION_LADDER:
+            if len(page.tokens) <= max_tokens:
+                return test_size
+        return None
+
+    test_size = int(resolution)
+    if test_size <= 0:
+        raise ValueError(f"Invalid VGT resolution: {resolution}")
+    return test_size
@@ -0,0 +1,102 @@
+import random
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+from pdf_features import Rectangle
+
+from adapters.ml.vgt.create_word_grid import get_grid_words_dict, tokenizer_loader
+
+WORDS = ["The", "table", "1.", "Résumé", "naïve", "(a+b)", "x²", "don't", "e-mail", "数据", "ÅNGSTRÖM", "", "123,456", "q&a"]
+
+
+def rectangle_to_bbox(rectangle: Rectangle):
+    return [rectangle.left, rectangle.top, rectangle.width, rectangle.height]
+
+
+def get_words_positions_letter_by_letter(text: str, rectangle: Rectangle):
+    text = text.strip()
+    width_per_letter = rectangle.width / len(text)
+
+    words_bboxes = [Rectangle.from_coordinates(rectangle.left, rectangle.top, rectangle.left + 5, rectangle.bottom)]
+    words_bboxes[-1].width = 0
+    words_bboxes[-1].right = words_bboxes[-1].left
+
+    for letter in text:
+        if letter == " ":
+            left = words_bboxes[-1].right + width_per_letter
+            words_bboxes.append(Rectangle.from_coordinates(left, words_bboxes[-1].top, left + 5, words_bboxes[-1].bottom))
+            words_bboxes[-1].width = 0
+            words_bboxes[-1].right = words_bboxes[-1].left
+        else:
+            words_bboxes[-1].right = words_bboxes[-1].right + width_per_letter
+            words_bboxes[-1].width = words_bboxes[-1].width + width_per_letter
+
+    return text.split(), words_bboxes
+
+
+def get_subwords_positions_word_by_word(tokenizer, word: str, rectangle: Rectangle):
+    width_per_letter = rectangle.width / len(word)
+    word_tokens = [x.replace("#", "") for x in tokenizer.tokenize(word)]
+
+    if not word_tokens:
+        return [], []
+
+    ids = [x[-2] for x in tokenizer(word_tokens)["input_ids"]]
+
+    right = rectangle.left + len(word_tokens[0]) * width_per_letter
+    bboxes = [Rectangle.from_coordinates(rectangle.left, rectangle.top, right, rectangle.bottom)]
+
+    for subword in word_tokens[1:]:
+        right = bboxes[-1].right + len(subword) * width_per_letter
+        bboxes.append(Rectangle.from_coordinates(bboxes[-1].right, rectangle.top, right, rectangle.bottom))
+
+    return ids, bboxes
+
+
+def get_grid_words_dict_word_by_word(tokenizer, tokens):
+    texts, bbox_texts_list, inputs_ids, bbox_subword_list = [], [], [], []
+    for token in tokens:
+        words, words_bboxes = get_words_positions_letter_by_letter(token.content, token.bounding_box)
+        texts += words
+        bbox_texts_list += [rectangle_to_bbox(r) for r in words_bboxes]
+        for word, word_box in zip(words, words_bboxes):
+            ids, subwords_bboxes = get_subwords_positions_word_by_word(tokenizer, word, word_box)
+            inputs_ids += ids
+            bbox_subword_list += [rectangle_to_bbox(r) for r in subwords_bboxes]
+
+    return {
+        "input_ids": np.array(inputs_ids),
+        "bbox_subword_list": np.array(bbox_subword_list),
+        "texts": texts,
+        "bbox_texts_list": np.array(bbox_texts_list),
+    }
+
+
+def get_random_tokens(random_generator: random.Random) -> list:
+    tokens = []
+    for _ in range(random_generator.randint(0, 40)):
+        content = " ".join(random_generator.choice(WORDS) for _ in range(random_generator.randint(1, 6))).strip() or "x"
+        left, top = random_generator.uniform(0, 500), random_generator.uniform(0, 700)
+        bounding_box = Rectangle.from_width_height(
+            left, top, random_generator.uniform(1, 200), random_generator.uniform(1, 20)
+        )
+        tokens.append(SimpleNamespace(content=content, bounding_box=bounding_box))
+    return tokens
+
+
+class TestCreateWordGrid(TestCase):
+    def test_same_grid_as_tokenizing_word_by_word(self):
+        tokenizer = tokenizer_loader.get()
+        random_generator = random.Random(11)
+        for _ in range(200):
+            tokens = get_random_tokens(random_generator)
+
+            expected = get_grid_words_dict_word_by_word(tokenizer, tokens)
+            grid_words_dict = get_grid_words_dict(tokens)
+
+            self.assertEqual(expected["texts"], grid_words_dict["texts"])
+            self.assertEqual(expected["input_ids"].tolist(), grid_words_dict["input_ids"].tolist())
+            for key in ["bbox_texts_list", "bbox_subword_list"]:
+                self.assertEqual(expected[key].shape, grid_words_dict[key].shape)
+                self.assertTrue(np.allclose(expected[key], grid_words_dict[key]), key)
@@ -0,0 +1,85 @@
+import random
+from unittest import TestCase
+
+from pdf_features import Rectangle
+
+from adapters.ml.vgt.get_most_probable_pdf_segments import get_merged_prediction_type, merge_colliding_predictions
+from domain.Prediction import Prediction
+
+
+def merge_colliding_predictions_by_rescanning(predictions: list[Prediction]):
+    predictions = [p for p in predictions if not p.score < 20]
+    while True:
+        new_predictions, merged = [], False
+        while predictions:
+            p1 = predictions.pop(0)
+            to_merge = [p for p in predictions if p1.bounding_box.get_intersection_percentage(p.bounding_box) > 0]
+            for prediction in to_merge:
+                predictions.remove(prediction)
+            if to_merge:
+                to_merge.append(p1)
+                p1.bounding_box = Rectangle.merge_rectangles([prediction.bounding_box for prediction in to_merge])
+                p1.category_id = get_merged_prediction_type(to_merge)
+                merged = True
+            new_predictions.append(p1)
+        if not merged:
+            return new_predictions
+        predictions = new_predictions
+
+
+def get_random_predictions(random_generator: random.Random, page_size: int) -> list[Prediction]:
+    predictions = []
+    for _ in range(random_generator.randint(0, 60)):
+        left, top = random_generator.randint(0, page_size), random_generator.randint(0, page_size)
+        width, height = random_generator.randint(0, page_size // 4), random_generator.randint(0, page_size // 4)
+        bounding_box = Rectangle.from_width_height(left, top, width, height)
+        category_id = random_generator.randint(1, 11)
+        score = random_generator.choice([round(random_generator.uniform(0, 100), 2), 50.0, 90.0])
+        predictions.append(Prediction(bounding_box=bounding_box, category_id=category_id, score=score))
+    return predictions
+
+
+def copy_predictions(predictions: list[Prediction]) -> list[Prediction]:
+    return [
+        Prediction(
+            bounding_box=Rectangle.from_coordinates(
+                p.bounding_box.left, p.bounding_box.top, p.bounding_box.right, p.bounding_box.bottom
+            ),
+            category_id=p.category_id,
+            score=p.score,
+        )
+        for p in predictions
+    ]
+
+
+def to_tuples(predictions: list[Prediction]):
+    return [
+        (p.bounding_box.left, p.bounding_box.top, p.bounding_box.right, p.bounding_box.bottom, p.category_id, p.score)
+        for p in predictions
+    ]
+
+
+class TestMergeCollidingPredictions(TestCase):
+    def test_no_predictions(self):
+        self.assertEqual([], merge_colliding_predictions([]))
+
+    def test_same_result_as_rescanning_implementation(self):
+        random_generator = random.Random(42)
+        for _ in range(500):
+            predictions = get_random_predictions(random_generator, random_generator.choice([200, 600, 1200]))
+            expected = merge_colliding_predictions_by_rescanning(copy_predictions(predictions))
+            self.assertEqual(to_tuples(expected), to_tuples(merge_colliding_predictions(copy_predictions(predictions))))
+
+    def test_one_large_colliding_cluster(self):
+        random_generator = random.Random(7)
+        predictions = []
+        for row in range(40):
+            for column in range(25):
+                left, top = 20 * column + random_generator.randint(0, 6), 12 * row + random_generator.randint(0, 6)
+                bounding_box = Rectangle.from_width_height(left, top, 24, 15)
+                category_id = random_generator.choice([9, 10, 10, 10]) if row == 39 and column == 24 else 10
+                score = round(random_generator.uniform(20, 100), 2)
+                predictions.append(Prediction(bounding_box=bounding_box, category_id=category_id, score=score))
+
+        expected = merge_colliding_predictions_by_rescanning(copy_predictions(predictions))
+        self.assertEqual(to_tuples(expected), to_tuples(merge_colliding_predictions(copy_predictions(predictions))))
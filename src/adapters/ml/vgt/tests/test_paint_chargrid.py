@@ -0,0 +1,53 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+import torch
+
+from adapters.ml.vgt.ditod.Wordnn_embedding import paint_chargrid
+
+
+def paint_chargrid_box_by_box(batched_inputs, batch_b: int, height: int, width: int, stride: int, use_UNK_text: bool):
+    chargrid_map = torch.zeros((batch_b, height, width), dtype=torch.int64)
+    for iter_b in range(batch_b):
+        per_input_ids = batched_inputs[iter_b]["input_ids"]
+        per_input_bbox = batched_inputs[iter_b]["bbox"]
+        for word_idx in range(min(len(per_input_ids), len(per_input_bbox))):
+            bbox = per_input_bbox[word_idx] / stride
+            w_start, h_start, w_end, h_end = bbox.round().astype(int).tolist()
+            chargrid_map[iter_b, h_start:h_end, w_start:w_end] = 100 if use_UNK_text else per_input_ids[word_idx]
+    return chargrid_map
+
+
+def get_random_inputs(random_generator: random.Random, height: int, width: int) -> dict:
+    boxes_count = random_generator.randint(0, 300)
+    bbox = []
+    for _ in range(boxes_count):
+        left, top = random_generator.uniform(-20, width), random_generator.uniform(-20, height)
+        right, bottom = left + random_generator.uniform(-5, 60), top + random_generator.uniform(-5, 30)
+        bbox.append(np.array([left, top, right, bottom], dtype=np.float32))
+    input_ids = [random_generator.randint(1, 30000) for _ in range(boxes_count + random_generator.randint(-5, 5))]
+    return {"input_ids": input_ids, "bbox": bbox}
+
+
+class TestPaintChargrid(TestCase):
+    def test_same_result_as_painting_box_by_box(self):
+        random_generator = random.Random(7)
+        for _ in range(100):
+            batch_b, height, width = (
+                random_generator.randint(1, 3),
+                random_generator.randint(50, 300),
+                random_generator.randint(50, 300),
+            )
+            batched_inputs = [get_random_inputs(random_generator, height, width) for _ in range(batch_b)]
+            stride = random_generator.choice([1, 2, 4])
+            use_UNK_text = random_generator.random() < 0.2
+            expected = paint_chargrid_box_by_box(
+                batched_inputs, batch_b, height // stride, width // stride, stride, use_UNK_text
+            )
+            chargrid_map = paint_chargrid(batched_inputs, batch_b, height // stride, width // stride, stride, use_UNK_text)
+            self.assertTrue(torch.equal(expected, chargrid_map))
+
+    def test_no_words(self):
+        chargrid_map = paint_chargrid([{"input_ids": [], "bbox": []}], 1, 10, 20)
+        self.assertTrue(torch.equal(torch.zeros((1, 10, 20), dtype=torch.int64), chargrid_map))
@@ -0,0 +1,125 @@
+import json
+import random
+from os.path import join
+from unittest import TestCase
+
+from pdf_features import PdfFeatures, PdfPage, PdfToken, Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.ml.vgt.get_reading_orders import get_reading_orders, find_segment_for_token, get_distance_between_segments
+from configuration import ROOT_PATH
+from domain.PageSpatialIndex import PageSpatialIndex
+from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+
+GOLDEN_PDFS = ["test.pdf", "regular.pdf", "table.pdf", "formula.pdf", "toc-test.pdf", "some_empty_pages.pdf", "korean.pdf"]
+SEGMENT_TYPES = [TokenType.TEXT, TokenType.PAGE_HEADER, TokenType.TITLE, TokenType.PAGE_FOOTER, TokenType.FOOTNOTE]
+
+
+def get_quadratic_ordered_segments_for_page(segments_for_page: list[PdfSegment], page: PdfPage):
+    tokens_by_segments: dict[PdfSegment, list[PdfToken]] = {}
+    segments_index = PageSpatialIndex([segment.bounding_box for segment in segments_for_page])
+    for token in page.tokens:
+        find_segment_for_token(token, segments_for_page, tokens_by_segments, segments_index)
+
+    page_number_segment = None
+    if tokens_by_segments:
+        last_segment = max(tokens_by_segments.keys(), key=lambda seg: seg.bounding_box.top)
+        if last_segment.text_content and len(last_segment.text_content) < 5:
+            page_number_segment = last_segment
+            del tokens_by_segments[last_segment]
+
+    def filter_and_sort_segments(types):
+        filtered_segments = [seg for seg in tokens_by_segments.keys() if seg.segment_type in types]
+        order = {seg: sum(page.tokens.index(token) for token in tokens_by_segments[seg]) for seg in filtered_segments}
+        order = {seg: order[seg] / len(tokens_by_segments[seg]) for seg in filtered_segments}
+        return sorted(filtered_segments, key=lambda seg: order[seg])
+
+    paragraph_types = {t for t in TokenType if t.name not in {"PAGE_HEADER", "PAGE_FOOTER", "FOOTNOTE"}}
+    segments = filter_and_sort_segments({TokenType.PAGE_HEADER}) + filter_and_sort_segments(paragraph_types)
+    segments += filter_and_sort_segments({TokenType.PAGE_FOOTER, TokenType.FOOTNOTE})
+    if page_number_segment:
+        segments.append(page_number_segment)
+
+    no_token_segments = [segment for segment in segments_for_page if segment not in segments]
+    if not segments:
+        return sorted(no_token_segments, key=lambda r: (r.bounding_box.left, r.bounding_box.top))
+
+    for no_token_segment in no_token_segments:
+        closest_segment = sorted(segments, key=lambda seg: get_distance_between_segments(no_token_segment, seg))[0]
+        closest_index = segments.index(closest_segment)
+        if closest_segment.bounding_box.top < no_token_segment.bounding_box.top:
+            segments.insert(closest_index + 1, no_token_segment)
+        else:
+            segments.insert(closest_index, no_token_segment)
+    return segments
+
+
+def get_quadratic_reading_orders(pdf_images_list: list[PdfImages], predicted_segments: list[PdfSegment]):
+    ordered_segments: list[PdfSegment] = []
+    for pdf_images in pdf_images_list:
+        pdf_name = pdf_images.pdf_features.file_name
+        segments_for_file = [segment for segment in predicted_segments if segment.pdf_name == pdf_name]
+        for page in pdf_images.pdf_features.pages:
+            segments_for_page = [segment for segment in segments_for_file if segment.page_number == page.page_number]
+            ordered_segments.extend(get_quadratic_ordered_segments_for_page(segments_for_page, page))
+    return ordered_segments
+
+
+def get_segments(pdf_features: PdfFeatures) -> list[PdfSegment]:
+    random_generator = random.Random(pdf_features.file_name)
+    segments = []
+    for page in pdf_features.pages:
+        token_index = 0
+        while token_index < len(page.tokens):
+            segment_size = random_generator.randint(1, 6)
+            segment = PdfSegment.from_pdf_tokens(
+                page.tokens[token_index : token_index + segment_size], pdf_features.file_name
+            )
+            segment.segment_type = random_generator.choice(SEGMENT_TYPES)
+            segments.append(segment)
+            token_index += segment_size
+
+        for margin_index in range(4):
+            top = 10 + 150 * margin_index
+            bounding_box = Rectangle.from_coordinates(1, top, 4, top + 20)
+            segments.append(PdfSegment(page.page_number, bounding_box, "", TokenType.PICTURE, pdf_features.file_name))
+            segments.append(PdfSegment(page.page_number, bounding_box, "", TokenType.TABLE, pdf_features.file_name))
+
+    random_generator.shuffle(segments)
+    return segments
+
+
+def serialize(segments: list[PdfSegment]) -> str:
+    return json.dumps(
+        [
+            [s.pdf_name, s.page_number, s.bounding_box.left, s.bounding_box.top, s.bounding_box.right, s.bounding_box.bottom]
+            + [s.segment_type.name, s.text_content]
+            for s in segments
+        ]
+    )
+
+
+class TestReadingOrders(TestCase):
+    def test_reading_orders_match_quadratic_implementation(self):
+        pdf_images_list = []
+        segments = []
+        for pdf_name in GOLDEN_PDFS:
+            pdf_features = PdfFeatures.from_pdf_path(join(ROOT_PATH, "test_pdfs", pdf_name))
+            pdf_features.file_name = pdf_name
+            pdf_images_list.append(PdfImages(pdf_features, []))
+            segments.extend(get_segments(pdf_features))
+
+        expected = serialize(get_quadratic_reading_orders(pdf_images_list, segments))
+        self.assertEqual(expected, serialize(get_reading_orders(pdf_images_list, segments)))
+        self.assertEqual(len(segments), len(json.loads(expected)))
+
+    def test_pages_without_tokens(self):
+        pdf_features = PdfFeatures.from_pdf_path(join(ROOT_PATH, "test_pdfs", "blank.pdf"))
+        pdf_features.file_name = "blank"
+        segments = [
+            PdfSegment(1, Rectangle.from_coordinates(300, 10, 320, 30), "", TokenType.PICTURE, "blank"),
+            PdfSegment(1, Rectangle.from_coordinates(10, 50, 30, 70), "", TokenType.PICTURE, "blank"),
+        ]
+        ordered_segments = get_reading_orders([PdfImages(pdf_features, [])], segments)
+        self.assertEqual([segments[1], segments[0]], ordered_segments)
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from adapters.ml.vgt.resolution_policy import get_resolution_ladder, get_test_size, AUTO_RESOLUTION_LADDER
+
+
+def get_page(tokens_count: int):
+    return SimpleNamespace(tokens=[object()] * tokens_count)
+
+
+class TestResolutionPolicy(TestCase):
+    def test_get_resolution_ladder(self):
+        self.assertEqual([(512, 150), (640, 400)], get_resolution_ladder("640:400, 512:150,"))
+
+    def test_full_and_explicit_resolutions(self):
+        self.assertIsNone(get_test_size(get_page(10), "full"))
+        self.assertEqual(640, get_test_size(get_page(5000), " 640 "))
+        with self.assertRaises(ValueError):
+            get_test_size(get_page(10), "small")
+
+    def test_auto_resolution_grows_with_tokens(self):
+        for test_size, max_tokens in AUTO_RESOLUTION_LADDER:
+            self.assertLessEqual(get_test_size(get_page(max_tokens), "auto"), test_size)
+        self.assertIsNone(get_test_size(get_page(AUTO_RESOLUTION_LADDER[-1][1] + 1), "auto"))
@@ -6,16 +6,28 @@ import sys
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
 from ports.services.ml_model_service import MLModelService
-from adapters.ml.vgt.ditod import VGTTrainer
+from adapters.ml.vgt.ditod import VGTTrainer, DetrInferenceMapper
+from adapters.ml.vgt.VGTBatchScheduler import VGTBatchScheduler
+from adapters.ml.vgt.cpu_inference import get_inference_context, optimize_for_cpu
+from adapters.ml.vgt.get_in_memory_predictions import get_in_memory_predictions
 from adapters.ml.vgt.get_model_configuration import get_model_configuration
-from adapters.ml.vgt.get_most_probable_pdf_segments import get_most_probable_pdf_segments
+from adapters.ml.vgt.get_most_probable_pdf_segments import get_most_probable_pdf_segments, get_vgt_predictions
 from adapters.ml.vgt.get_reading_orders import get_reading_orders
 from adapters.ml.vgt.get_json_annotations import get_annotations
-from adapters.ml.vgt.create_word_grid import create_word_grid, remove_word_grids
+from adapters.ml.vgt.create_word_grid import create_word_grid
 from detectron2.checkpoint import DetectionCheckpointer
 from detectron2.data.datasets import register_coco_instances
-from detectron2.data import DatasetCatalog
-from configuration import JSON_TEST_FILE_PATH, IMAGES_ROOT_PATH
+from detectron2.data import DatasetCatalog, MetadataCatalog
+from domain.Prediction import Prediction
+from domain.RequestWorkspace import RequestWorkspace
+from adapters.infrastructure.lazy_loader import LazyLoader
+from configuration import (
+    VGT_IN_MEMORY_INFERENCE,
+    VGT_BATCH_SIZE,
+    VGT_BATCH_MAX_WAIT_MS,
+    VGT_QUANTIZE_INT8,
+    VGT_BFLOAT16_AUTOCAST,
+)
 
 
 class DevNull:
@@ -75,36 +87,83 @@ def suppress_logs():
             logging.disable(logging.NOTSET)
 
 
-with suppress_logs():
-    configuration = get_model_configuration()
-    model = VGTTrainer.build_model(configuration)
-    DetectionCheckpointer(model, save_dir=configuration.OUTPUT_DIR).resume_or_load(configuration.MODEL.WEIGHTS, resume=True)
+class VGTRuntime:
+    def __init__(self):
+        with suppress_logs():
+            self.configuration = get_model_configuration()
+            self.model = VGTTrainer.build_model(self.configuration)
+            checkpointer = DetectionCheckpointer(self.model, save_dir=self.configuration.OUTPUT_DIR)
+            checkpointer.resume_or_load(self.configuration.MODEL.WEIGHTS, resume=True)
+            self.model.eval()
+            self.inference_mapper = DetrInferenceMapper(self.configuration)
 
+        device = self.configuration.MODEL.DEVICE
+        optimize_for_cpu(self.model, device, VGT_QUANTIZE_INT8, VGT_BFLOAT16_AUTOCAST)
+        self.bfloat16_autocast = VGT_BFLOAT16_AUTOCAST and device == "cpu"
+        self.batch_scheduler = VGTBatchScheduler(self.model, VGT_BATCH_SIZE, VGT_BATCH_MAX_WAIT_MS, self.bfloat16_autocast)
 
-class VGTModelAdapter(MLModelService):
 
-    def _register_data(self) -> None:
-        try:
-            DatasetCatalog.remove("predict_data")
-        except KeyError:
-            pass
+vgt_runtime_loader: LazyLoader[VGTRuntime] = LazyLoader("VGT model", VGTRuntime)
+
 
-        register_coco_instances("predict_data", {}, JSON_TEST_FILE_PATH, IMAGES_ROOT_PATH)
+class VGTModelAdapter(MLModelService):
 
-    def predict_document_layout(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
-        create_word_grid([pdf_images_obj.pdf_features for pdf_images_obj in pdf_images])
-        get_annotations(pdf_images)
+    def _get_runtime(self) -> VGTRuntime:
+        return vgt_runtime_loader.get()
+
+    def load(self):
+        self._get_runtime()
+
+    @staticmethod
+    def _get_workspace_configuration(configuration, workspace: RequestWorkspace):
+        workspace_configuration = configuration.clone()
+        workspace_configuration.defrost()
+        workspace_configuration.DATASETS.TEST = (workspace.dataset_name,)
+        workspace_configuration.OUTPUT_DIR = str(workspace.model_output_path)
+        workspace_configuration.freeze()
+        return workspace_configuration
+
+    @staticmethod
+    def _register_data(workspace: RequestWorkspace) -> None:
+        register_coco_instances(workspace.dataset_name, {}, str(workspace.json_test_file_path), str(workspace.images_path))
+
+    @staticmethod
+    def _unregister_data(workspace: RequestWorkspace) -> None:
+        DatasetCatalog.remove(workspace.dataset_name)
+        MetadataCatalog.remove(workspace.dataset_name)
+
+    def _get_predictions_from_disk(
+        self, pdf_images: list[PdfImages], workspace: RequestWorkspace
+    ) -> dict[str, list[Prediction]]:
+        for pdf_images_obj in pdf_images:
+            pdf_images_obj.save_images(workspace)
+        create_word_grid([pdf_images_obj.pdf_features for pdf_images_obj in pdf_images], workspace)
+        get_annotations(pdf_images, workspace)
+
+        self._register_data(workspace)
+        try:
+            runtime = self._get_runtime()
+            with suppress_logs(), get_inference_context(runtime.bfloat16_autocast):
+                VGTTrainer.test(self._get_workspace_configuration(runtime.configuration, workspace), runtime.model)
+        finally:
+            self._unregister_data(workspace)
 
-        self._register_data()
-        with suppress_logs():
-            VGTTrainer.test(configuration, model)
+        return get_vgt_predictions(workspace)
 
-        predicted_segments = get_most_probable_pdf_segments("doclaynet", pdf_images, False)
+    def predict_document_layout(
+        self, pdf_images: list[PdfImages], workspace: RequestWorkspace, resolution: str = ""
+    ) -> list[PdfSegment]:
+        if VGT_IN_MEMORY_INFERENCE:
+            runtime = self._get_runtime()
+            vgt_predictions_dict = get_in_memory_predictions(
+                runtime.batch_scheduler, runtime.inference_mapper, pdf_images, resolution
+            )
+        else:
+            vgt_predictions_dict = self._get_predictions_from_disk(pdf_images, workspace)
 
-        PdfImages.remove_images()
-        remove_word_grids()
+        predicted_segments = get_most_probable_pdf_segments(workspace, pdf_images, False, vgt_predictions_dict)
 
         return get_reading_orders(pdf_images, predicted_segments)
 
-    def predict_layout_fast(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
+    def predict_layout_fast(self, pdf_images: list[PdfImages], workspace: RequestWorkspace) -> list[PdfSegment]:
         raise NotImplementedError("Fast prediction should be handled by FastTrainerAdapter")
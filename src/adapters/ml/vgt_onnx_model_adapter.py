@@ -0,0 +1,16 @@
+from threading import Lock
+
+from adapters.ml.vgt.onnx_backbone import OnnxBackbone, load_onnx_sessions
+from adapters.ml.vgt_model_adapter import VGTModelAdapter, VGTRuntime
+from configuration import VGT_ONNX_PATH
+
+
+class VGTOnnxModelAdapter(VGTModelAdapter):
+    backbone_lock = Lock()
+
+    def _get_runtime(self) -> VGTRuntime:
+        runtime = super()._get_runtime()
+        with self.backbone_lock:
+            if not isinstance(runtime.model.backbone, OnnxBackbone):
+                runtime.model.backbone = OnnxBackbone(runtime.model.backbone, load_onnx_sessions(VGT_ONNX_PATH))
+        return runtime
@@ -0,0 +1,213 @@
+import json
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+from configuration import JOB_MAX_ATTEMPTS, JOBS_PATH
+from domain.Job import Job
+from domain.JobStatus import JobStatus
+from ports.repositories.job_repository import JobRepository
+
+JOB_COLUMNS = [
+    "id",
+    "endpoint",
+    "status",
+    "parameters",
+    "filename",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "attempts",
+    "worker",
+    "error",
+    "result_media_type",
+]
+
+CREATE_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    filename TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT NOT NULL DEFAULT '',
+    error TEXT NOT NULL DEFAULT '',
+    result_media_type TEXT NOT NULL DEFAULT ''
+)
+"""
+
+CREATE_JOBS_INDEX = "CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at)"
+
+
+class SqliteJobRepository(JobRepository):
+    def __init__(self, jobs_path: Path = JOBS_PATH, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.jobs_path = jobs_path
+        self.max_attempts = max_attempts
+        self.database_path = Path(jobs_path, "jobs.sqlite3")
+        self.jobs_path.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(CREATE_JOBS_TABLE)
+            connection.execute(CREATE_JOBS_INDEX)
+
+    def create_job(self, endpoint: str, parameters: dict, pdf_content: bytes, filename: str = "") -> Job:
+        job = Job(
+            id=uuid.uuid4().hex,
+            endpoint=endpoint,
+            status=JobStatus.QUEUED,
+            parameters=parameters,
+            filename=filename,
+            created_at=time.time(),
+        )
+        self._get_job_path(job.id).mkdir(parents=True, exist_ok=True)
+        self._get_input_path(job.id).write_bytes(pdf_content)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, endpoint, status, parameters, filename, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.endpoint, job.status.value, json.dumps(parameters), filename, job.created_at),
+            )
+        return job
+
+    def get_job(self, job_id: str) -> Job | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._get_job_from_row(row) if row else None
+
+    def claim_next_job(self, worker: str, concurrency_limits: dict[str, int]) -> Job | None:
+        with self._transaction() as connection:
+            running_by_endpoint = dict(
+                connection.execute(
+                    "SELECT endpoint, COUNT(*) FROM jobs WHERE status = ? GROUP BY endpoint", (JobStatus.RUNNING,)
+                )
+            )
+            full_endpoints = [
+                endpoint for endpoint, limit in concurrency_limits.items() if running_by_endpoint.get(endpoint, 0) >= limit
+            ]
+            placeholders = ", ".join("?" for _ in full_endpoints)
+            row = connection.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE status = ? AND endpoint NOT IN ({placeholders}) "
+                "ORDER BY created_at LIMIT 1",
+                (JobStatus.QUEUED, *full_endpoints),
+            ).fetchone()
+            if not row:
+                return None
+
+            job = self._get_job_from_row(row)
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            job.attempts += 1
+            job.worker = worker
+            connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = ?, worker = ? WHERE id = ?",
+                (job.status.value, job.started_at, job.attempts, worker, job.id),
+            )
+        return job
+
+    def get_input(self, job_id: str) -> bytes:
+        return self._get_input_path(job_id).read_bytes()
+
+    def finish_job(self, job_id: str, result: bytes, media_type: str) -> None:
+        result_path = self._get_result_path(job_id)
+        temporary_path = result_path.with_suffix(".tmp")
+        temporary_path.write_bytes(result)
+        temporary_path.replace(result_path)
+        self._get_input_path(job_id).unlink(missing_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result_media_type = ? WHERE id = ?",
+                (JobStatus.FINISHED, time.time(), media_type, job_id),
+            )
+
+    def fail_job(self, job_id: str, error: str) -> None:
+        self._get_input_path(job_id).unlink(missing_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                (JobStatus.FAILED, time.time(), error, job_id),
+            )
+
+    def get_result(self, job_id: str) -> tuple[bytes, str]:
+        job = self.get_job(job_id)
+        if not job or job.status != JobStatus.FINISHED:
+            raise FileNotFoundError(f"No result for job {job_id}")
+        return self._get_result_path(job_id).read_bytes(), job.result_media_type
+
+    def requeue_running_jobs(self, worker: str = "") -> int:
+        condition, parameters = "status = ?", (JobStatus.RUNNING,)
+        if worker:
+            condition += " AND worker = ?"
+            parameters += (worker,)
+        with self._transaction() as connection:
+            failed_job_ids = [
+                job_id
+                for job_id, in connection.execute(
+                    f"SELECT id FROM jobs WHERE {condition} AND attempts >= ?", (*parameters, self.max_attempts)
+                )
+            ]
+            connection.executemany(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = 'Job worker crashed ' || attempts || ' times' "
+                "WHERE id = ?",
+                [(JobStatus.FAILED, time.time(), job_id) for job_id in failed_job_ids],
+            )
+            requeued_jobs = connection.execute(
+                f"UPDATE jobs SET status = ?, started_at = NULL, worker = '' WHERE {condition}",
+                (JobStatus.QUEUED, *parameters),
+            ).rowcount
+        for job_id in failed_job_ids:
+            self._get_input_path(job_id).unlink(missing_ok=True)
+        return requeued_jobs
+
+    def delete_jobs_finished_before(self, timestamp: float) -> int:
+        with self._transaction() as connection:
+            job_ids = [job_id for job_id, in connection.execute("SELECT id FROM jobs WHERE finished_at < ?", (timestamp,))]
+            connection.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+        for job_id in job_ids:
+            shutil.rmtree(self._get_job_path(job_id), ignore_errors=True)
+        return len(job_ids)
+
+    def get_status_counts(self) -> dict[str, dict[str, int]]:
+        status_counts: dict[str, dict[str, int]] = dict()
+        with closing(self._connect()) as connection:
+            for endpoint, status, count in connection.execute(
+                "SELECT endpoint, status, COUNT(*) FROM jobs GROUP BY endpoint, status"
+            ):
+                status_counts.setdefault(endpoint, dict())[status] = count
+        return status_counts
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _get_job_path(self, job_id: str) -> Path:
+        return Path(self.jobs_path, job_id)
+
+    def _get_input_path(self, job_id: str) -> Path:
+        return Path(self._get_job_path(job_id), "input.pdf")
+
+    def _get_result_path(self, job_id: str) -> Path:
+        return Path(self._get_job_path(job_id), "result")
+
+    @staticmethod
+    def _get_job_from_row(row: tuple) -> Job:
+        job_values = dict(zip(JOB_COLUMNS, row))
+        job_values["parameters"] = json.loads(job_values["parameters"])
+        return Job(**job_values)
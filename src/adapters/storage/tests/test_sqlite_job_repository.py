@@ -0,0 +1,91 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from adapters.storage.sqlite_job_repository import SqliteJobRepository
+from domain.JobStatus import JobStatus
+
+
+class TestSqliteJobRepository(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.jobs_path = Path(self.temporary_directory.name)
+        self.job_repository = SqliteJobRepository(self.jobs_path)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_jobs_are_claimed_in_submission_order(self):
+        first_job = self.job_repository.create_job("analyze", {"fast": True}, b"first")
+        second_job = self.job_repository.create_job("analyze", {"fast": False}, b"second")
+
+        claimed_job = self.job_repository.claim_next_job("worker", dict())
+
+        self.assertEqual(first_job.id, claimed_job.id)
+        self.assertEqual(JobStatus.RUNNING, claimed_job.status)
+        self.assertEqual(1, claimed_job.attempts)
+        self.assertEqual({"fast": True}, claimed_job.parameters)
+        self.assertEqual(b"first", self.job_repository.get_input(first_job.id))
+        self.assertEqual(second_job.id, self.job_repository.claim_next_job("worker", dict()).id)
+        self.assertIsNone(self.job_repository.claim_next_job("worker", dict()))
+
+    def test_concurrency_limits_by_endpoint(self):
+        self.job_repository.create_job("ocr", dict(), b"")
+        self.job_repository.create_job("ocr", dict(), b"")
+        analyze_job = self.job_repository.create_job("analyze", dict(), b"")
+
+        self.assertEqual("ocr", self.job_repository.claim_next_job("worker", {"ocr": 1}).endpoint)
+        self.assertEqual(analyze_job.id, self.job_repository.claim_next_job("worker", {"ocr": 1}).id)
+        self.assertIsNone(self.job_repository.claim_next_job("worker", {"ocr": 1}))
+
+    def test_finished_and_failed_jobs(self):
+        finished_job = self.job_repository.create_job("markdown", dict(), b"pdf")
+        failed_job = self.job_repository.create_job("html", dict(), b"pdf")
+
+        self.job_repository.finish_job(finished_job.id, b"# Title", "text/markdown; charset=utf-8")
+        self.job_repository.fail_job(failed_job.id, "Error")
+
+        self.assertEqual(JobStatus.FINISHED, self.job_repository.get_job(finished_job.id).status)
+        self.assertEqual((b"# Title", "text/markdown; charset=utf-8"), self.job_repository.get_result(finished_job.id))
+        self.assertEqual("Error", self.job_repository.get_job(failed_job.id).error)
+        with self.assertRaises(FileNotFoundError):
+            self.job_repository.get_result(failed_job.id)
+        self.assertEqual({"markdown": {"finished": 1}, "html": {"failed": 1}}, self.job_repository.get_status_counts())
+
+    def test_running_jobs_survive_restarts(self):
+        job = self.job_repository.create_job("toc", dict(), b"pdf")
+        self.job_repository.claim_next_job("first_worker", dict())
+
+        restarted_job_repository = SqliteJobRepository(self.jobs_path)
+        self.assertEqual(0, restarted_job_repository.requeue_running_jobs("second_worker"))
+        self.assertEqual(1, restarted_job_repository.requeue_running_jobs())
+
+        requeued_job = restarted_job_repository.claim_next_job("second_worker", dict())
+        self.assertEqual(job.id, requeued_job.id)
+        self.assertEqual(2, requeued_job.attempts)
+
+    def test_jobs_fail_after_max_attempts(self):
+        job_repository = SqliteJobRepository(self.jobs_path, max_attempts=2)
+        job = job_repository.create_job("analyze", dict(), b"pdf")
+
+        job_repository.claim_next_job("worker", dict())
+        self.assertEqual(1, job_repository.requeue_running_jobs("worker"))
+        job_repository.claim_next_job("worker", dict())
+        self.assertEqual(0, job_repository.requeue_running_jobs("worker"))
+
+        failed_job = job_repository.get_job(job.id)
+        self.assertEqual(JobStatus.FAILED, failed_job.status)
+        self.assertEqual("Job worker crashed 2 times", failed_job.error)
+        self.assertTrue(failed_job.is_done())
+        self.assertFalse(Path(self.jobs_path, job.id, "input.pdf").exists())
+        self.assertIsNone(job_repository.claim_next_job("worker", dict()))
+
+    def test_delete_old_jobs(self):
+        job = self.job_repository.create_job("analyze", dict(), b"pdf")
+        self.job_repository.finish_job(job.id, b"[]", "application/json")
+
+        self.assertEqual(0, self.job_repository.delete_jobs_finished_before(time.time() - 60))
+        self.assertEqual(1, self.job_repository.delete_jobs_finished_before(time.time() + 60))
+        self.assertIsNone(self.job_repository.get_job(job.id))
+        self.assertFalse(Path(self.jobs_path, job.id).exists())
@@ -1,8 +1,15 @@
+import asyncio
+import io
+import itertools
+import json
 import sys
 import subprocess
+import time
+import zipfile
+from pathlib import Path
 from fastapi import UploadFile, File, Form
-from typing import Optional, Union
-from starlette.responses import Response
+from typing import Iterator, Optional, Union
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.concurrency import run_in_threadpool
 from use_cases.pdf_analysis.analyze_pdf_use_case import AnalyzePDFUseCase
 from use_cases.text_extraction.extract_text_use_case import ExtractTextUseCase
@@ -11,7 +18,85 @@ from use_cases.visualization.create_visualization_use_case import CreateVisualiz
 from use_cases.ocr.process_ocr_use_case import ProcessOCRUseCase
 from use_cases.markdown_conversion.convert_to_markdown_use_case import ConvertToMarkdownUseCase
 from use_cases.html_conversion.convert_to_html_use_case import ConvertToHtmlUseCase
+from use_cases.jobs.submit_job_use_case import SubmitJobUseCase
 from adapters.storage.file_system_repository import FileSystemRepository
+from ports.repositories.job_repository import JobRepository
+from domain.JobStatus import JobStatus
+from domain.InvalidParameterError import InvalidParameterError
+from configuration import (
+    BATCH_MAX_DOCUMENT_MB,
+    BATCH_MAX_DOCUMENTS,
+    JOB_MAX_WAIT_SECONDS,
+    JOB_POLL_INTERVAL_MS,
+    service_logger,
+)
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+BATCH_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "zip": "application/zip"}
+
+
+def get_stream_lines(pages: Iterator[tuple[int, list[dict]]], stream_format: str):
+    try:
+        for page_number, segment_boxes in pages:
+            page_result = json.dumps({"page_number": page_number, "segments": segment_boxes})
+            yield f"event: page\ndata: {page_result}\n\n" if stream_format == "sse" else page_result + "\n"
+    except Exception as error:
+        service_logger.error("Streaming analysis failed", exc_info=1)
+        error_result = json.dumps({"error": str(error) or type(error).__name__})
+        yield f"event: error\ndata: {error_result}\n\n" if stream_format == "sse" else error_result + "\n"
+        return
+    if stream_format == "sse":
+        yield "event: end\ndata: {}\n\n"
+
+
+def check_batch_document(documents: list[tuple[str, bytes]], filename: str, size: int):
+    if len(documents) >= BATCH_MAX_DOCUMENTS:
+        raise InvalidParameterError(f"A batch can contain at most {BATCH_MAX_DOCUMENTS} documents")
+    if size > BATCH_MAX_DOCUMENT_MB * 1024 * 1024:
+        raise InvalidParameterError(f"{filename} is larger than {BATCH_MAX_DOCUMENT_MB} MB")
+
+
+def get_batch_documents(files: list[UploadFile]) -> list[tuple[str, bytes]]:
+    documents = []
+    for file in files:
+        content = file.file.read()
+        if not content.startswith(b"PK\x03\x04"):
+            filename = file.filename or f"document_{len(documents)}.pdf"
+            check_batch_document(documents, filename, len(content))
+            documents.append((filename, content))
+            continue
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.lower().endswith(".pdf"):
+                    check_batch_document(documents, member.filename, member.file_size)
+                    documents.append((member.filename, archive.read(member)))
+    return documents
+
+
+def get_batch_result(index: int, filename: str, result: list[dict] | Exception) -> dict:
+    if isinstance(result, Exception):
+        return {"index": index, "filename": filename, "error": str(result) or type(result).__name__}
+    return {"index": index, "filename": filename, "segments": result}
+
+
+def get_batch_lines(filenames: list[str], results: Iterator[tuple[int, list[dict] | Exception]]):
+    for index, result in results:
+        yield json.dumps(get_batch_result(index, filenames[index], result)) + "\n"
+
+
+def get_batch_archive(filenames: list[str], results: Iterator[tuple[int, list[dict] | Exception]]) -> bytes:
+    errors = dict()
+    archive_content = io.BytesIO()
+    with zipfile.ZipFile(archive_content, "w", zipfile.ZIP_DEFLATED) as archive:
+        for index, result in results:
+            result_name = f"{index:04d}_{Path(filenames[index]).stem}.json"
+            if isinstance(result, Exception):
+                errors[result_name] = get_batch_result(index, filenames[index], result)
+            else:
+                archive.writestr(result_name, json.dumps(result))
+        archive.writestr("errors.json", json.dumps(errors))
+    return archive_content.getvalue()
 
 
 class FastAPIControllers:
@@ -24,7 +109,9 @@ class FastAPIControllers:
         process_ocr_use_case: ProcessOCRUseCase,
         convert_to_markdown_use_case: ConvertToMarkdownUseCase,
         convert_to_html_use_case: ConvertToHtmlUseCase,
+        submit_job_use_case: SubmitJobUseCase,
         file_repository: FileSystemRepository,
+        job_repository: JobRepository,
     ):
         self.analyze_pdf_use_case = analyze_pdf_use_case
         self.extract_text_use_case = extract_text_use_case
@@ -33,7 +120,9 @@ class FastAPIControllers:
         self.process_ocr_use_case = process_ocr_use_case
         self.convert_to_markdown_use_case = convert_to_markdown_use_case
         self.convert_to_html_use_case = convert_to_html_use_case
+        self.submit_job_use_case = submit_job_use_case
         self.file_repository = file_repository
+        self.job_repository = job_repository
 
     async def root(self):
         import torch
@@ -52,12 +141,82 @@ class FastAPIControllers:
         raise FileNotFoundError("This is a test error from the error endpoint")
 
     async def analyze_pdf(
-        self, file: UploadFile = File(...), fast: bool = Form(False), parse_tables_and_math: bool = Form(False)
+        self,
+        file: UploadFile = File(...),
+        fast: bool = Form(False),
+        parse_tables_and_math: bool = Form(False),
+        resolution: str = Form(""),
     ):
         return await run_in_threadpool(
-            self.analyze_pdf_use_case.execute, file.file.read(), "", parse_tables_and_math, fast, False
+            self.analyze_pdf_use_case.execute, file.file.read(), "", parse_tables_and_math, fast, False, resolution
         )
 
+    async def analyze_pdf_stream(
+        self,
+        file: UploadFile = File(...),
+        fast: bool = Form(False),
+        parse_tables_and_math: bool = Form(False),
+        resolution: str = Form(""),
+        stream_format: str = Form("ndjson"),
+    ):
+        if stream_format not in STREAM_MEDIA_TYPES:
+            raise InvalidParameterError(f"Unknown stream format: {stream_format}")
+        pages = self.analyze_pdf_use_case.execute_stream(file.file.read(), parse_tables_and_math, fast, resolution)
+        first_page = await run_in_threadpool(next, pages, None)
+        pages = itertools.chain([first_page], pages) if first_page else iter(())
+        return StreamingResponse(get_stream_lines(pages, stream_format), media_type=STREAM_MEDIA_TYPES[stream_format])
+
+    async def analyze_pdf_batch(
+        self,
+        files: list[UploadFile] = File(...),
+        fast: bool = Form(False),
+        parse_tables_and_math: bool = Form(False),
+        resolution: str = Form(""),
+        output_format: str = Form("ndjson"),
+    ):
+        if output_format not in BATCH_MEDIA_TYPES:
+            raise InvalidParameterError(f"Unknown batch output format: {output_format}")
+        documents = await run_in_threadpool(get_batch_documents, files)
+        filenames = [filename for filename, _ in documents]
+        results = self.analyze_pdf_use_case.execute_batch(
+            [content for _, content in documents], parse_tables_and_math, fast, resolution
+        )
+        if output_format == "ndjson":
+            return StreamingResponse(get_batch_lines(filenames, results), media_type=BATCH_MEDIA_TYPES[output_format])
+
+        archive = await run_in_threadpool(get_batch_archive, filenames, results)
+        headers = {"Content-Disposition": 'attachment; filename="batch_results.zip"'}
+        return Response(archive, media_type=BATCH_MEDIA_TYPES[output_format], headers=headers)
+
+    async def submit_job(self, endpoint: str, file: UploadFile = File(...), parameters: str = Form("{}")):
+        job = await run_in_threadpool(
+            self.submit_job_use_case.execute, endpoint, file.file.read(), file.filename or "", parameters
+        )
+        return JSONResponse(job.to_dict(), status_code=202)
+
+    async def get_job(self, job_id: str, wait: int = 0):
+        deadline = time.monotonic() + min(max(wait, 0), JOB_MAX_WAIT_SECONDS)
+        job = await run_in_threadpool(self.job_repository.get_job, job_id)
+        while job and not job.is_done() and time.monotonic() < deadline:
+            await asyncio.sleep(JOB_POLL_INTERVAL_MS / 1000)
+            job = await run_in_threadpool(self.job_repository.get_job, job_id)
+
+        if not job:
+            return JSONResponse({"detail": f"No job {job_id}"}, status_code=404)
+        return job.to_dict()
+
+    async def get_job_result(self, job_id: str):
+        job = await run_in_threadpool(self.job_repository.get_job, job_id)
+        if not job:
+            return JSONResponse({"detail": f"No job {job_id}"}, status_code=404)
+        if not job.is_done():
+            return JSONResponse({"detail": f"Job {job_id} is {job.status}"}, status_code=409)
+        if job.status == JobStatus.FAILED:
+            return JSONResponse({"detail": job.error}, status_code=422)
+
+        content, media_type = await run_in_threadpool(self.job_repository.get_result, job_id)
+        return Response(content, media_type=media_type)
+
     async def analyze_and_save_xml(
         self, file: UploadFile = File(...), xml_file_name: str | None = None, fast: bool = Form(False)
     ):
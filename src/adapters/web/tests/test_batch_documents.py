@@ -0,0 +1,46 @@
+import io
+import zipfile
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from adapters.web.fastapi_controllers import get_batch_documents
+from domain.InvalidParameterError import InvalidParameterError
+
+
+def get_upload_file(filename: str, content: bytes):
+    return SimpleNamespace(filename=filename, file=io.BytesIO(content))
+
+
+def get_zip_content(documents: dict[str, bytes]) -> bytes:
+    zip_content = io.BytesIO()
+    with zipfile.ZipFile(zip_content, "w", zipfile.ZIP_DEFLATED) as archive:
+        for filename, content in documents.items():
+            archive.writestr(filename, content)
+    return zip_content.getvalue()
+
+
+class TestBatchDocuments(TestCase):
+    def test_pdfs_and_zip_archives(self):
+        zip_content = get_zip_content({"b.pdf": b"%PDF b", "notes.txt": b"", "folder/c.PDF": b"%PDF c"})
+
+        documents = get_batch_documents([get_upload_file("a.pdf", b"%PDF a"), get_upload_file("pdfs.zip", zip_content)])
+
+        self.assertEqual([("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF b"), ("folder/c.PDF", b"%PDF c")], documents)
+
+    @patch("adapters.web.fastapi_controllers.BATCH_MAX_DOCUMENTS", 2)
+    def test_too_many_documents(self):
+        zip_content = get_zip_content({"b.pdf": b"%PDF b", "c.pdf": b"%PDF c"})
+
+        with self.assertRaises(InvalidParameterError):
+            get_batch_documents([get_upload_file("a.pdf", b"%PDF a"), get_upload_file("pdfs.zip", zip_content)])
+
+    @patch("adapters.web.fastapi_controllers.BATCH_MAX_DOCUMENT_MB", 1)
+    def test_too_large_documents(self):
+        zip_content = get_zip_content({"bomb.pdf": b"\0" * (1024 * 1024 + 1)})
+
+        self.assertLess(len(zip_content), 1024 * 1024)
+        with self.assertRaises(InvalidParameterError):
+            get_batch_documents([get_upload_file("pdfs.zip", zip_content)])
+        with self.assertRaises(InvalidParameterError):
+            get_batch_documents([get_upload_file("a.pdf", b"%PDF" + b"\0" * 1024 * 1024)])
@@ -0,0 +1,35 @@
+import json
+from unittest import TestCase
+
+from adapters.web.fastapi_controllers import get_stream_lines
+
+
+def get_pages(fail_after: int = -1):
+    for page_number in range(1, 4):
+        if page_number == fail_after:
+            raise RuntimeError("Window failed")
+        yield page_number, [{"page_number": page_number}]
+
+
+class TestStreamLines(TestCase):
+    def test_ndjson_lines(self):
+        lines = list(get_stream_lines(get_pages(), "ndjson"))
+
+        self.assertEqual([1, 2, 3], [json.loads(line)["page_number"] for line in lines])
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+
+    def test_sse_events(self):
+        lines = list(get_stream_lines(get_pages(), "sse"))
+
+        self.assertEqual('event: page\ndata: {"page_number": 1, "segments": [{"page_number": 1}]}\n\n', lines[0])
+        self.assertEqual("event: end\ndata: {}\n\n", lines[-1])
+        self.assertEqual(4, len(lines))
+
+    def test_failure_after_the_first_page(self):
+        ndjson_lines = list(get_stream_lines(get_pages(fail_after=3), "ndjson"))
+        sse_lines = list(get_stream_lines(get_pages(fail_after=3), "sse"))
+
+        self.assertEqual({"error": "Window failed"}, json.loads(ndjson_lines[-1]))
+        self.assertEqual(3, len(ndjson_lines))
+        self.assertEqual('event: error\ndata: {"error": "Window failed"}\n\n', sse_lines[-1])
+        self.assertNotIn("event: end\ndata: {}\n\n", sse_lines)
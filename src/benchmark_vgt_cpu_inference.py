@@ -0,0 +1,123 @@
+import copy
+import time
+from pathlib import Path
+
+from detectron2.checkpoint import DetectionCheckpointer
+from pdf_features import Rectangle
+
+from adapters.infrastructure.pdf_rasterizer import pdf_rasterizer
+from adapters.ml.vgt.VGTBatchScheduler import VGTBatchScheduler
+from adapters.ml.vgt.cpu_inference import quantize_linear_layers
+from adapters.ml.vgt.ditod import VGTTrainer, DetrInferenceMapper
+from adapters.ml.vgt.get_in_memory_predictions import get_in_memory_predictions
+from adapters.ml.vgt.get_model_configuration import get_model_configuration
+from adapters.ml.vgt.get_most_probable_pdf_segments import get_most_probable_pdf_segments
+from configuration import ROOT_PATH, VGT_BATCH_SIZE, service_logger
+from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
+
+TEST_PDFS_PATH = Path(ROOT_PATH, "test_pdfs")
+INFERENCE_MODES = {"fp32": (False, False), "int8": (True, False), "bf16": (False, True), "int8+bf16": (True, True)}
+MINIMUM_IOU = 0.5
+
+
+def get_iou(rectangle_1: Rectangle, rectangle_2: Rectangle) -> float:
+    width = min(rectangle_1.right, rectangle_2.right) - max(rectangle_1.left, rectangle_2.left)
+    height = min(rectangle_1.bottom, rectangle_2.bottom) - max(rectangle_1.top, rectangle_2.top)
+    if width <= 0 or height <= 0:
+        return 0
+    intersection = width * height
+    union = rectangle_1.width * rectangle_1.height + rectangle_2.width * rectangle_2.height - intersection
+    return intersection / union
+
+
+def get_agreement(baseline_segments: list[PdfSegment], segments: list[PdfSegment]) -> float:
+    if not baseline_segments and not segments:
+        return 1
+    unmatched_segments = list(segments)
+    matches = 0
+    for baseline_segment in baseline_segments:
+        for segment in unmatched_segments:
+            if segment.page_number != baseline_segment.page_number:
+                continue
+            if segment.segment_type != baseline_segment.segment_type:
+                continue
+            if get_iou(segment.bounding_box, baseline_segment.bounding_box) >= MINIMUM_IOU:
+                unmatched_segments.remove(segment)
+                matches += 1
+                break
+    return 2 * matches / (len(baseline_segments) + len(segments))
+
+
+def load_benchmark_pdfs(pdfs_path: Path = TEST_PDFS_PATH) -> list[PdfImages]:
+    pdf_images_list = []
+    for pdf_path in sorted(pdfs_path.glob("*.pdf")):
+        try:
+            pdf_images_list.append(PdfImages.from_pdf_path(pdf_path, pdf_rasterizer))
+        except Exception as exception:
+            service_logger.info(f"Skipping {pdf_path.name}: {exception}")
+    return pdf_images_list
+
+
+def predict(
+    batch_scheduler: VGTBatchScheduler, inference_mapper: DetrInferenceMapper, pdf_images: PdfImages, resolution: str = ""
+):
+    start = time.perf_counter()
+    vgt_predictions_dict = get_in_memory_predictions(batch_scheduler, inference_mapper, [pdf_images], resolution)
+    seconds = time.perf_counter() - start
+    with RequestWorkspace() as workspace:
+        segments = get_most_probable_pdf_segments(workspace, [pdf_images], False, vgt_predictions_dict)
+    return seconds, segments
+
+
+def load_cpu_model():
+    configuration = get_model_configuration()
+    if configuration.MODEL.DEVICE != "cpu":
+        service_logger.info("A GPU is available, measuring CPU inference only")
+        configuration.defrost()
+        configuration.MODEL.DEVICE = "cpu"
+        configuration.freeze()
+
+    model = VGTTrainer.build_model(configuration)
+    DetectionCheckpointer(model).load(configuration.MODEL.WEIGHTS)
+    model.eval()
+    return configuration, model
+
+
+def benchmark():
+    configuration, baseline_model = load_cpu_model()
+    inference_mapper = DetrInferenceMapper(configuration)
+    pdf_images_list = load_benchmark_pdfs()
+    pages_count = sum(len(pdf_images.pdf_images) for pdf_images in pdf_images_list)
+
+    baseline_segments_by_pdf: dict[str, list[PdfSegment]] = dict()
+    baseline_seconds = 0.0
+    results = []
+    for mode, (quantize_int8, bfloat16_autocast) in INFERENCE_MODES.items():
+        model = quantize_linear_layers(copy.deepcopy(baseline_model)) if quantize_int8 else baseline_model
+        batch_scheduler = VGTBatchScheduler(model, VGT_BATCH_SIZE, 0, bfloat16_autocast)
+        predict(batch_scheduler, inference_mapper, pdf_images_list[0])
+
+        total_seconds = 0.0
+        agreements = []
+        for pdf_images in pdf_images_list:
+            seconds, segments = predict(batch_scheduler, inference_mapper, pdf_images)
+            total_seconds += seconds
+            pdf_name = pdf_images.pdf_features.file_name
+            baseline_segments_by_pdf.setdefault(pdf_name, segments)
+            agreements.append(get_agreement(baseline_segments_by_pdf[pdf_name], segments))
+
+        baseline_seconds = baseline_seconds or total_seconds
+        results.append((mode, total_seconds, sum(agreements) / len(agreements)))
+
+    print(f"{len(pdf_images_list)} PDFs, {pages_count} pages from {TEST_PDFS_PATH}")
+    print(f"{'mode':<10} {'seconds':>8} {'ms/page':>8} {'speedup':>8} {'agreement':>10}")
+    for mode, total_seconds, agreement in results:
+        milliseconds_per_page = 1000 * total_seconds / pages_count
+        speedup = baseline_seconds / total_seconds
+        print(f"{mode:<10} {total_seconds:>8.2f} {milliseconds_per_page:>8.0f} {speedup:>7.2f}x {agreement:>10.1%}")
+
+
+if __name__ == "__main__":
+    benchmark()
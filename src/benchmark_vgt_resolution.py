@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+from adapters.ml.vgt.VGTBatchScheduler import VGTBatchScheduler
+from adapters.ml.vgt.ditod import DetrInferenceMapper
+from adapters.ml.vgt.resolution_policy import AUTO_RESOLUTION_LADDER, get_test_size
+from benchmark_vgt_cpu_inference import TEST_PDFS_PATH, get_agreement, load_benchmark_pdfs, load_cpu_model, predict
+from configuration import VGT_BATCH_SIZE
+from domain.PdfSegment import PdfSegment
+
+SWEPT_TEST_SIZES = [384, 448, 512, 576, 640, 720]
+
+
+def get_resolutions(full_test_size: int) -> list[str]:
+    test_sizes = set(SWEPT_TEST_SIZES) | {test_size for test_size, _ in AUTO_RESOLUTION_LADDER}
+    return (
+        ["full"]
+        + [str(test_size) for test_size in sorted(test_sizes, reverse=True) if test_size < full_test_size]
+        + ["auto"]
+    )
+
+
+def benchmark(pdfs_path: Path):
+    configuration, model = load_cpu_model()
+    inference_mapper = DetrInferenceMapper(configuration)
+    batch_scheduler = VGTBatchScheduler(model, VGT_BATCH_SIZE, 0)
+    pdf_images_list = load_benchmark_pdfs(pdfs_path)
+    pages = [page for pdf_images in pdf_images_list for page in pdf_images.pdf_features.pages]
+    predict(batch_scheduler, inference_mapper, pdf_images_list[0])
+
+    full_segments_by_pdf: dict[str, list[PdfSegment]] = dict()
+    results = []
+    for resolution in get_resolutions(inference_mapper.min_size_test):
+        total_seconds = 0.0
+        agreements = []
+        for pdf_images in pdf_images_list:
+            seconds, segments = predict(batch_scheduler, inference_mapper, pdf_images, resolution)
+            total_seconds += seconds
+            pdf_name = pdf_images.pdf_features.file_name
+            full_segments_by_pdf.setdefault(pdf_name, segments)
+            agreements.append(get_agreement(full_segments_by_pdf[pdf_name], segments))
+        results.append((resolution, total_seconds, sum(agreements) / len(agreements)))
+
+    auto_sizes = [get_test_size(page, "auto") or inference_mapper.min_size_test for page in pages]
+    print(f"{len(pdf_images_list)} PDFs, {len(pages)} pages from {pdfs_path}")
+    print(f"auto policy page sizes: { {size: auto_sizes.count(size) for size in sorted(set(auto_sizes))} }")
+    print(f"{'resolution':<10} {'seconds':>8} {'ms/page':>8} {'speedup':>8} {'agreement':>10}")
+    full_seconds = results[0][1]
+    for resolution, total_seconds, agreement in results:
+        milliseconds_per_page = 1000 * total_seconds / len(pages)
+        speedup = full_seconds / total_seconds
+        print(f"{resolution:<10} {total_seconds:>8.2f} {milliseconds_per_page:>8.0f} {speedup:>7.2f}x {agreement:>10.1%}")
+
+
+if __name__ == "__main__":
+    benchmark(Path(sys.argv[1]) if len(sys.argv) > 1 else TEST_PDFS_PATH)
@@ -10,16 +10,49 @@ logging.root.handlers = []
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlers)
 service_logger = logging.getLogger(__name__)
 
+LITE_MODE = os.environ.get("LITE_MODE", "false").lower().strip() == "true"
 RESTART_IF_NO_GPU = os.environ.get("RESTART_IF_NO_GPU", "false").lower().strip() == "true"
-IMAGES_ROOT_PATH = Path(ROOT_PATH, "images")
-WORD_GRIDS_PATH = Path(ROOT_PATH, "word_grids")
-JSONS_ROOT_PATH = Path(ROOT_PATH, "jsons")
+WARM_UP_ON_STARTUP = os.environ.get("WARM_UP_ON_STARTUP", "true").lower().strip() == "true"
+VGT_IN_MEMORY_INFERENCE = os.environ.get("VGT_IN_MEMORY_INFERENCE", "true").lower().strip() == "true"
+VGT_BATCH_SIZE = int(os.environ.get("VGT_BATCH_SIZE", "4"))
+VGT_BATCH_MAX_WAIT_MS = int(os.environ.get("VGT_BATCH_MAX_WAIT_MS", "20"))
+VGT_BACKEND = os.environ.get("VGT_BACKEND", "pytorch").lower().strip()
+VGT_RESOLUTION = os.environ.get("VGT_RESOLUTION", "full").lower().strip()
+VGT_AUTO_RESOLUTION_LADDER = os.environ.get("VGT_AUTO_RESOLUTION_LADDER", "512:150,640:400")
+VGT_QUANTIZE_INT8 = os.environ.get("VGT_QUANTIZE_INT8", "false").lower().strip() == "true"
+VGT_BFLOAT16_AUTOCAST = os.environ.get("VGT_BFLOAT16_AUTOCAST", "false").lower().strip() == "true"
+FORMULA_BATCH_SIZE = int(os.environ.get("FORMULA_BATCH_SIZE", "8"))
+FORMULA_CACHE_SIZE = int(os.environ.get("FORMULA_CACHE_SIZE", "10000"))
+TABLE_BATCH_SIZE = int(os.environ.get("TABLE_BATCH_SIZE", "4"))
+TABLE_CACHE_SIZE = int(os.environ.get("TABLE_CACHE_SIZE", "2000"))
+FORMAT_CONVERSION_POOL_SIZE = int(os.environ.get("FORMAT_CONVERSION_POOL_SIZE", "2"))
+WORD_PIECES_CACHE_SIZE = int(os.environ.get("WORD_PIECES_CACHE_SIZE", "100000"))
+STREAM_PAGE_WINDOW = int(os.environ.get("STREAM_PAGE_WINDOW", "8"))
+BATCH_DOCUMENTS_PER_PASS = int(os.environ.get("BATCH_DOCUMENTS_PER_PASS", "8"))
+BATCH_MAX_DOCUMENTS = int(os.environ.get("BATCH_MAX_DOCUMENTS", "100"))
+BATCH_MAX_DOCUMENT_MB = int(os.environ.get("BATCH_MAX_DOCUMENT_MB", "100"))
+RASTERIZER_WORKERS = int(os.environ.get("RASTERIZER_WORKERS", str(os.cpu_count() or 1)))
+RASTERIZER_CACHE_MB = int(os.environ.get("RASTERIZER_CACHE_MB", "512"))
+ANALYSIS_CACHE_ENABLED = os.environ.get("ANALYSIS_CACHE_ENABLED", "true").lower().strip() == "true"
+ANALYSIS_CACHE_MEMORY_MB = int(os.environ.get("ANALYSIS_CACHE_MEMORY_MB", "128"))
+ANALYSIS_CACHE_DISK_MB = int(os.environ.get("ANALYSIS_CACHE_DISK_MB", "1024"))
+ANALYSIS_CACHE_VERSION = os.environ.get("ANALYSIS_CACHE_VERSION", "1")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "1"))
+JOB_CONCURRENCY_LIMITS = os.environ.get("JOB_CONCURRENCY_LIMITS", "")
+JOB_POLL_INTERVAL_MS = int(os.environ.get("JOB_POLL_INTERVAL_MS", "500"))
+JOB_MAX_WAIT_SECONDS = int(os.environ.get("JOB_MAX_WAIT_SECONDS", "60"))
+JOB_RETENTION_HOURS = int(os.environ.get("JOB_RETENTION_HOURS", "24"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+WORKSPACES_PATH = Path(ROOT_PATH, "workspaces")
+ANALYSIS_CACHE_PATH = Path(ROOT_PATH, "analysis_cache")
+JOBS_PATH = Path(ROOT_PATH, "jobs")
 OCR_SOURCE = Path(ROOT_PATH, "ocr", "source")
 OCR_OUTPUT = Path(ROOT_PATH, "ocr", "output")
 OCR_FAILED = Path(ROOT_PATH, "ocr", "failed")
-JSON_TEST_FILE_PATH = Path(JSONS_ROOT_PATH, "test.json")
 MODELS_PATH = Path(ROOT_PATH, "models")
+VGT_ONNX_PATH = Path(MODELS_PATH, "vgt_onnx")
 XMLS_PATH = Path(ROOT_PATH, "xmls")
+VGT_CONFIGURATION_PATH = Path(SRC_PATH, "adapters", "ml", "vgt", "model_configuration", "doclaynet_VGT_cascade_PTM.yaml")
 
 DOCLAYNET_TYPE_BY_ID = {
     1: "Caption",
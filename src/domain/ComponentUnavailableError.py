@@ -0,0 +1,2 @@
+class ComponentUnavailableError(RuntimeError):
+    pass
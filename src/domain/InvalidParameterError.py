@@ -0,0 +1,2 @@
+class InvalidParameterError(ValueError):
+    pass
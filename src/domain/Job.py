@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+from domain.JobStatus import JobStatus
+
+
+class Job(BaseModel):
+    id: str
+    endpoint: str
+    status: JobStatus
+    parameters: dict
+    filename: str = ""
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    attempts: int = 0
+    worker: str = ""
+    error: str = ""
+    result_media_type: str = ""
+
+    def is_done(self) -> bool:
+        return self.status in (JobStatus.FINISHED, JobStatus.FAILED)
+
+    def to_dict(self) -> dict:
+        return self.model_dump(exclude={"worker", "result_media_type"}, mode="json")
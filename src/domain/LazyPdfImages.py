@@ -0,0 +1,47 @@
+from collections.abc import Sequence
+from pathlib import Path
+
+from PIL.Image import Image
+from pdf_features import PdfFeatures, Rectangle
+
+from domain.PdfImages import PdfImages
+from ports.services.pdf_rasterizer_service import PdfRasterizerService
+
+
+class LazyPageImages(Sequence):
+    def __init__(self, pdf_path: str | Path, pages_count: int, dpi: int, rasterizer: PdfRasterizerService):
+        self.pdf_path: str | Path = pdf_path
+        self.rasterizer: PdfRasterizerService = rasterizer
+        self.pages_count: int = pages_count
+        self.dpi: int = dpi
+        self.document_hash: str = ""
+        self.rendered_pages: dict[int, Image] = dict()
+
+    def __len__(self) -> int:
+        return self.pages_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[page_index] for page_index in range(*index.indices(self.pages_count))]
+
+        if index < 0:
+            index += self.pages_count
+        if not 0 <= index < self.pages_count:
+            raise IndexError("page index out of range")
+
+        if index not in self.rendered_pages:
+            self.document_hash = (
+                self.document_hash if self.document_hash else self.rasterizer.get_document_hash(self.pdf_path)
+            )
+            self.rendered_pages[index] = self.rasterizer.get_page(self.pdf_path, index + 1, self.dpi, self.document_hash)
+        return self.rendered_pages[index]
+
+
+class LazyPdfImages(PdfImages):
+    def __init__(self, pdf_features: PdfFeatures, pdf_path: str | Path, rasterizer: PdfRasterizerService, dpi: int = 72):
+        super().__init__(pdf_features, LazyPageImages(pdf_path, len(pdf_features.pages), dpi, rasterizer), dpi)
+        self.pdf_path: str | Path = pdf_path
+        self.rasterizer: PdfRasterizerService = rasterizer
+
+    def get_region_image(self, page_number: int, bounding_box: Rectangle) -> Image:
+        return self.rasterizer.get_region(self.pdf_path, page_number, bounding_box, self.dpi)
@@ -0,0 +1,15 @@
+import numpy as np
+from pdf_features import Rectangle
+from shapely import STRtree, box
+
+
+def rectangle_to_box(rectangle: Rectangle):
+    return box(rectangle.left, rectangle.top, rectangle.right, rectangle.bottom)
+
+
+class PageSpatialIndex:
+    def __init__(self, rectangles: list[Rectangle]):
+        self.tree = STRtree([rectangle_to_box(rectangle) for rectangle in rectangles])
+
+    def query(self, rectangle: Rectangle) -> list[int]:
+        return np.sort(self.tree.query(rectangle_to_box(rectangle))).tolist()
@@ -1,5 +1,5 @@
+import copy
 import os
-import shutil
 
 import cv2
 import numpy as np
@@ -7,10 +7,12 @@ from os import makedirs
 from os.path import join
 from pathlib import Path
 from PIL import Image
-from pdf2image import convert_from_path
-from pdf_features import PdfFeatures
+from pdf_features import PdfFeatures, Rectangle
 
-from src.configuration import IMAGES_ROOT_PATH, XMLS_PATH
+from domain.RequestWorkspace import RequestWorkspace
+from ports.services.pdf_rasterizer_service import PdfRasterizerService
+
+from src.configuration import XMLS_PATH
 
 
 class PdfImages:
@@ -18,7 +20,6 @@ class PdfImages:
         self.pdf_features: PdfFeatures = pdf_features
         self.pdf_images: list[Image] = pdf_images
         self.dpi: int = dpi
-        self.save_images()
 
     def show_images(self, next_image_delay: int = 2):
         for image_index, image in enumerate(self.pdf_images):
@@ -27,18 +28,21 @@ class PdfImages:
             cv2.waitKey(next_image_delay * 1000)
             cv2.destroyAllWindows()
 
-    def save_images(self):
-        makedirs(IMAGES_ROOT_PATH, exist_ok=True)
-        for image_index, image in enumerate(self.pdf_images):
-            image_name = f"{self.pdf_features.file_name}_{image_index}.jpg"
-            image.save(join(IMAGES_ROOT_PATH, image_name))
+    def get_region_image(self, page_number: int, bounding_box: Rectangle) -> Image:
+        left = int(bounding_box.left * self.dpi / 72)
+        top = int(bounding_box.top * self.dpi / 72)
+        right = int(bounding_box.right * self.dpi / 72)
+        bottom = int(bounding_box.bottom * self.dpi / 72)
+        return self.pdf_images[page_number - 1].crop((left, top, right, bottom))
 
-    @staticmethod
-    def remove_images():
-        shutil.rmtree(IMAGES_ROOT_PATH)
+    def save_images(self, workspace: RequestWorkspace):
+        makedirs(workspace.images_path, exist_ok=True)
+        for page, image in zip(self.pdf_features.pages, self.pdf_images):
+            image_name = f"{self.pdf_features.file_name}_{page.page_number - 1}.jpg"
+            image.save(join(workspace.images_path, image_name))
 
     @staticmethod
-    def from_pdf_path(pdf_path: str | Path, pdf_name: str = "", xml_file_name: str = "", dpi: int = 72):
+    def get_pdf_features(pdf_path: str | Path, pdf_name: str = "", xml_file_name: str = "") -> PdfFeatures:
         xml_path = None if not xml_file_name else Path(XMLS_PATH, xml_file_name)
 
         if xml_path and not xml_path.parent.exists():
@@ -51,5 +55,23 @@ class PdfImages:
         else:
             pdf_name = Path(pdf_path).parent.name if Path(pdf_path).name == "document.pdf" else Path(pdf_path).stem
             pdf_features.file_name = pdf_name
-        pdf_images = convert_from_path(pdf_path, dpi=dpi)
+        return pdf_features
+
+    @staticmethod
+    def from_pdf_path(
+        pdf_path: str | Path, rasterizer: PdfRasterizerService, pdf_name: str = "", xml_file_name: str = "", dpi: int = 72
+    ):
+        pdf_features: PdfFeatures = PdfImages.get_pdf_features(pdf_path, pdf_name, xml_file_name)
+        pdf_images = rasterizer.get_pages(pdf_path, dpi)
         return PdfImages(pdf_features, pdf_images, dpi)
+
+    @staticmethod
+    def get_page_windows(
+        pdf_path: str | Path, pdf_features: PdfFeatures, window_size: int, rasterizer: PdfRasterizerService, dpi: int = 72
+    ):
+        document_hash = rasterizer.get_document_hash(pdf_path)
+        for window_start in range(0, len(pdf_features.pages), max(1, window_size)):
+            window_features = copy.copy(pdf_features)
+            window_features.pages = pdf_features.pages[window_start : window_start + max(1, window_size)]
+            page_numbers = [page.page_number for page in window_features.pages]
+            yield PdfImages(window_features, rasterizer.get_pages_subset(pdf_path, page_numbers, dpi, document_hash), dpi)
@@ -0,0 +1,26 @@
+import shutil
+import uuid
+from pathlib import Path
+
+from configuration import WORKSPACES_PATH
+
+
+class RequestWorkspace:
+    def __init__(self, workspace_id: str = ""):
+        self.workspace_id: str = workspace_id if workspace_id else uuid.uuid4().hex
+        self.root_path: Path = Path(WORKSPACES_PATH, self.workspace_id)
+        self.images_path: Path = Path(self.root_path, "images")
+        self.word_grids_path: Path = Path(self.root_path, "word_grids")
+        self.jsons_path: Path = Path(self.root_path, "jsons")
+        self.json_test_file_path: Path = Path(self.jsons_path, "test.json")
+        self.model_output_path: Path = Path(self.root_path, "model_output")
+        self.dataset_name: str = f"predict_data_{self.workspace_id}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.remove()
+
+    def remove(self):
+        shutil.rmtree(self.root_path, ignore_errors=True)
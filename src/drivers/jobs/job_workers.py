@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from adapters.storage.sqlite_job_repository import SqliteJobRepository
+from configuration import (
+    JOB_CONCURRENCY_LIMITS,
+    JOB_POLL_INTERVAL_MS,
+    JOB_RETENTION_HOURS,
+    JOB_WORKERS,
+    service_logger,
+)
+
+CLEANUP_INTERVAL_SECONDS = 3600
+
+
+def get_concurrency_limits(limits: str) -> dict[str, int]:
+    concurrency_limits = dict()
+    for limit in limits.split(","):
+        if not limit.strip():
+            continue
+        endpoint, max_running_jobs = limit.split(":")
+        concurrency_limits[endpoint.strip()] = int(max_running_jobs)
+    return concurrency_limits
+
+
+def run_worker(worker_name: str):
+    from drivers.rest.dependency_injection import setup_job_runner
+
+    run_job_use_case = setup_job_runner()
+    job_repository = run_job_use_case.job_repository
+    concurrency_limits = get_concurrency_limits(JOB_CONCURRENCY_LIMITS)
+    service_logger.info(f"Job worker {worker_name} started with concurrency limits {concurrency_limits}")
+    while True:
+        job = job_repository.claim_next_job(worker_name, concurrency_limits)
+        if not job:
+            time.sleep(JOB_POLL_INTERVAL_MS / 1000)
+            continue
+        run_job_use_case.execute(job)
+
+
+class JobWorkers:
+    def __init__(self, workers_count: int = JOB_WORKERS):
+        self.workers_count = workers_count
+        self.job_repository = SqliteJobRepository()
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: dict[str, multiprocessing.Process] = dict()
+        self.last_cleanup: float = 0
+
+    def start_worker(self, worker_name: str):
+        process = self.context.Process(target=run_worker, args=(worker_name,), name=worker_name, daemon=True)
+        process.start()
+        self.processes[worker_name] = process
+
+    def restart_dead_workers(self):
+        for worker_name, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            requeued_jobs = self.job_repository.requeue_running_jobs(worker_name)
+            service_logger.error(
+                f"Job worker {worker_name} exited with code {process.exitcode}, {requeued_jobs} jobs requeued, restarting"
+            )
+            self.start_worker(worker_name)
+
+    def delete_old_jobs(self):
+        if time.time() - self.last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return
+        self.last_cleanup = time.time()
+        deleted_jobs = self.job_repository.delete_jobs_finished_before(self.last_cleanup - JOB_RETENTION_HOURS * 3600)
+        if deleted_jobs:
+            service_logger.info(f"Deleted {deleted_jobs} jobs older than {JOB_RETENTION_HOURS} hours")
+
+    def run(self):
+        requeued_jobs = self.job_repository.requeue_running_jobs()
+        service_logger.info(f"Starting {self.workers_count} job workers, {requeued_jobs} interrupted jobs requeued")
+        for index in range(self.workers_count):
+            self.start_worker(f"job-worker-{os.getpid()}-{index}")
+
+        try:
+            while True:
+                self.delete_old_jobs()
+                self.restart_dead_workers()
+                time.sleep(1)
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+    if JOB_WORKERS > 0:
+        JobWorkers().run()
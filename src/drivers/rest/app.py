@@ -1,41 +1,78 @@
-from configuration import RESTART_IF_NO_GPU, service_logger
-from drivers.rest.dependency_injection import setup_dependencies
+from contextlib import asynccontextmanager
+from functools import cache
+
+from configuration import LITE_MODE, RESTART_IF_NO_GPU, WARM_UP_ON_STARTUP, service_logger
+from drivers.rest.dependency_injection import get_format_conversion_engines_metrics, setup_dependencies
 from drivers.rest.catch_exceptions import catch_exceptions
+from drivers.rest.service_startup import service_startup
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import PlainTextResponse, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from typing import Optional, Union
 from starlette.concurrency import run_in_threadpool
-import torch
 import sys
 import subprocess
 import json
 
 from use_cases.pdf_analysis.get_pdf_word_positions import get_pdf_word_positions
 
-if RESTART_IF_NO_GPU:
-    if not torch.cuda.is_available():
+
+@cache
+def is_gpu_available() -> bool:
+    if LITE_MODE:
+        return False
+
+    import torch
+
+    return torch.cuda.is_available()
+
+
+if RESTART_IF_NO_GPU and not LITE_MODE:
+    if not is_gpu_available():
         raise RuntimeError("No GPU available. Restarting the service is required.")
 
-service_logger.info(f"Is PyTorch using GPU: {torch.cuda.is_available()}")
+if LITE_MODE:
+    service_logger.info("Running in LITE_MODE: the VGT model and table/formula conversion are disabled")
+else:
+    service_logger.info(f"Is PyTorch using GPU: {is_gpu_available()}")
 
 controllers = setup_dependencies()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARM_UP_ON_STARTUP and not LITE_MODE:
+        service_startup.start()
+    else:
+        service_startup.skip()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
 async def root():
-    return sys.version + " Using GPU: " + str(torch.cuda.is_available())
+    return sys.version + " Using GPU: " + str(is_gpu_available())
 
 
 @app.get("/info")
 async def info():
-    return {
+    service_info = {
         "sys": sys.version,
         "tesseract_version": subprocess.run("tesseract --version", shell=True, text=True, capture_output=True).stdout,
         "ocrmypdf_version": subprocess.run("ocrmypdf --version", shell=True, text=True, capture_output=True).stdout,
         "supported_languages": controllers.process_ocr_use_case.get_supported_languages(),
     }
+    service_info["jobs"] = await run_in_threadpool(controllers.job_repository.get_status_counts)
+    if not LITE_MODE:
+        service_info["format_conversion_engines"] = get_format_conversion_engines_metrics()
+    return service_info
+
+
+@app.get("/ready")
+async def ready():
+    status = service_startup.get_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
 
 
 @app.get("/error")
@@ -45,12 +82,59 @@ async def error():
 
 @app.post("/")
 @catch_exceptions
-async def analyze_pdf(file: UploadFile = File(...), fast: bool = Form(False), parse_tables_and_math: bool = Form(False)):
+async def analyze_pdf(
+    file: UploadFile = File(...),
+    fast: bool = Form(False),
+    parse_tables_and_math: bool = Form(False),
+    resolution: str = Form(""),
+):
     return await run_in_threadpool(
-        controllers.analyze_pdf_use_case.execute, file.file.read(), "", parse_tables_and_math, fast, False
+        controllers.analyze_pdf_use_case.execute, file.file.read(), "", parse_tables_and_math, fast, False, resolution
     )
 
 
+@app.post("/stream")
+@catch_exceptions
+async def analyze_pdf_stream(
+    file: UploadFile = File(...),
+    fast: bool = Form(False),
+    parse_tables_and_math: bool = Form(False),
+    resolution: str = Form(""),
+    stream_format: str = Form("ndjson"),
+):
+    return await controllers.analyze_pdf_stream(file, fast, parse_tables_and_math, resolution, stream_format)
+
+
+@app.post("/batch")
+@catch_exceptions
+async def analyze_pdf_batch(
+    files: list[UploadFile] = File(...),
+    fast: bool = Form(False),
+    parse_tables_and_math: bool = Form(False),
+    resolution: str = Form(""),
+    output_format: str = Form("ndjson"),
+):
+    return await controllers.analyze_pdf_batch(files, fast, parse_tables_and_math, resolution, output_format)
+
+
+@app.post("/jobs/{endpoint}")
+@catch_exceptions
+async def submit_job(endpoint: str, file: UploadFile = File(...), parameters: str = Form("{}")):
+    return await controllers.submit_job(endpoint, file, parameters)
+
+
+@app.get("/jobs/{job_id}")
+@catch_exceptions
+async def get_job(job_id: str, wait: int = 0):
+    return await controllers.get_job(job_id, wait)
+
+
+@app.get("/jobs/{job_id}/result")
+@catch_exceptions
+async def get_job_result(job_id: str):
+    return await controllers.get_job_result(job_id)
+
+
 @app.post("/word_positions")
 @catch_exceptions
 async def word_positions(file: UploadFile = File(...)):
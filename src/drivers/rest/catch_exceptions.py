@@ -2,6 +2,8 @@ from functools import wraps
 from fastapi import HTTPException
 
 from configuration import service_logger
+from domain.ComponentUnavailableError import ComponentUnavailableError
+from domain.InvalidParameterError import InvalidParameterError
 
 
 def catch_exceptions(func):
@@ -16,6 +18,10 @@ def catch_exceptions(func):
             return await func(*args, **kwargs)
         except FileNotFoundError:
             raise HTTPException(status_code=404, detail="No xml file")
+        except InvalidParameterError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        except ComponentUnavailableError as error:
+            raise HTTPException(status_code=503, detail=str(error))
         except Exception:
             service_logger.error("Error see traceback", exc_info=1)
             raise HTTPException(status_code=422, detail="Error see traceback")
@@ -1,12 +1,13 @@
 from adapters.storage.file_system_repository import FileSystemRepository
-from adapters.ml.vgt_model_adapter import VGTModelAdapter
-from adapters.ml.fast_trainer_adapter import FastTrainerAdapter
+from adapters.storage.sqlite_job_repository import SqliteJobRepository
+from adapters.infrastructure.lazy_loader import LazyService
+from adapters.infrastructure.pdf_rasterizer import pdf_rasterizer
 from adapters.infrastructure.pdf_analysis_service_adapter import PDFAnalysisServiceAdapter
+from adapters.infrastructure.cached_pdf_analysis_service_adapter import CachedPDFAnalysisServiceAdapter
 from adapters.infrastructure.text_extraction_adapter import TextExtractionAdapter
 from adapters.infrastructure.toc_service_adapter import TOCServiceAdapter
 from adapters.infrastructure.visualization_service_adapter import VisualizationServiceAdapter
 from adapters.infrastructure.ocr_service_adapter import OCRServiceAdapter
-from adapters.infrastructure.format_conversion_service_adapter import FormatConversionServiceAdapter
 from adapters.infrastructure.markdown_conversion_service_adapter import MarkdownConversionServiceAdapter
 from adapters.infrastructure.html_conversion_service_adapter import HtmlConversionServiceAdapter
 from adapters.web.fastapi_controllers import FastAPIControllers
@@ -18,15 +19,56 @@ from use_cases.visualization.create_visualization_use_case import CreateVisualiz
 from use_cases.ocr.process_ocr_use_case import ProcessOCRUseCase
 from use_cases.markdown_conversion.convert_to_markdown_use_case import ConvertToMarkdownUseCase
 from use_cases.html_conversion.convert_to_html_use_case import ConvertToHtmlUseCase
+from use_cases.jobs.run_job_use_case import RunJobUseCase
+from use_cases.jobs.submit_job_use_case import SubmitJobUseCase
+from configuration import ANALYSIS_CACHE_ENABLED, LITE_MODE, VGT_BACKEND
+from domain.ComponentUnavailableError import ComponentUnavailableError
+
+
+def check_not_lite_mode(component_name: str):
+    if LITE_MODE:
+        raise ComponentUnavailableError(f"{component_name} is not available in LITE_MODE, use fast=true")
+
+
+def get_vgt_model_service():
+    check_not_lite_mode("The VGT model")
+    if VGT_BACKEND == "onnx":
+        from adapters.ml.vgt_onnx_model_adapter import VGTOnnxModelAdapter
+
+        return VGTOnnxModelAdapter()
+
+    from adapters.ml.vgt_model_adapter import VGTModelAdapter
+
+    return VGTModelAdapter()
+
+
+def get_fast_model_service():
+    from adapters.ml.fast_trainer_adapter import FastTrainerAdapter
+
+    return FastTrainerAdapter()
+
+
+def get_format_conversion_service():
+    check_not_lite_mode("Table and formula conversion")
+    from adapters.infrastructure.format_conversion_service_adapter import FormatConversionServiceAdapter
+
+    return FormatConversionServiceAdapter()
+
+
+def get_format_conversion_engines_metrics() -> dict:
+    from adapters.infrastructure.format_converters.engine_pools import get_engine_pools_metrics
+
+    return get_engine_pools_metrics()
 
 
 def setup_dependencies():
     file_repository = FileSystemRepository()
+    job_repository = SqliteJobRepository()
 
-    vgt_model_service = VGTModelAdapter()
-    fast_model_service = FastTrainerAdapter()
+    vgt_model_service = LazyService("VGT model service", get_vgt_model_service)
+    fast_model_service = LazyService("fast model service", get_fast_model_service)
 
-    format_conversion_service = FormatConversionServiceAdapter()
+    format_conversion_service = LazyService("format conversion service", get_format_conversion_service)
     markdown_conversion_service = MarkdownConversionServiceAdapter()
     html_conversion_service = HtmlConversionServiceAdapter()
     text_extraction_service = TextExtractionAdapter()
@@ -39,8 +81,12 @@ def setup_dependencies():
         fast_model_service=fast_model_service,
         format_conversion_service=format_conversion_service,
         file_repository=file_repository,
+        pdf_rasterizer_service=pdf_rasterizer,
     )
 
+    if ANALYSIS_CACHE_ENABLED:
+        pdf_analysis_service = CachedPDFAnalysisServiceAdapter(pdf_analysis_service, file_repository)
+
     analyze_pdf_use_case = AnalyzePDFUseCase(pdf_analysis_service=pdf_analysis_service, ml_model_service=vgt_model_service)
 
     extract_text_use_case = ExtractTextUseCase(
@@ -63,6 +109,8 @@ def setup_dependencies():
         pdf_analysis_service=pdf_analysis_service, html_conversion_service=html_conversion_service
     )
 
+    submit_job_use_case = SubmitJobUseCase(job_repository=job_repository)
+
     controllers = FastAPIControllers(
         analyze_pdf_use_case=analyze_pdf_use_case,
         extract_text_use_case=extract_text_use_case,
@@ -71,7 +119,21 @@ def setup_dependencies():
         process_ocr_use_case=process_ocr_use_case,
         convert_to_markdown_use_case=convert_to_markdown_use_case,
         convert_to_html_use_case=convert_to_html_use_case,
+        submit_job_use_case=submit_job_use_case,
         file_repository=file_repository,
+        job_repository=job_repository,
     )
 
     return controllers
+
+
+def setup_job_runner():
+    controllers = setup_dependencies()
+    return RunJobUseCase(
+        job_repository=controllers.job_repository,
+        analyze_pdf_use_case=controllers.analyze_pdf_use_case,
+        extract_toc_use_case=controllers.extract_toc_use_case,
+        process_ocr_use_case=controllers.process_ocr_use_case,
+        convert_to_markdown_use_case=controllers.convert_to_markdown_use_case,
+        convert_to_html_use_case=controllers.convert_to_html_use_case,
+    )
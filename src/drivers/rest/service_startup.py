@@ -0,0 +1,136 @@
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Thread
+from typing import Callable
+
+import fitz
+from pdf_features import Rectangle
+from pdf_token_type_labels import TokenType
+
+from adapters.infrastructure.pdf_rasterizer import pdf_rasterizer
+from adapters.infrastructure.translation.ollama_container_manager import OllamaContainerManager
+from configuration import service_logger
+from domain.LazyPdfImages import LazyPdfImages
+from domain.PdfImages import PdfImages
+from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
+from drivers.rest.dependency_injection import get_fast_model_service, get_format_conversion_service, get_vgt_model_service
+
+WARM_UP_FORMULA_BOX = Rectangle.from_coordinates(60, 480, 320, 510)
+WARM_UP_TABLE_BOX = Rectangle.from_coordinates(60, 380, 540, 460)
+
+
+def check_ollama():
+    ollama_available = OllamaContainerManager().is_ollama_available()
+    service_logger.info(f"Ollama available for translations: {ollama_available}")
+
+
+def get_component_loaders() -> dict[str, Callable[[], object]]:
+    from adapters.ml.vgt.create_word_grid import tokenizer_loader
+
+    format_conversion_service = get_format_conversion_service()
+    return {
+        "vgt_model": get_vgt_model_service().load,
+        "bros_tokenizer": tokenizer_loader.get,
+        "lightgbm_models": get_fast_model_service().load,
+        "latex_ocr": format_conversion_service.latex_ocr_pool.preload,
+        "table_engines": format_conversion_service.table_engines_pool.preload,
+        "ollama": check_ollama,
+    }
+
+
+def create_warm_up_pdf(pdf_path: Path):
+    document = fitz.open()
+    page = document.new_page(width=612, height=792)
+    page.insert_text((72, 90), "Warm-up document", fontsize=20)
+    for line_index in range(12):
+        page.insert_text((72, 130 + 16 * line_index), "The quick brown fox jumps over the lazy dog " * 2, fontsize=10)
+    for row in range(4):
+        for column in range(3):
+            page.insert_text((72 + 160 * column, 400 + 18 * row), f"Cell {row}-{column}", fontsize=10)
+    page.insert_text((72, 500), "E = m c^2 + a^2 + b^2", fontsize=14)
+    document.save(str(pdf_path))
+    document.close()
+
+
+def warm_up_vgt(pdf_images: PdfImages):
+    with RequestWorkspace() as workspace:
+        get_vgt_model_service().predict_document_layout([pdf_images], workspace)
+
+
+def warm_up_fast(pdf_images: PdfImages):
+    with RequestWorkspace() as workspace:
+        get_fast_model_service().predict_layout_fast([pdf_images], workspace)
+
+
+def warm_up_format_conversion(pdf_images: PdfImages, pdf_path: Path):
+    pdf_images_200_dpi = LazyPdfImages(pdf_images.pdf_features, pdf_path, pdf_rasterizer, dpi=200)
+    segments = [
+        PdfSegment(1, WARM_UP_FORMULA_BOX, "E = m c^2 + a^2 + b^2", TokenType.FORMULA),
+        PdfSegment(1, WARM_UP_TABLE_BOX, "", TokenType.TABLE),
+    ]
+    format_conversion_service = get_format_conversion_service()
+    format_conversion_service.convert_formula_to_latex(pdf_images_200_dpi, segments)
+    format_conversion_service.convert_table_to_html(pdf_images_200_dpi, segments)
+
+
+class ServiceStartup:
+    def __init__(self):
+        self.ready: bool = False
+        self.load_seconds: dict[str, float] = dict()
+        self.warm_up_seconds: dict[str, float] = dict()
+        self.errors: dict[str, str] = dict()
+
+    def _run_step(self, name: str, step: Callable[[], object], seconds_by_step: dict[str, float]):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as exception:
+            service_logger.error(f"Startup step {name} failed: {exception}", exc_info=True)
+            self.errors[name] = str(exception)
+        seconds_by_step[name] = round(time.perf_counter() - start, 2)
+
+    def load_components(self, loaders: dict[str, Callable[[], object]]):
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            for name, loader in loaders.items():
+                executor.submit(self._run_step, name, loader, self.load_seconds)
+        service_logger.info(f"Components load seconds: {self.load_seconds}")
+
+    def warm_up(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            pdf_path = Path(temporary_directory, "warm_up.pdf")
+            create_warm_up_pdf(pdf_path)
+            pdf_images = PdfImages.from_pdf_path(pdf_path, pdf_rasterizer)
+            self._run_step("vgt", lambda: warm_up_vgt(pdf_images), self.warm_up_seconds)
+            self._run_step("fast", lambda: warm_up_fast(pdf_images), self.warm_up_seconds)
+            self._run_step(
+                "format_conversion", lambda: warm_up_format_conversion(pdf_images, pdf_path), self.warm_up_seconds
+            )
+        service_logger.info(f"Warm-up seconds: {self.warm_up_seconds}")
+
+    def run(self):
+        self.load_components(get_component_loaders())
+        self._run_step("synthetic_pdf", self.warm_up, dict())
+        self.ready = not self.errors
+        service_logger.info(f"Service ready: {self.ready}")
+
+    def start(self) -> Thread:
+        startup_thread = Thread(target=self.run, name="service-startup", daemon=True)
+        startup_thread.start()
+        return startup_thread
+
+    def skip(self):
+        self.ready = True
+
+    def get_status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "load_seconds": dict(self.load_seconds),
+            "warm_up_seconds": dict(self.warm_up_seconds),
+            "errors": dict(self.errors),
+        }
+
+
+service_startup = ServiceStartup()
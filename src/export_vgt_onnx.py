@@ -0,0 +1,66 @@
+import copy
+
+import numpy as np
+import torch
+
+from adapters.ml.vgt.VGTBatchScheduler import VGTBatchScheduler
+from adapters.ml.vgt.ditod import DetrInferenceMapper
+from adapters.ml.vgt.onnx_backbone import OnnxBackbone, export_backbone, get_backbone_input_shape, load_onnx_sessions
+from benchmark_vgt_cpu_inference import get_agreement, load_benchmark_pdfs, load_cpu_model, predict
+from configuration import VGT_BATCH_SIZE, VGT_ONNX_PATH, service_logger
+
+LETTER_AND_A4_PAGE_SIZES = [(792, 612), (842, 595), (612, 792), (595, 842)]
+FEATURES_TOLERANCE = 1e-3
+
+
+def get_input_shapes(model, inference_mapper: DetrInferenceMapper, pdf_images_list) -> list[tuple[int, int]]:
+    page_sizes = set(LETTER_AND_A4_PAGE_SIZES)
+    for pdf_images in pdf_images_list:
+        page_sizes.update((image.height, image.width) for image in pdf_images.pdf_images)
+    input_shapes = {get_backbone_input_shape(model.backbone, inference_mapper, *page_size) for page_size in page_sizes}
+    return sorted(input_shapes)
+
+
+def get_features_difference(model, onnx_backbone: OnnxBackbone, input_shape: tuple[int, int], embedding_dim: int):
+    image = torch.randn(2, 3, *input_shape)
+    chargrid = torch.randn(2, embedding_dim, *input_shape)
+    with torch.no_grad():
+        features = model.backbone(image, chargrid)
+        onnx_features = onnx_backbone(image, chargrid)
+    return max(float((features[name] - onnx_features[name]).abs().max()) for name in features)
+
+
+def export():
+    configuration, model = load_cpu_model()
+    embedding_dim = configuration.MODEL.WORDGRID.EMBEDDING_DIM
+    inference_mapper = DetrInferenceMapper(configuration)
+    pdf_images_list = load_benchmark_pdfs()
+
+    for input_shape in get_input_shapes(model, inference_mapper, pdf_images_list):
+        service_logger.info(f"Exporting VGT backbone for input shape {input_shape}")
+        export_backbone(model.backbone, *input_shape, embedding_dim)
+
+    onnx_model = copy.deepcopy(model)
+    onnx_model.backbone = OnnxBackbone(onnx_model.backbone, load_onnx_sessions(VGT_ONNX_PATH))
+
+    for input_shape in sorted(onnx_model.backbone.sessions_by_shape):
+        difference = get_features_difference(model, onnx_model.backbone, input_shape, embedding_dim)
+        status = "ok" if difference < FEATURES_TOLERANCE else "MISMATCH"
+        print(f"{input_shape}: max feature difference {difference:.2e} {status}")
+
+    batch_scheduler = VGTBatchScheduler(model, VGT_BATCH_SIZE, 0)
+    onnx_batch_scheduler = VGTBatchScheduler(onnx_model, VGT_BATCH_SIZE, 0)
+    agreements = []
+    for pdf_images in pdf_images_list:
+        seconds, segments = predict(batch_scheduler, inference_mapper, pdf_images)
+        onnx_seconds, onnx_segments = predict(onnx_batch_scheduler, inference_mapper, pdf_images)
+        agreements.append(get_agreement(segments, onnx_segments))
+        print(
+            f"{pdf_images.pdf_features.file_name}: pytorch {seconds:.2f}s, onnx {onnx_seconds:.2f}s, "
+            f"agreement {agreements[-1]:.1%}"
+        )
+    print(f"Mean segment agreement with PyTorch: {np.mean(agreements):.1%}")
+
+
+if __name__ == "__main__":
+    export()
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+
+from domain.Job import Job
+
+
+class JobRepository(ABC):
+    @abstractmethod
+    def create_job(self, endpoint: str, parameters: dict, pdf_content: bytes, filename: str = "") -> Job:
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Job | None:
+        pass
+
+    @abstractmethod
+    def claim_next_job(self, worker: str, concurrency_limits: dict[str, int]) -> Job | None:
+        pass
+
+    @abstractmethod
+    def get_input(self, job_id: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def finish_job(self, job_id: str, result: bytes, media_type: str) -> None:
+        pass
+
+    @abstractmethod
+    def fail_job(self, job_id: str, error: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_result(self, job_id: str) -> tuple[bytes, str]:
+        pass
+
+    @abstractmethod
+    def requeue_running_jobs(self, worker: str = "") -> int:
+        pass
+
+    @abstractmethod
+    def delete_jobs_finished_before(self, timestamp: float) -> int:
+        pass
+
+    @abstractmethod
+    def get_status_counts(self) -> dict[str, dict[str, int]]:
+        pass
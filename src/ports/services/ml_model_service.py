@@ -1,13 +1,16 @@
 from abc import ABC, abstractmethod
 from domain.PdfImages import PdfImages
 from domain.PdfSegment import PdfSegment
+from domain.RequestWorkspace import RequestWorkspace
 
 
 class MLModelService(ABC):
     @abstractmethod
-    def predict_document_layout(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
+    def predict_document_layout(
+        self, pdf_images: list[PdfImages], workspace: RequestWorkspace, resolution: str = ""
+    ) -> list[PdfSegment]:
         pass
 
     @abstractmethod
-    def predict_layout_fast(self, pdf_images: list[PdfImages]) -> list[PdfSegment]:
+    def predict_layout_fast(self, pdf_images: list[PdfImages], workspace: RequestWorkspace) -> list[PdfSegment]:
         pass
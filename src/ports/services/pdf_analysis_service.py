@@ -1,11 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import AnyStr
+from typing import AnyStr, Iterator
 
 
 class PDFAnalysisService(ABC):
     @abstractmethod
     def analyze_pdf_layout(
-        self, pdf_content: AnyStr, xml_filename: str = "", parse_tables_and_math: bool = False, keep_pdf: bool = False
+        self,
+        pdf_content: AnyStr,
+        xml_filename: str = "",
+        parse_tables_and_math: bool = False,
+        keep_pdf: bool = False,
+        resolution: str = "",
     ) -> list[dict]:
         pass
 
@@ -14,3 +19,19 @@ class PDFAnalysisService(ABC):
         self, pdf_content: AnyStr, xml_filename: str = "", parse_tables_and_math: bool = False, keep_pdf: bool = False
     ) -> list[dict]:
         pass
+
+    @abstractmethod
+    def analyze_pdf_layout_stream(
+        self, pdf_content: AnyStr, parse_tables_and_math: bool = False, use_fast_mode: bool = False, resolution: str = ""
+    ) -> Iterator[tuple[int, list[dict]]]:
+        pass
+
+    @abstractmethod
+    def analyze_pdf_layout_batch(
+        self,
+        pdf_contents: list[AnyStr],
+        parse_tables_and_math: bool = False,
+        use_fast_mode: bool = False,
+        resolution: str = "",
+    ) -> Iterator[tuple[int, list[dict] | Exception]]:
+        pass
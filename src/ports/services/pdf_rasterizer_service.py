@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from PIL.Image import Image
+from pdf_features import Rectangle
+
+
+class PdfRasterizerService(ABC):
+    @abstractmethod
+    def get_document_hash(self, pdf_path: str | Path) -> str:
+        pass
+
+    @abstractmethod
+    def get_pages(self, pdf_path: str | Path, dpi: int) -> list[Image]:
+        pass
+
+    @abstractmethod
+    def get_pages_subset(self, pdf_path: str | Path, pages: list[int], dpi: int, document_hash: str = "") -> list[Image]:
+        pass
+
+    @abstractmethod
+    def get_page(self, pdf_path: str | Path, page: int, dpi: int, document_hash: str = "") -> Image:
+        pass
+
+    @abstractmethod
+    def get_region(self, pdf_path: str | Path, page: int, region: Rectangle, dpi: int) -> Image:
+        pass
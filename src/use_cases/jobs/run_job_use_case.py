@@ -0,0 +1,95 @@
+import io
+import json
+from pathlib import Path
+
+from fastapi import UploadFile
+from starlette.responses import FileResponse, Response
+
+from configuration import service_logger
+from domain.Job import Job
+from ports.repositories.job_repository import JobRepository
+from use_cases.html_conversion.convert_to_html_use_case import ConvertToHtmlUseCase
+from use_cases.markdown_conversion.convert_to_markdown_use_case import ConvertToMarkdownUseCase
+from use_cases.ocr.process_ocr_use_case import ProcessOCRUseCase
+from use_cases.pdf_analysis.analyze_pdf_use_case import AnalyzePDFUseCase
+from use_cases.toc_extraction.extract_toc_use_case import ExtractTOCUseCase
+
+TEXT_MEDIA_TYPE_BY_ENDPOINT = {"markdown": "text/markdown; charset=utf-8", "html": "text/html; charset=utf-8"}
+
+
+def get_result_content(endpoint: str, result) -> tuple[bytes, str]:
+    if isinstance(result, FileResponse):
+        return Path(result.path).read_bytes(), result.media_type
+    if isinstance(result, Response):
+        return result.body, result.media_type
+    if isinstance(result, str):
+        return result.encode(), TEXT_MEDIA_TYPE_BY_ENDPOINT.get(endpoint, "text/plain; charset=utf-8")
+    return json.dumps(result).encode(), "application/json"
+
+
+def get_target_languages(target_languages: str | None) -> list[str] | None:
+    if not target_languages:
+        return None
+    return [language.strip() for language in target_languages.split(",") if language.strip()]
+
+
+class RunJobUseCase:
+    def __init__(
+        self,
+        job_repository: JobRepository,
+        analyze_pdf_use_case: AnalyzePDFUseCase,
+        extract_toc_use_case: ExtractTOCUseCase,
+        process_ocr_use_case: ProcessOCRUseCase,
+        convert_to_markdown_use_case: ConvertToMarkdownUseCase,
+        convert_to_html_use_case: ConvertToHtmlUseCase,
+    ):
+        self.job_repository = job_repository
+        self.analyze_pdf_use_case = analyze_pdf_use_case
+        self.extract_toc_use_case = extract_toc_use_case
+        self.process_ocr_use_case = process_ocr_use_case
+        self.convert_to_markdown_use_case = convert_to_markdown_use_case
+        self.convert_to_html_use_case = convert_to_html_use_case
+
+    def execute(self, job: Job):
+        service_logger.info(f"Running {job.endpoint} job {job.id} (attempt {job.attempts})")
+        try:
+            result = self.run(job, self.job_repository.get_input(job.id))
+            self.job_repository.finish_job(job.id, *get_result_content(job.endpoint, result))
+        except Exception as error:
+            service_logger.error(f"Job {job.id} failed", exc_info=1)
+            self.job_repository.fail_job(job.id, str(error) or type(error).__name__)
+
+    def run(self, job: Job, pdf_content: bytes):
+        parameters = job.parameters
+        if job.endpoint == "analyze":
+            return self.analyze_pdf_use_case.execute(
+                pdf_content, "", parameters["parse_tables_and_math"], parameters["fast"], False, parameters["resolution"]
+            )
+
+        if job.endpoint == "toc":
+            return self.extract_toc_use_case.execute(self.get_upload_file(job, pdf_content), parameters["fast"])
+
+        if job.endpoint == "ocr":
+            return self.process_ocr_use_case.execute(
+                self.get_upload_file(job, pdf_content),
+                parameters["language"],
+                parameters["rotate_pages"],
+                parameters["deskew"],
+            )
+
+        conversion_use_case = (
+            self.convert_to_markdown_use_case if job.endpoint == "markdown" else self.convert_to_html_use_case
+        )
+        return conversion_use_case.execute(
+            pdf_content,
+            parameters["fast"],
+            parameters["extract_toc"],
+            parameters["dpi"],
+            parameters["output_file"],
+            get_target_languages(parameters["target_languages"]),
+            parameters["translation_model"],
+        )
+
+    @staticmethod
+    def get_upload_file(job: Job, pdf_content: bytes) -> UploadFile:
+        return UploadFile(file=io.BytesIO(pdf_content), filename=f"{job.id}.pdf")
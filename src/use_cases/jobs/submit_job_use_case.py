@@ -0,0 +1,71 @@
+import json
+
+from ports.repositories.job_repository import JobRepository
+from domain.Job import Job
+from domain.InvalidParameterError import InvalidParameterError
+from use_cases.pdf_analysis.normalize_resolution import normalize_resolution
+
+DEFAULT_PARAMETERS_BY_ENDPOINT = {
+    "analyze": {"fast": False, "parse_tables_and_math": False, "resolution": ""},
+    "toc": {"fast": False},
+    "ocr": {"language": "en", "rotate_pages": False, "deskew": False},
+    "markdown": {
+        "fast": False,
+        "extract_toc": False,
+        "dpi": 120,
+        "output_file": None,
+        "target_languages": None,
+        "translation_model": "gpt-oss",
+    },
+    "html": {
+        "fast": False,
+        "extract_toc": False,
+        "dpi": 120,
+        "output_file": None,
+        "target_languages": None,
+        "translation_model": "gpt-oss",
+    },
+}
+
+PARAMETER_TYPES = {"resolution": (str, int)}
+TYPE_NAMES = {bool: "a boolean", int: "an integer", str: "a string", type(None): "null"}
+
+
+def get_parameters(parameters: str) -> dict:
+    try:
+        parameters = json.loads(parameters or "{}")
+    except json.JSONDecodeError as error:
+        raise InvalidParameterError(f"parameters must be a JSON object: {error}")
+    if not isinstance(parameters, dict):
+        raise InvalidParameterError(f"parameters must be a JSON object, got {type(parameters).__name__}")
+    return parameters
+
+
+def check_parameter_types(endpoint: str, parameters: dict):
+    for name, value in parameters.items():
+        default_value = DEFAULT_PARAMETERS_BY_ENDPOINT[endpoint][name]
+        parameter_types = PARAMETER_TYPES.get(name, (str, type(None)) if default_value is None else (type(default_value),))
+        if type(value) not in parameter_types:
+            expected_types = " or ".join(TYPE_NAMES[parameter_type] for parameter_type in parameter_types)
+            raise InvalidParameterError(f"{name} of {endpoint} jobs must be {expected_types}, got {json.dumps(value)}")
+
+
+class SubmitJobUseCase:
+    def __init__(self, job_repository: JobRepository):
+        self.job_repository = job_repository
+
+    def execute(self, endpoint: str, pdf_content: bytes, filename: str = "", parameters: str = "{}") -> Job:
+        if endpoint not in DEFAULT_PARAMETERS_BY_ENDPOINT:
+            raise InvalidParameterError(f"Unknown job endpoint: {endpoint}")
+
+        parameters = get_parameters(parameters)
+        default_parameters = DEFAULT_PARAMETERS_BY_ENDPOINT[endpoint]
+        unknown_parameters = set(parameters) - set(default_parameters)
+        if unknown_parameters:
+            raise InvalidParameterError(f"Unknown parameters for {endpoint} jobs: {sorted(unknown_parameters)}")
+        check_parameter_types(endpoint, parameters)
+
+        parameters = {**default_parameters, **parameters}
+        if "resolution" in parameters:
+            parameters["resolution"] = normalize_resolution(parameters["resolution"])
+        return self.job_repository.create_job(endpoint, parameters, pdf_content, filename)
@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from domain.InvalidParameterError import InvalidParameterError
+from use_cases.jobs.submit_job_use_case import SubmitJobUseCase
+
+
+class JobParametersRecorder:
+    def __init__(self):
+        self.parameters: dict = dict()
+
+    def create_job(self, endpoint: str, parameters: dict, pdf_content: bytes, filename: str = ""):
+        self.parameters = parameters
+
+
+class TestSubmitJobUseCase(TestCase):
+    def setUp(self):
+        self.job_repository = JobParametersRecorder()
+        self.submit_job_use_case = SubmitJobUseCase(self.job_repository)
+
+    def test_parameters_are_merged_with_the_defaults(self):
+        self.submit_job_use_case.execute("markdown", b"pdf", "", '{"fast": true, "dpi": 200, "target_languages": "es"}')
+
+        self.assertTrue(self.job_repository.parameters["fast"])
+        self.assertEqual(200, self.job_repository.parameters["dpi"])
+        self.assertEqual("es", self.job_repository.parameters["target_languages"])
+        self.assertEqual("gpt-oss", self.job_repository.parameters["translation_model"])
+
+        self.submit_job_use_case.execute("analyze", b"pdf", "", '{"resolution": 640}')
+        self.assertEqual("640", self.job_repository.parameters["resolution"])
+
+    def test_invalid_parameters(self):
+        invalid_parameters_by_endpoint = [
+            ("analyze", "{fast: true}"),
+            ("analyze", "[]"),
+            ("analyze", '"fast"'),
+            ("analyze", '{"fast": "false"}'),
+            ("analyze", '{"resolution": 64}'),
+            ("markdown", '{"dpi": "x"}'),
+            ("markdown", '{"dpi": true}'),
+            ("markdown", '{"output_file": 1}'),
+            ("ocr", '{"language": null}'),
+            ("toc", '{"language": "en"}'),
+            ("unknown", "{}"),
+        ]
+        for endpoint, parameters in invalid_parameters_by_endpoint:
+            with self.subTest(endpoint=endpoint, parameters=parameters), self.assertRaises(InvalidParameterError):
+                self.submit_job_use_case.execute(endpoint, b"pdf", "", parameters)
@@ -1,6 +1,7 @@
-from typing import AnyStr
+from typing import AnyStr, Iterator
 from ports.services.pdf_analysis_service import PDFAnalysisService
 from ports.services.ml_model_service import MLModelService
+from use_cases.pdf_analysis.normalize_resolution import normalize_resolution
 
 
 class AnalyzePDFUseCase:
@@ -19,13 +20,37 @@ class AnalyzePDFUseCase:
         parse_tables_and_math: bool = False,
         use_fast_mode: bool = False,
         keep_pdf: bool = False,
+        resolution: str = "",
     ) -> list[dict]:
+        resolution = normalize_resolution(resolution)
         if use_fast_mode:
             return self.pdf_analysis_service.analyze_pdf_layout_fast(
                 pdf_content, xml_filename, parse_tables_and_math, keep_pdf
             )
         else:
-            return self.pdf_analysis_service.analyze_pdf_layout(pdf_content, xml_filename, parse_tables_and_math, keep_pdf)
+            return self.pdf_analysis_service.analyze_pdf_layout(
+                pdf_content, xml_filename, parse_tables_and_math, keep_pdf, resolution
+            )
+
+    def execute_stream(
+        self, pdf_content: AnyStr, parse_tables_and_math: bool = False, use_fast_mode: bool = False, resolution: str = ""
+    ) -> Iterator[tuple[int, list[dict]]]:
+        resolution = normalize_resolution(resolution)
+        return self.pdf_analysis_service.analyze_pdf_layout_stream(
+            pdf_content, parse_tables_and_math, use_fast_mode, resolution
+        )
+
+    def execute_batch(
+        self,
+        pdf_contents: list[AnyStr],
+        parse_tables_and_math: bool = False,
+        use_fast_mode: bool = False,
+        resolution: str = "",
+    ) -> Iterator[tuple[int, list[dict] | Exception]]:
+        resolution = normalize_resolution(resolution)
+        return self.pdf_analysis_service.analyze_pdf_layout_batch(
+            pdf_contents, parse_tables_and_math, use_fast_mode, resolution
+        )
 
     def execute_and_save_xml(self, pdf_content: AnyStr, xml_filename: str, use_fast_mode: bool = False) -> list[dict]:
         result = self.execute(pdf_content, xml_filename, False, use_fast_mode, keep_pdf=False)
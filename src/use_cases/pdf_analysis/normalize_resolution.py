@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import yaml
+
+from configuration import VGT_CONFIGURATION_PATH, VGT_RESOLUTION
+from domain.InvalidParameterError import InvalidParameterError
+
+MIN_RESOLUTION = 256
+
+
+def get_min_size_test(configuration_path: Path) -> int:
+    configuration = yaml.safe_load(configuration_path.read_text())
+    min_size_test = configuration.get("INPUT", dict()).get("MIN_SIZE_TEST")
+    if min_size_test is not None:
+        return int(min_size_test)
+    if "_BASE_" not in configuration:
+        raise ValueError(f"No INPUT.MIN_SIZE_TEST in {configuration_path}")
+    return get_min_size_test(Path(configuration_path.parent, configuration["_BASE_"]))
+
+
+FULL_RESOLUTION = get_min_size_test(VGT_CONFIGURATION_PATH)
+
+
+def get_valid_resolution(resolution: str) -> str:
+    if resolution in ("full", "auto"):
+        return resolution
+
+    if not resolution.isdigit() or not MIN_RESOLUTION <= int(resolution) <= FULL_RESOLUTION:
+        raise InvalidParameterError(
+            f"resolution must be full, auto or an integer from {MIN_RESOLUTION} to {FULL_RESOLUTION}, got {resolution!r}"
+        )
+    return "full" if int(resolution) == FULL_RESOLUTION else str(int(resolution))
+
+
+try:
+    DEFAULT_RESOLUTION = get_valid_resolution(VGT_RESOLUTION)
+except InvalidParameterError as error:
+    raise ValueError(f"Invalid VGT_RESOLUTION environment variable: {error}") from error
+
+
+def normalize_resolution(resolution: str | int | None = "") -> str:
+    resolution = str(resolution or "").lower().strip()
+    return get_valid_resolution(resolution) if resolution else DEFAULT_RESOLUTION
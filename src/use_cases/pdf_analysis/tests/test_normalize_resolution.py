@@ -0,0 +1,40 @@
+import importlib
+from unittest import TestCase
+from unittest.mock import patch
+
+import use_cases.pdf_analysis.normalize_resolution as normalize_resolution_module
+from configuration import VGT_CONFIGURATION_PATH
+from domain.InvalidParameterError import InvalidParameterError
+from use_cases.pdf_analysis.normalize_resolution import (
+    DEFAULT_RESOLUTION,
+    FULL_RESOLUTION,
+    get_min_size_test,
+    normalize_resolution,
+)
+
+
+class TestNormalizeResolution(TestCase):
+    def test_full_resolution_is_the_model_test_size(self):
+        self.assertEqual(800, get_min_size_test(VGT_CONFIGURATION_PATH))
+        self.assertEqual(800, FULL_RESOLUTION)
+
+    def test_normalize_resolution(self):
+        self.assertEqual(DEFAULT_RESOLUTION, normalize_resolution(""))
+        self.assertEqual("auto", normalize_resolution(" AUTO "))
+        self.assertEqual("full", normalize_resolution("800"))
+        self.assertEqual("640", normalize_resolution("0640"))
+        self.assertEqual("256", normalize_resolution(256))
+
+    def test_invalid_resolutions(self):
+        for resolution in ["small", "-640", "64", "801", "640.5", "1e3"]:
+            with self.assertRaises(InvalidParameterError):
+                normalize_resolution(resolution)
+
+    def test_default_resolution_from_the_environment(self):
+        try:
+            with patch("configuration.VGT_RESOLUTION", "800"):
+                self.assertEqual("full", importlib.reload(normalize_resolution_module).normalize_resolution(""))
+            with patch("configuration.VGT_RESOLUTION", "abc"), self.assertRaises(ValueError):
+                importlib.reload(normalize_resolution_module)
+        finally:
+            importlib.reload(normalize_resolution_module)
@@ -1,2 +1,3 @@
 #!/bin/bash
-gunicorn -k uvicorn.workers.UvicornWorker --chdir ./src app:app --bind 0.0.0.0:5060 --timeout 10000
\ No newline at end of file
+python ./src/drivers/jobs/job_workers.py &
+gunicorn -k uvicorn.workers.UvicornWorker --chdir ./src app:app --bind 0.0.0.0:5060 --timeout 10000